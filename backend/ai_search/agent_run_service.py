@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import contextlib
 import time
 import uuid
 from typing import Any, AsyncIterator, Dict, List, Optional
 
+from backend.json_utils import dump_json_bytes
 from backend.storage import TaskStatus
+from backend.stream_notifier import StreamSubscription, task_stream_notifier
 from backend.time_utils import parse_storage_ts, utc_now, utc_now_z
 from patent_agents.ai_search.src.state import (
     PHASE_IDLE,
@@ -32,6 +33,10 @@ from patent_agents.ai_search.src.runtime import (
 STOP_SATISFIED_COMPLETION_GRACE_SECONDS = 12.0
 STOP_SATISFIED_SUBSCRIBE_STALE_SECONDS = 30.0
 SNAPSHOT_STALE_RUNNING_REPAIR_GRACE_SECONDS = 60.0
+SUBSCRIBE_STREAM_IDLE_WAIT_SECONDS = 5.0
+RUN_STREAM_IDLE_WAIT_SECONDS = 1.0
+RUN_STREAM_DELTA_COALESCE_SECONDS = 0.1
+SSE_KEEPALIVE_FRAME = b": keep-alive\n\n"
 STOP_SATISFIED_MESSAGE = "停止条件已满足，本轮已停止继续检索。可查看当前候选/已选证据，或发送新指令调整范围。"
 STALE_RUNNING_REPAIR_MESSAGE = "会话恢复时发现上一轮长时间无进展，已自动结束本轮。可查看当前候选/已选证据，或发送新指令继续检索。"
 
@@ -49,7 +54,7 @@ class AiSearchAgentRunService:
         meta = get_ai_search_meta(task)
         return str(meta.get("current_phase") or default).strip() or default
 
-    def _format_event(self, event: Dict[str, Any]) -> str:
+    def _format_event(self, event: Dict[str, Any]) -> bytes:
         message = {
             "type": str(event.get("event_type") or ""),
             "sessionId": str(event.get("session_id") or event.get("task_id") or ""),
@@ -64,7 +69,7 @@ class AiSearchAgentRunService:
         if not message["phase"]:
             task = self.storage.get_task(message["taskId"])
             message["phase"] = str(get_ai_search_meta(task).get("current_phase") or PHASE_IDLE)
-        return f"data: {json.dumps(message, ensure_ascii=False)}\n\n"
+        return b"data: " + dump_json_bytes(message) + b"\n\n"
 
     def _append_event(
         self,
@@ -615,7 +620,7 @@ class AiSearchAgentRunService:
 
         return {"repaired": False, "reason": "running_recent"}
 
-    async def stream_message(self, session_id: str, owner_id: str, content: str) -> AsyncIterator[str]:
+    async def stream_message(self, session_id: str, owner_id: str, content: str) -> AsyncIterator[bytes]:
         task = self._owned_task(session_id, owner_id)
         text = str(content or "").strip()
         if not text:
@@ -693,13 +698,16 @@ class AiSearchAgentRunService:
             stop_condition_met_seen = False
             report_saved_seen = False
 
+            delta_ready = asyncio.Event()
+
             async def on_delta(delta: str) -> None:
                 if delta:
                     await delta_queue.put(delta)
+                    delta_ready.set()
 
-            def flush_runtime_events() -> List[str]:
+            def flush_runtime_events() -> List[bytes]:
                 nonlocal latest_seq, stop_satisfied_since, stop_condition_met_seen, report_saved_seen
-                chunks: List[str] = []
+                chunks: List[bytes] = []
                 for event in self.storage.list_ai_search_stream_events(task.id, after_seq=latest_seq, limit=500):
                     seq = int(event.get("seq") or 0)
                     if seq <= latest_seq:
@@ -716,7 +724,7 @@ class AiSearchAgentRunService:
                     latest_seq = seq
                 return chunks
 
-            def ensure_assistant_message() -> List[str]:
+            def ensure_assistant_message() -> List[bytes]:
                 nonlocal assistant_message_id, latest_seq
                 if assistant_message_id:
                     return []
@@ -750,7 +758,7 @@ class AiSearchAgentRunService:
                         break
                 return "".join(parts)
 
-            def append_delta_event(delta_text: str) -> List[str]:
+            def append_delta_event(delta_text: str) -> List[bytes]:
                 nonlocal latest_seq
                 if not delta_text:
                     return []
@@ -792,31 +800,32 @@ class AiSearchAgentRunService:
             timed_out = False
             cancel_requested = False
             stop_satisfied_timeout = False
-            while not agent_task.done():
-                for chunk in flush_runtime_events():
-                    yield chunk
-                delta_text = drain_delta_text()
-                if delta_text:
+            with task_stream_notifier.subscribe(task.id) as subscription:
+                while not agent_task.done():
                     for chunk in flush_runtime_events():
                         yield chunk
-                    for chunk in append_delta_event(delta_text):
-                        yield chunk
-                if time.monotonic() - started_monotonic >= deadline_seconds:
-                    timed_out = True
-                    agent_task.cancel()
-                    break
-                if self._run_cancel_requested(task.id, run_id):
-                    cancel_requested = True
-                    agent_task.cancel()
-                    break
-                if (
-                    stop_satisfied_since is not None
-                    and time.monotonic() - stop_satisfied_since >= STOP_SATISFIED_COMPLETION_GRACE_SECONDS
-                ):
-                    stop_satisfied_timeout = True
-                    agent_task.cancel()
-                    break
-                await asyncio.sleep(0.1)
+                    delta_text = drain_delta_text()
+                    if delta_text:
+                        for chunk in flush_runtime_events():
+                            yield chunk
+                        for chunk in append_delta_event(delta_text):
+                            yield chunk
+                    if time.monotonic() - started_monotonic >= deadline_seconds:
+                        timed_out = True
+                        agent_task.cancel()
+                        break
+                    if self._run_cancel_requested(task.id, run_id):
+                        cancel_requested = True
+                        agent_task.cancel()
+                        break
+                    if (
+                        stop_satisfied_since is not None
+                        and time.monotonic() - stop_satisfied_since >= STOP_SATISFIED_COMPLETION_GRACE_SECONDS
+                    ):
+                        stop_satisfied_timeout = True
+                        agent_task.cancel()
+                        break
+                    await self._wait_for_run_activity(agent_task, subscription, delta_ready)
 
             if timed_out or cancel_requested or stop_satisfied_timeout:
                 with contextlib.suppress(asyncio.CancelledError):
@@ -1051,32 +1060,56 @@ class AiSearchAgentRunService:
             )
             yield self._format_event(failed)
 
-    async def subscribe_stream(self, session_id: str, owner_id: str, *, after_seq: int = 0) -> AsyncIterator[str]:
+    @staticmethod
+    async def _wait_for_run_activity(
+        agent_task: "asyncio.Task[str]",
+        subscription: StreamSubscription,
+        delta_ready: asyncio.Event,
+    ) -> None:
+        """阻塞到 agent 结束、存储写入通知或新增文本增量；超时兜底检查截止时间等条件。"""
+        waiters = [
+            asyncio.ensure_future(subscription.wait(RUN_STREAM_IDLE_WAIT_SECONDS)),
+            asyncio.ensure_future(delta_ready.wait()),
+        ]
+        try:
+            await asyncio.wait(
+                [agent_task, *waiters],
+                timeout=RUN_STREAM_IDLE_WAIT_SECONDS,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        if delta_ready.is_set():
+            delta_ready.clear()
+            if not agent_task.done():
+                # 短暂合并连续增量，避免逐 token 写库
+                await asyncio.sleep(RUN_STREAM_DELTA_COALESCE_SECONDS)
+
+    async def subscribe_stream(self, session_id: str, owner_id: str, *, after_seq: int = 0) -> AsyncIterator[bytes]:
         self._owned_task(session_id, owner_id)
         latest_seq = max(int(after_seq or 0), 0)
-        idle_ticks = 0
-        while True:
-            events = self.storage.list_ai_search_stream_events(session_id, after_seq=latest_seq, limit=500)
-            if events:
-                idle_ticks = 0
-                for event in events:
-                    latest_seq = max(latest_seq, int(event.get("seq") or 0))
-                    yield self._format_event(event)
-                continue
-            if self._current_phase_value(session_id) != PHASE_RUNNING:
-                break
-            stop_event = self._latest_stop_satisfied_event(session_id)
-            if stop_event and self._event_age_seconds(stop_event) >= STOP_SATISFIED_SUBSCRIBE_STALE_SECONDS:
-                run_id = self._active_run_id(session_id)
-                for event in self._finish_stop_satisfied_run(session_id, run_id):
-                    yield self._format_event(event)
-                break
-            idle_ticks += 1
-            if idle_ticks % 10 == 0:
-                yield ": keep-alive\n\n"
-            await asyncio.sleep(0.5)
+        # 先订阅再读库，读库与等待之间的写入同样会唤醒；超时兜底跨进程写入并发送心跳
+        with task_stream_notifier.subscribe(session_id) as subscription:
+            while True:
+                events = self.storage.list_ai_search_stream_events(session_id, after_seq=latest_seq, limit=500)
+                if events:
+                    for event in events:
+                        latest_seq = max(latest_seq, int(event.get("seq") or 0))
+                        yield self._format_event(event)
+                    continue
+                if self._current_phase_value(session_id) != PHASE_RUNNING:
+                    break
+                stop_event = self._latest_stop_satisfied_event(session_id)
+                if stop_event and self._event_age_seconds(stop_event) >= STOP_SATISFIED_SUBSCRIBE_STALE_SECONDS:
+                    run_id = self._active_run_id(session_id)
+                    for event in self._finish_stop_satisfied_run(session_id, run_id):
+                        yield self._format_event(event)
+                    break
+                if not await subscription.wait(SUBSCRIBE_STREAM_IDLE_WAIT_SECONDS):
+                    yield SSE_KEEPALIVE_FRAME
 
-    async def stream_analysis_seed(self, session_id: str, owner_id: str) -> AsyncIterator[str]:
+    async def stream_analysis_seed(self, session_id: str, owner_id: str) -> AsyncIterator[bytes]:
         task = self._owned_task(session_id, owner_id)
         meta = get_ai_search_meta(task)
         seed_prompt = str(meta.get("analysis_seed_prompt") or "").strip()
@@ -1116,13 +1149,13 @@ class AiSearchAgentRunService:
         plan_version: int,
         review_document_ids: Optional[List[str]],
         remove_document_ids: Optional[List[str]],
-    ) -> AsyncIterator[str]:
+    ) -> AsyncIterator[bytes]:
         task = self._owned_task(session_id, owner_id)
         version = int(plan_version or 1)
-        for document_id in review_document_ids or []:
-            self.storage.update_ai_search_document(task.id, version, document_id, stage="selected", user_pinned=True)
-        for document_id in remove_document_ids or []:
-            self.storage.update_ai_search_document(task.id, version, document_id, stage="candidate", user_pinned=False, user_removed=True)
+        if review_document_ids:
+            self.storage.update_ai_search_documents(task.id, version, review_document_ids, stage="selected", user_pinned=True)
+        if remove_document_ids:
+            self.storage.update_ai_search_documents(task.id, version, remove_document_ids, stage="candidate", user_pinned=False, user_removed=True)
         run = self.storage.get_ai_search_run(task.id, plan_version=version)
         runtime = AiSearchRuntimeContext(self.storage, task.id, str((run or {}).get("run_id") or ""), version)
         selected_count = len(runtime.selected_documents())
@@ -83,12 +83,15 @@ class AiSearchReplySeedService:
         batch_size = 200
         offset = 0
         while True:
-            tasks = self.facade.task_manager.list_tasks(owner_id=owner_id, limit=batch_size, offset=offset)
+            tasks = self.facade.task_manager.list_tasks(
+                owner_id=owner_id,
+                limit=batch_size,
+                offset=offset,
+                task_type=TaskType.AI_SEARCH.value,
+            )
             if not tasks:
                 return None
             for task in tasks:
-                if str(task.task_type or "") != TaskType.AI_SEARCH.value:
-                    continue
                 meta = get_ai_search_meta(task)
                 if str(meta.get("source_type") or "").strip() != "reply":
                     continue
@@ -143,18 +146,17 @@ class AiSearchReplySeedService:
         source_pn = str(getattr(reply_task, "pn", "") or "").strip()
         source_title = str(getattr(reply_task, "title", "") or "").strip()
         seed_prompt = seed_prompt_from_reply(reply_payload, seeded_search_elements)
+        task_id = self.facade.task_manager.new_task_id()
+        thread_id = f"ai-search-{task_id}"
+        seed_meta = default_ai_search_meta(thread_id)
+        seed_meta["current_phase"] = PHASE_IDLE
         task = self.facade.task_manager.create_task(
             owner_id=owner_id,
             task_type=TaskType.AI_SEARCH.value,
             title=f"AI 检索会话 - {source_pn or source_title or reply_task.id}",
-        )
-        thread_id = f"ai-search-{task.id}"
-        seed_meta = default_ai_search_meta(thread_id)
-        seed_meta["current_phase"] = PHASE_IDLE
-        self.storage.update_task(
-            task.id,
+            task_id=task_id,
             metadata=merge_ai_search_meta(
-                task,
+                None,
                 **seed_meta,
                 source_type="reply",
                 source_task_id=str(reply_task.id),
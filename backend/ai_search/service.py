@@ -79,7 +79,7 @@ class AiSearchService:
         session_id: str,
         owner_id: str,
         stream_factory,
-    ) -> AsyncIterator[str]:
+    ) -> AsyncIterator[bytes]:
         task = self.sessions._get_owned_session_task(session_id, owner_id)
         usage_collector = create_task_usage_collector(
             task_id=task.id,
@@ -216,7 +216,7 @@ class AiSearchService:
             review_goal=review_goal,
         )
 
-    async def stream_message(self, session_id: str, owner_id: str, content: str) -> AsyncIterator[str]:
+    async def stream_message(self, session_id: str, owner_id: str, content: str) -> AsyncIterator[bytes]:
         async for event in self._stream_with_task_usage(
             session_id,
             owner_id,
@@ -224,11 +224,11 @@ class AiSearchService:
         ):
             yield event
 
-    async def subscribe_stream(self, session_id: str, owner_id: str, *, after_seq: int = 0) -> AsyncIterator[str]:
+    async def subscribe_stream(self, session_id: str, owner_id: str, *, after_seq: int = 0) -> AsyncIterator[bytes]:
         async for event in self.agent_runs.subscribe_stream(session_id, owner_id, after_seq=after_seq):
             yield event
 
-    async def stream_analysis_seed(self, session_id: str, owner_id: str) -> AsyncIterator[str]:
+    async def stream_analysis_seed(self, session_id: str, owner_id: str) -> AsyncIterator[bytes]:
         async for event in self._stream_with_task_usage(
             session_id,
             owner_id,
@@ -243,7 +243,7 @@ class AiSearchService:
         plan_version: int,
         review_document_ids: Optional[List[str]],
         remove_document_ids: Optional[List[str]],
-    ) -> AsyncIterator[str]:
+    ) -> AsyncIterator[bytes]:
         async for event in self._stream_with_task_usage(
             session_id,
             owner_id,
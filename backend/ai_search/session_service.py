@@ -65,16 +65,14 @@ class AiSearchSessionService:
 
     def create_session(self, owner_id: str) -> AiSearchCreateSessionResponse:
         self.facade._enforce_daily_quota(owner_id, task_type=TaskType.AI_SEARCH.value)
+        task_id = self.facade.task_manager.new_task_id()
+        thread_id = f"ai-search-{task_id}"
         task = self.facade.task_manager.create_task(
             owner_id=owner_id,
             task_type=TaskType.AI_SEARCH.value,
-            title=None,
-        )
-        thread_id = f"ai-search-{task.id}"
-        self.storage.update_task(
-            task.id,
-            title=f"AI 检索会话 - {task.id}",
-            metadata=merge_ai_search_meta(task, **default_ai_search_meta(thread_id)),
+            title=f"AI 检索会话 - {task_id}",
+            task_id=task_id,
+            metadata=merge_ai_search_meta(None, **default_ai_search_meta(thread_id)),
             status=phase_to_task_status(PHASE_IDLE),
             progress=phase_progress(PHASE_IDLE),
             current_step=phase_step(PHASE_IDLE),
@@ -88,11 +86,7 @@ class AiSearchSessionService:
         return AiSearchCreateSessionResponse(sessionId=task.id, taskId=task.id, threadId=thread_id)
 
     def list_sessions(self, owner_id: str) -> AiSearchSessionListResponse:
-        tasks = [
-            task
-            for task in self.facade.task_manager.list_tasks(owner_id=owner_id, limit=200)
-            if str(task.task_type or "") == TaskType.AI_SEARCH.value
-        ]
+        tasks = self.facade.task_manager.list_tasks(owner_id=owner_id, limit=200, task_type=TaskType.AI_SEARCH.value)
         return AiSearchSessionListResponse(items=[self.facade.snapshots._session_summary(task) for task in tasks], total=len(tasks))
 
     def update_session(
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import asyncio
-import hashlib
 import uuid
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -12,6 +11,7 @@ from fastapi import HTTPException, UploadFile
 
 from backend.storage import TaskStatus
 from backend.time_utils import utc_now_z
+from backend.utils import _write_upload_with_sha256
 from config import settings
 from patent_agents.ai_search.src.ids import (
     build_ai_search_canonical_id,
@@ -35,6 +35,7 @@ from patent_agents.ai_search.src.state import (
 
 SUPPLEMENT_RUNNING_CODE = "AI_SEARCH_SUPPLEMENT_RUNNING"
 SUPPLEMENT_EMPTY_CODE = "AI_SEARCH_SUPPLEMENT_EMPTY"
+SUPPLEMENT_UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 class AiSearchSupplementService:
@@ -108,13 +109,14 @@ class AiSearchSupplementService:
         target = upload_dir / f"{uuid.uuid4().hex}_{safe_name}"
         return target
 
-    async def _read_upload_file(self, task_id: str, upload: UploadFile) -> tuple[Path, bytes]:
+    async def _read_upload_file(self, task_id: str, upload: UploadFile) -> tuple[Path, str]:
+        """分块落盘补充文献，返回落盘路径与内容 SHA-256。"""
         target = self._save_upload(task_id, upload)
-        content = await upload.read()
-        if not content:
+        size, digest = await _write_upload_with_sha256(upload, target, SUPPLEMENT_UPLOAD_CHUNK_SIZE)
+        if not size:
+            target.unlink(missing_ok=True)
             raise HTTPException(status_code=400, detail=f"补充文献为空：{upload.filename or 'upload.pdf'}")
-        target.write_bytes(content)
-        return target, content
+        return target, digest
 
     def _extract_pdf_text(self, path: Path, *, max_pages: int = 80) -> str:
         try:
@@ -149,11 +151,10 @@ class AiSearchSupplementService:
         runtime: AiSearchRuntimeContext,
         *,
         path: Path,
-        content: bytes,
+        digest: str,
         text: str,
         original_name: str,
     ) -> Dict[str, Any]:
-        digest = hashlib.sha256(content).hexdigest()
         title = Path(original_name or path.name).stem or "用户补充 PDF"
         canonical_id = build_ai_search_canonical_id(source_type="user_pdf", external_id=digest)
         document_id = stable_ai_search_document_id(runtime.task_id, runtime.plan_version, canonical_id)
@@ -203,14 +204,14 @@ class AiSearchSupplementService:
             parent_trace_id=parent_trace_id,
         )
         try:
-            path, content = await self._read_upload_file(runtime.task_id, upload)
+            path, digest = await self._read_upload_file(runtime.task_id, upload)
             text = await asyncio.to_thread(self._extract_pdf_text, path)
             if not text:
                 raise ValueError("PDF 未解析出可用文本。")
             record = self._pdf_record(
                 runtime,
                 path=path,
-                content=content,
+                digest=digest,
                 text=text,
                 original_name=original_name,
             )
@@ -267,18 +268,21 @@ class AiSearchSupplementService:
         runtime: AiSearchRuntimeContext,
         patent_results: List[Dict[str, Any]],
     ) -> None:
-        for item in patent_results:
-            document_id = _safe_text(item.get("document_id"))
-            if not document_id or not item.get("stored_as_candidate"):
-                continue
-            self.storage.update_ai_search_document(
-                runtime.task_id,
-                runtime.plan_version,
-                document_id,
-                user_pinned=True,
-                detail_source="user_supplement_patent",
-                agent_reason="用户补充公开号，待 agent 筛查对比。",
-            )
+        document_ids = [
+            _safe_text(item.get("document_id"))
+            for item in patent_results
+            if item.get("stored_as_candidate") and _safe_text(item.get("document_id"))
+        ]
+        if not document_ids:
+            return
+        self.storage.update_ai_search_documents(
+            runtime.task_id,
+            runtime.plan_version,
+            document_ids,
+            user_pinned=True,
+            detail_source="user_supplement_patent",
+            agent_reason="用户补充公开号，待 agent 筛查对比。",
+        )
 
     def _imported_item(self, item: Dict[str, Any], *, source_type: str) -> Optional[Dict[str, Any]]:
         if not (item.get("stored_as_candidate") or item.get("target_detail")):
@@ -10,14 +10,23 @@ import os
 import secrets
 import threading
 import time
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple, Union
 
 import requests
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import padding, rsa
 from fastapi import Header, HTTPException, Query
+from loguru import logger
 
+try:
+    import pybase64
+except ImportError:  # pragma: no cover - pybase64 随 Linux 依赖锁定安装，缺失时回退标准库
+    pybase64 = None
+
+from backend.json_utils import dump_json_bytes, load_json
 from backend.models import CurrentUser
 
 
@@ -31,6 +40,25 @@ AUTHING_APP_SECRET = os.getenv("AUTHING_APP_SECRET", "").strip()
 AUTHING_DOMAIN = os.getenv("AUTHING_DOMAIN", "").strip().rstrip("/")
 AUTHING_JWKS_TTL_SECONDS = 3600
 AUTHING_JWKS_TIMEOUT_SECONDS = 5.0
+VERIFIED_TOKEN_CACHE_MAX_SIZE = 10000
+
+# 预先完成 HMAC 密钥填充，签名时只需复制模板
+_AUTH_HMAC_TEMPLATE = hmac.new(AUTH_SECRET.encode("utf-8"), None, hashlib.sha256)
+_AUTHING_HMAC_TEMPLATE = (
+    hmac.new(AUTHING_APP_SECRET.encode("utf-8"), None, hashlib.sha256) if AUTHING_APP_SECRET else None
+)
+
+
+def _uses_openssl_sha256() -> bool:
+    """OpenSSL 版 SHA-256 会按 CPU 能力启用 SHA 扩展指令；内置 _sha256 回退实现慢数倍。"""
+    return getattr(hashlib.sha256, "__module__", "") == "_hashlib"
+
+
+if not _uses_openssl_sha256():  # pragma: no cover - 取决于解释器构建
+    logger.warning("hashlib 未使用 OpenSSL 的 SHA-256 实现，令牌签名校验将走较慢的内置实现")
+
+_verified_token_cache_lock = threading.Lock()
+_verified_token_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 
 _jwks_cache_lock = threading.Lock()
 _jwks_cache: Dict[str, Any] = {
@@ -39,17 +67,26 @@ _jwks_cache: Dict[str, Any] = {
 }
 
 
+# pybase64 使用 SIMD 编解码，接口与标准库一致
+_base64 = pybase64 or base64
+# 按 len % 4 查表补齐 base64 padding
+_B64_PADDING = (b"", b"===", b"==", b"=")
+
+
 def _b64url_encode(value: bytes) -> str:
-    return base64.urlsafe_b64encode(value).decode("ascii").rstrip("=")
+    return _base64.urlsafe_b64encode(value).rstrip(b"=").decode("ascii")
 
 
-def _b64url_decode(value: str) -> bytes:
-    padded = value + "=" * (-len(value) % 4)
-    return base64.urlsafe_b64decode(padded.encode("ascii"))
+def _b64url_decode(value: Union[str, bytes]) -> bytes:
+    raw = value.encode("ascii") if isinstance(value, str) else value
+    return _base64.urlsafe_b64decode(raw + _B64_PADDING[len(raw) & 3])
 
 
-def _sign_payload(payload_b64: str) -> str:
-    return hmac.new(AUTH_SECRET.encode("utf-8"), payload_b64.encode("utf-8"), hashlib.sha256).hexdigest()
+def _sign_payload(payload_b64: Union[str, bytes]) -> str:
+    mac = _AUTH_HMAC_TEMPLATE.copy()
+    # base64url 输出只含 ASCII 字符；非 ASCII 输入必然是伪造令牌，编码失败由调用方按无效处理
+    mac.update(payload_b64.encode("ascii") if isinstance(payload_b64, str) else payload_b64)
+    return mac.hexdigest()
 
 
 def _auth_detail(code: str, message: str) -> Dict[str, str]:
@@ -65,7 +102,7 @@ def _issue_access_token(user_id: str) -> tuple[str, int]:
         "exp": exp,
         "typ": "access",
     }
-    payload_b64 = _b64url_encode(json.dumps(payload, separators=(",", ":"), ensure_ascii=True).encode("utf-8"))
+    payload_b64 = _b64url_encode(dump_json_bytes(payload))
     signature = _sign_payload(payload_b64)
     return f"{payload_b64}.{signature}", exp
 
@@ -77,12 +114,13 @@ def _issue_token(user_id: str) -> tuple[str, int]:
 
 def _issue_refresh_token() -> tuple[str, str, int]:
     raw_token = secrets.token_urlsafe(48)
-    token_hash = hashlib.sha256(raw_token.encode("utf-8")).hexdigest()
+    token_hash = _hash_refresh_token(raw_token)
     exp = int(time.time()) + REFRESH_TOKEN_TTL_DAYS * 24 * 60 * 60
     return raw_token, token_hash, exp
 
 
 def _hash_refresh_token(token: str) -> str:
+    # 哈希值作为 refresh_sessions 主键持久化，算法不可更改
     return hashlib.sha256(str(token or "").encode("utf-8")).hexdigest()
 
 
@@ -91,20 +129,48 @@ def _verify_token(token: str) -> Optional[dict]:
     return payload
 
 
+def _get_cached_token_payload(token: str) -> Tuple[Optional[dict], Optional[str]]:
+    with _verified_token_cache_lock:
+        payload = _verified_token_cache.get(token)
+        if payload is None:
+            return None, None
+        if payload["exp"] <= int(time.time()):
+            _verified_token_cache.pop(token, None)
+            return None, "EXPIRED"
+        _verified_token_cache.move_to_end(token)
+        return dict(payload), None
+
+
+def _cache_token_payload(token: str, payload: dict) -> None:
+    with _verified_token_cache_lock:
+        _verified_token_cache[token] = dict(payload)
+        _verified_token_cache.move_to_end(token)
+        while len(_verified_token_cache) > VERIFIED_TOKEN_CACHE_MAX_SIZE:
+            _verified_token_cache.popitem(last=False)
+
+
 def _verify_access_token_with_reason(token: str) -> Tuple[Optional[dict], Optional[str]]:
+    cached, cached_reason = _get_cached_token_payload(token)
+    if cached or cached_reason:
+        return cached, cached_reason
+
+    separator = token.find(".")
+    if separator < 0:
+        return None, "INVALID"
     try:
-        payload_b64, signature = token.split(".", 1)
-    except ValueError:
+        # 只编码一次，签名与解码共用同一份 bytes
+        payload_raw = token[:separator].encode("ascii")
+    except UnicodeEncodeError:
         return None, "INVALID"
-
-    expected = _sign_payload(payload_b64)
-    if not hmac.compare_digest(signature, expected):
+    if not hmac.compare_digest(token[separator + 1 :], _sign_payload(payload_raw)):
         return None, "INVALID"
 
     try:
-        payload = json.loads(_b64url_decode(payload_b64).decode("utf-8"))
+        payload = load_json(_b64url_decode(payload_raw))
     except Exception:
         return None, "INVALID"
+    if not isinstance(payload, dict):
+        return None, "INVALID"
 
     exp = payload.get("exp")
     uid = payload.get("uid")
@@ -115,14 +181,15 @@ def _verify_access_token_with_reason(token: str) -> Tuple[Optional[dict], Option
         return None, "INVALID"
     if not isinstance(exp, int) or exp <= int(time.time()):
         return None, "EXPIRED"
+    _cache_token_payload(token, payload)
     return payload, None
 
 
 def _parse_jwt(token: str) -> Tuple[Dict[str, Any], Dict[str, Any], bytes, str]:
     try:
         header_b64, payload_b64, signature_b64 = token.split(".")
-        header = json.loads(_b64url_decode(header_b64).decode("utf-8"))
-        payload = json.loads(_b64url_decode(payload_b64).decode("utf-8"))
+        header = load_json(_b64url_decode(header_b64))
+        payload = load_json(_b64url_decode(payload_b64))
         signature = _b64url_decode(signature_b64)
     except (ValueError, json.JSONDecodeError, UnicodeDecodeError, binascii.Error) as exc:
         raise HTTPException(status_code=401, detail=f"Authing token 格式无效：{exc}") from exc
@@ -147,13 +214,11 @@ def _expected_authing_jwks_url() -> str:
 
 
 def _verify_authing_hs256(signature: bytes, signing_input: str):
-    if not AUTHING_APP_SECRET:
+    if _AUTHING_HMAC_TEMPLATE is None:
         raise HTTPException(status_code=500, detail="AUTHING_APP_SECRET 未配置，无法验证 HS256 token。")
-    expected = hmac.new(
-        AUTHING_APP_SECRET.encode("utf-8"),
-        signing_input.encode("ascii"),
-        hashlib.sha256,
-    ).digest()
+    mac = _AUTHING_HMAC_TEMPLATE.copy()
+    mac.update(signing_input.encode("ascii"))
+    expected = mac.digest()
     if not hmac.compare_digest(signature, expected):
         raise HTTPException(status_code=401, detail="Authing token 签名校验失败。")
 
@@ -296,10 +361,11 @@ def _extract_token_from_request(
     return None
 
 
-def _get_current_user(
+async def _get_current_user(
     authorization: Optional[str] = Header(default=None),
     token: Optional[str] = Query(default=None),
 ) -> CurrentUser:
+    # 校验只涉及 HMAC 与进程内缓存，无阻塞 IO；声明为协程可免去每次请求的线程池切换
     raw_token = _extract_token_from_request(authorization, token)
     if not raw_token:
         raise HTTPException(status_code=401, detail=_auth_detail("UNAUTHORIZED", "需要身份认证。"))
@@ -319,7 +385,29 @@ def _get_current_user(
     return CurrentUser(user_id=payload["uid"])
 
 
-def _quota_reset_utc() -> datetime:
-    local_now = datetime.now(timezone.utc) + timedelta(hours=APP_TZ_OFFSET_HOURS)
-    next_local_day = (local_now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+_EPOCH_DAY_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+def _local_day_ordinal() -> int:
+    # 整数运算得到本地日序号，避免每次用量查询构造 datetime/timedelta
+    local_seconds = int(time.time()) + APP_TZ_OFFSET_HOURS * 3600
+    return _EPOCH_DAY_ORDINAL + local_seconds // 86400
+
+
+@lru_cache(maxsize=2)
+def _quota_reset_utc_for_local_day(local_day_ordinal: int) -> datetime:
+    next_local_day = datetime.fromordinal(local_day_ordinal + 1).replace(tzinfo=timezone.utc)
     return next_local_day - timedelta(hours=APP_TZ_OFFSET_HOURS)
+
+
+@lru_cache(maxsize=2)
+def _quota_reset_iso_for_local_day(local_day_ordinal: int) -> str:
+    return _quota_reset_utc_for_local_day(local_day_ordinal).isoformat()
+
+
+def _quota_reset_utc() -> datetime:
+    return _quota_reset_utc_for_local_day(_local_day_ordinal())
+
+
+def _quota_reset_iso() -> str:
+    return _quota_reset_iso_for_local_day(_local_day_ordinal())
@@ -0,0 +1,58 @@
+"""
+Shared JSON encode/decode helpers.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 随依赖锁定安装，缺失时回退标准库
+    orjson = None
+
+
+_ORJSON_DUMP_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson is not None else 0
+
+
+def _contains_non_finite_float(value: Any) -> bool:
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_contains_non_finite_float(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_contains_non_finite_float(item) for item in value)
+    return False
+
+
+def dump_json_bytes(value: Any) -> bytes:
+    """紧凑 UTF-8 JSON 字节（非 ASCII 原样保留），写出结果与标准库一致。
+
+    orjson 会把 NaN/Infinity 写成 null、把 datetime 转成字符串；这两类值及其他
+    orjson 不支持的类型回退标准库，保持原样写出 NaN、datetime 照旧抛出 TypeError。
+    """
+    if orjson is not None:
+        try:
+            dumped = orjson.dumps(value, option=_ORJSON_DUMP_OPTIONS)
+        except TypeError:
+            dumped = None
+        # 只有输出含 null 时才可能吞掉了非有限浮点数，再做一次遍历确认
+        if dumped is not None and not (b"null" in dumped and _contains_non_finite_float(value)):
+            return dumped
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dump_json_text(value: Any) -> str:
+    return dump_json_bytes(value).decode("utf-8")
+
+
+def load_json(raw: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # 兼容标准库写入的 NaN/Infinity 等非严格 JSON
+            pass
+    return json.loads(raw)
@@ -94,8 +94,13 @@ def configure_loguru_to_utc8(
     sink: Any = sys.stderr,
     colorize: bool = True,
     fmt: str = CONSOLE_LOG_FORMAT,
+    enqueue: bool = False,
 ) -> None:
-    """Configure process-wide loguru output with UTC+8 timestamps."""
+    """Configure process-wide loguru output with UTC+8 timestamps.
+
+    enqueue=True hands records to a background writer thread so callers
+    (including the event loop) never block on a slow stdout/stderr pipe.
+    """
     logger.remove()
     logger.configure(patcher=_inject_utc8_time)
     logger.add(
@@ -103,6 +108,7 @@ def configure_loguru_to_utc8(
         level=level,
         colorize=colorize,
         format=fmt,
+        enqueue=enqueue,
     )
 
 
@@ -113,15 +119,17 @@ def add_loguru_file_sink(
     retention: str = "14 days",
     compression: str = "zip",
     fmt: str = FILE_LOG_FORMAT,
-) -> None:
+    enqueue: bool = False,
+) -> int:
     """Attach an additional file sink using the same UTC+8 timestamp field."""
-    logger.add(
+    return logger.add(
         log_file,
         level=level,
         format=fmt,
         rotation=rotation,
         retention=retention,
         compression=compression,
+        enqueue=enqueue,
     )
 
 
@@ -132,10 +140,11 @@ def setup_logging_utc8(
     rotation: str = "10 MB",
     retention: str = "14 days",
     compression: str = "zip",
+    enqueue: bool = False,
 ) -> None:
     """Unified logging setup: process timezone + loguru console + optional file sink."""
     configure_process_timezone_to_utc8()
-    configure_loguru_to_utc8(level=level)
+    configure_loguru_to_utc8(level=level, enqueue=enqueue)
     if log_file:
         add_loguru_file_sink(
             log_file,
@@ -143,6 +152,7 @@ def setup_logging_utc8(
             rotation=rotation,
             retention=retention,
             compression=compression,
+            enqueue=enqueue,
         )
 
 
@@ -20,6 +20,7 @@ from backend.system_logs import (
     stop_system_log_cleanup_loop,
 )
 from backend.token_pricing import configure_pricing_storage, schedule_background_refresh
+from backend.utils import DownloadAwareGZipMiddleware
 
 _app_log_file = settings.DATA_DIR / "logs" / "app.log"
 _app_log_file.parent.mkdir(parents=True, exist_ok=True)
@@ -30,6 +31,8 @@ setup_logging_utc8(
     rotation="10 MB",
     retention="14 days",
     compression="zip",
+    # 日志由后台线程写出，事件循环不会被慢速 stdout 管道或文件 IO 阻塞
+    enqueue=True,
 )
 configure_uvicorn_access_log_filter()
 initialize_system_logging()
@@ -40,9 +43,8 @@ from backend.routes import router as api_router
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     # 启动时的初始化操作
-    settings.UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-    settings.DATA_DIR.mkdir(parents=True, exist_ok=True)
-    settings.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    for directory in (settings.UPLOAD_DIR, settings.DATA_DIR, settings.OUTPUT_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
     from backend.storage import get_pipeline_manager
 
     configure_system_log_storage(
@@ -53,7 +55,10 @@ async def lifespan(app: FastAPI):
     start_system_log_cleanup_loop()
     schedule_background_refresh(force=False)
     yield
-    # 关闭时的清理操作（如果需要）
+    # 关闭时的清理操作：流程线程由专用线程池承载，进程退出前需让其尽快结束
+    from backend.routes.tasks import cancel_running_tasks_on_shutdown
+
+    cancel_running_tasks_on_shutdown()
     await stop_system_log_cleanup_loop()
 
 
@@ -67,14 +72,19 @@ app = FastAPI(
 )
 register_exception_handlers(app)
 
+# Starlette 对 text/event-stream 不做压缩，SSE 逐帧下发不受影响；任务列表等大体积 JSON 按需压缩，
+# PDF 与附件下载直接透传
+app.add_middleware(DownloadAwareGZipMiddleware, minimum_size=1024)
+app.middleware("http")(request_logging_middleware)
+# 最后注册即最外层：预检请求在日志与路由之前直接返回，且浏览器按 max_age 缓存预检结果
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=settings.CORS_ALLOW_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=settings.CORS_MAX_AGE_SECONDS,
 )
-app.middleware("http")(request_logging_middleware)
 
 app.include_router(api_router)
 
@@ -92,5 +102,10 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=port,
         reload=reload,
+        # 热重载只支持单进程
+        workers=None if reload else settings.WEB_WORKERS,
+        # 已安装 uvloop/httptools（uvicorn[standard]）时自动启用
+        loop="auto",
+        http="auto",
         log_level="info",
     )
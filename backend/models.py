@@ -1,6 +1,7 @@
 """
 API 数据模型定义
 """
+import asyncio
 from dataclasses import dataclass
 from threading import Event
 from typing import Any, Dict, List, Literal, Optional
@@ -345,6 +346,8 @@ class CurrentUser:
 
 @dataclass
 class TaskRuntime:
+    # cancel_event 供线程池中的流水线轮询；pipeline_task 持有协程任务的强引用，防止运行中被回收
     cancel_event: Event
     upload_file_path: Optional[str] = None
     output_dir: Optional[str] = None
+    pipeline_task: Optional["asyncio.Task[Any]"] = None
@@ -1,6 +1,7 @@
 """
 个人空间相关路由
 """
+import asyncio
 import io
 import mimetypes
 import re
@@ -357,7 +358,8 @@ async def post_account_profile_avatar(
     if suffix not in AVATAR_ALLOWED_SUFFIXES:
         raise HTTPException(status_code=400, detail="头像仅支持 PNG/JPG/JPEG/WEBP/GIF。")
 
-    content = await file.read()
+    # 最多读取上限 + 1 字节即可判断超限，避免超大上传整体驻留内存
+    content = await file.read(AVATAR_MAX_BYTES + 1)
     if not content:
         raise HTTPException(status_code=400, detail="上传的头像文件为空。")
     if len(content) > AVATAR_MAX_BYTES:
@@ -376,7 +378,7 @@ async def post_account_profile_avatar(
 
     AVATAR_LOCAL_DIR.mkdir(parents=True, exist_ok=True)
     file_name = _build_avatar_filename(current_user.user_id, suffix)
-    (AVATAR_LOCAL_DIR / file_name).write_bytes(content)
+    await asyncio.to_thread((AVATAR_LOCAL_DIR / file_name).write_bytes, content)
     avatar_ref = f"{AVATAR_REF_LOCAL_PREFIX}{file_name}"
     access_url = f"{str(request.base_url).rstrip('/')}{AVATAR_READ_PREFIX}{avatar_ref}"
     return AccountAvatarUploadResponse(url=access_url)
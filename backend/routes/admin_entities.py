@@ -8,10 +8,9 @@ import asyncio
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, Optional
-from urllib.parse import quote
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from config import settings
 from backend.admin_auth import ensure_admin_owner
@@ -29,7 +28,7 @@ from backend.models import (
 from backend.storage import TaskType, get_pipeline_manager
 from backend.system_logs import emit_system_log
 from backend.time_utils import parse_local_input_to_utc_z, to_utc_z
-from backend.utils import _build_r2_storage
+from backend.utils import ReportFileResponse, _attachment_content_disposition, _build_r2_storage
 
 
 router = APIRouter()
@@ -363,7 +362,7 @@ async def download_admin_entity_task_result(
             message="管理员下载 AI 检索报告",
             payload={"filename": filename, "targetOwnerId": row.get("owner_id")},
         )
-        return FileResponse(
+        return ReportFileResponse(
             path=str(report_path),
             filename=filename,
             media_type="application/pdf",
@@ -388,7 +387,7 @@ async def download_admin_entity_task_result(
                 BytesIO(r2_pdf),
                 media_type="application/pdf",
                 headers={
-                    "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+                    "Content-Disposition": _attachment_content_disposition(filename),
                 },
             )
 
@@ -425,7 +424,7 @@ async def download_admin_entity_task_result(
         payload={"filename": filename, "targetOwnerId": row.get("owner_id")},
     )
 
-    return FileResponse(
+    return ReportFileResponse(
         path=str(pdf_path),
         filename=filename,
         media_type="application/pdf",
@@ -11,6 +11,7 @@ from fastapi.responses import StreamingResponse
 
 from backend.auth import _get_current_user
 from backend.models import CurrentUser
+from backend.utils import SSE_RESPONSE_HEADERS
 
 from backend.ai_search.models import (
     AiSearchCreateFromAnalysisRequest,
@@ -74,7 +75,7 @@ async def subscribe_ai_search_events(
     return StreamingResponse(
         service.subscribe_stream(session_id, current_user.user_id, after_seq=after_seq),
         media_type="text/event-stream",
-        headers={"Cache-Control": "no-cache", "Connection": "keep-alive"},
+        headers=SSE_RESPONSE_HEADERS,
     )
 
 
@@ -138,7 +139,7 @@ async def stream_ai_search_messages(
     return StreamingResponse(
         service.stream_message(session_id, current_user.user_id, request.content),
         media_type="text/event-stream",
-        headers={"Cache-Control": "no-cache", "Connection": "keep-alive"},
+        headers=SSE_RESPONSE_HEADERS,
     )
 
 
@@ -150,7 +151,7 @@ async def stream_ai_search_analysis_seed(
     return StreamingResponse(
         service.stream_analysis_seed(session_id, current_user.user_id),
         media_type="text/event-stream",
-        headers={"Cache-Control": "no-cache", "Connection": "keep-alive"},
+        headers=SSE_RESPONSE_HEADERS,
     )
 
 
@@ -210,5 +211,5 @@ async def stream_ai_search_document_selection(
             request.removeDocumentIds,
         ),
         media_type="text/event-stream",
-        headers={"Cache-Control": "no-cache", "Connection": "keep-alive"},
+        headers=SSE_RESPONSE_HEADERS,
     )
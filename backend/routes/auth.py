@@ -3,13 +3,17 @@
 """
 import hashlib
 import re
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Set, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException
 
 from backend.auth import (
+    ACCESS_TOKEN_TTL_MINUTES,
     _build_authing_owner_id,
     _get_current_user,
     _hash_refresh_token,
@@ -35,6 +39,13 @@ from backend.time_utils import to_utc_z, utc_now
 router = APIRouter()
 task_manager = get_pipeline_manager()
 USER_NAME_PREFIX = "用户"
+# 复用窗口不超过访问令牌有效期的一半，保证返回的令牌仍有足够剩余时间
+GUEST_SESSION_REUSE_SECONDS = min(ACCESS_TOKEN_TTL_MINUTES * 60 / 2, 3600.0)
+GUEST_SESSION_CACHE_MAX_SIZE = 20000
+
+# 同一设备重复发起访客登录（页面刷新/前端重连）时复用尚未刷新过的会话，避免重复签发令牌和写入刷新会话；
+# 按设备而非 IP 缓存，NAT 后的不同设备不会拿到彼此的令牌
+_recent_guest_sessions: "OrderedDict[str, Tuple[float, GuestAuthResponse]]" = OrderedDict()
 
 
 def _sanitize_profile_text(value) -> str | None:
@@ -153,14 +164,46 @@ def _issue_auth_session(owner_id: str, auth_type: str) -> SessionAuthResponse:
     return response
 
 
+@lru_cache(maxsize=GUEST_SESSION_CACHE_MAX_SIZE)
+def _build_guest_owner_id(device_id: str) -> str:
+    # 访客 ID 已持久化在任务与用户记录中，哈希算法与截断长度不可更改
+    device_hash = hashlib.sha256(device_id.encode("utf-8")).hexdigest()[:24]
+    return f"guest_{device_hash}"
+
+
+def _get_recent_guest_session(user_id: str) -> GuestAuthResponse | None:
+    cached = _recent_guest_sessions.get(user_id)
+    if cached is None:
+        return None
+    expires_at, response = cached
+    if expires_at <= time.monotonic():
+        _recent_guest_sessions.pop(user_id, None)
+        return None
+    return response
+
+
+def _remember_guest_session(user_id: str, response: GuestAuthResponse) -> None:
+    _recent_guest_sessions[user_id] = (time.monotonic() + GUEST_SESSION_REUSE_SECONDS, response)
+    _recent_guest_sessions.move_to_end(user_id)
+    while len(_recent_guest_sessions) > GUEST_SESSION_CACHE_MAX_SIZE:
+        _recent_guest_sessions.popitem(last=False)
+
+
 @router.post("/api/auth/guest", response_model=GuestAuthResponse)
 async def create_guest_auth(payload: GuestAuthRequest | None = None):
     """创建访客身份认证"""
-    device_id = _normalize_guest_device_id(payload.deviceId if payload else None)
-    device_hash = hashlib.sha256(device_id.encode("utf-8")).hexdigest()[:24]
-    user_id = f"guest_{device_hash}"
+    requested_device_id = (payload.deviceId if payload else None) or ""
+    device_id = _normalize_guest_device_id(requested_device_id)
+    user_id = _build_guest_owner_id(device_id)
+    if requested_device_id.strip():
+        recent = _get_recent_guest_session(user_id)
+        if recent is not None:
+            return recent
     session = _issue_auth_session(user_id, auth_type="guest")
-    return GuestAuthResponse(**session.model_dump())
+    response = GuestAuthResponse(**session.model_dump())
+    if requested_device_id.strip():
+        _remember_guest_session(user_id, response)
+    return response
 
 
 @router.post("/api/auth/authing", response_model=AuthingAuthResponse)
@@ -230,6 +273,7 @@ async def refresh_auth_session(payload: RefreshTokenRequest):
     rotated = task_manager.storage.rotate_refresh_session(session, next_refresh_session)
     if not rotated:
         raise HTTPException(status_code=401, detail={"code": "REFRESH_TOKEN_INVALID", "message": "refresh token 已失效。"})
+    _recent_guest_sessions.pop(session.owner_id, None)
     return next_session
 
 
@@ -239,6 +283,7 @@ async def logout_auth_session(
     current_user: CurrentUser = Depends(_get_current_user),
 ):
     revoked_count = 0
+    _recent_guest_sessions.pop(current_user.user_id, None)
     refresh_token = str(payload.refresh_token if payload else "").strip()
     if refresh_token:
         revoked = task_manager.storage.revoke_refresh_session(_hash_refresh_token(refresh_token))
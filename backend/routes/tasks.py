@@ -5,19 +5,24 @@ import asyncio
 import hashlib
 import json
 import os
+import re
 import shutil
+import stat
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from threading import Event
-from time import perf_counter
-from typing import Any, Dict, List, Optional
+from threading import Event, Lock
+from time import monotonic, perf_counter
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, RedirectResponse, Response, StreamingResponse
 from loguru import logger
 
 from config import VERSION, settings
 from backend.auth import _get_current_user
+from backend.json_utils import dump_json_bytes
 from backend.log_context import bind_task_logger, task_log_context
 from backend.notifications import build_task_notification_dispatcher
 from backend.system_logs import emit_system_log
@@ -27,11 +32,14 @@ from backend.task_usage_tracking import (
     persist_task_usage,
     task_usage_collection,
 )
-from backend.models import CurrentUser, PatentNumberValidationResponse, TaskResponse
+from backend.models import CurrentUser, PatentNumberValidationResponse, TaskResponse, TaskRuntime
 from backend.utils import (
+    ReportFileResponse,
+    _attachment_content_disposition,
     _cleanup_path,
-    _read_local_pdf_bytes,
+    _local_file_has_content,
     _build_r2_storage,
+    _write_upload_with_sha256,
 )
 from backend.storage import TaskType, get_pipeline_manager
 from backend.time_utils import to_utc_z, utc_now_z
@@ -41,12 +49,33 @@ from langgraph.checkpoint.memory import InMemorySaver
 router = APIRouter()
 task_manager = get_pipeline_manager()
 
-RUNNING_TASKS: Dict[str, Event] = {}
+RUNNING_TASKS: Dict[str, TaskRuntime] = {}
 PATENT_CHECKPOINTERS: Dict[str, InMemorySaver] = {}
 AI_REVIEW_CHECKPOINTERS: Dict[str, InMemorySaver] = {}
 OAR_CHECKPOINTERS: Dict[str, InMemorySaver] = {}
 
 PROGRESS_WRITE_THROTTLE_SECONDS = 3.0
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# 上传文件落盘名仅保留字母数字（含中文）、点、下划线和连字符
+_UNSAFE_UPLOAD_NAME_RE = re.compile(r"[^\w.-]+")
+R2_MISS_CACHE_TTL_SECONDS = 60.0
+R2_MISS_CACHE_MAX_SIZE = 50000
+
+R2_UPLOAD_CONCURRENCY = 8
+
+_R2_UPLOAD_SEMAPHORE = asyncio.Semaphore(R2_UPLOAD_CONCURRENCY)
+# 阻塞的 LangGraph 流程使用专用线程池，避免占满默认线程池影响文件下载与存储调用；
+# 信号量与线程池同容量且在线程结束时才释放，排队发生在协程侧，排队时间不计入流程超时
+TASK_WORKFLOW_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.TASK_WORKFLOW_MAX_WORKERS,
+    thread_name_prefix="task-workflow",
+)
+_TASK_WORKFLOW_SEMAPHORE = asyncio.Semaphore(settings.TASK_WORKFLOW_MAX_WORKERS)
+_BACKGROUND_R2_UPLOADS: Set[asyncio.Task] = set()
+
+# 记录近期在 R2 中不存在的对象键（键 -> 过期时刻），避免重复提交同一未分析专利时反复回源
+_r2_miss_cache_lock = Lock()
+_r2_miss_cache: "OrderedDict[str, float]" = OrderedDict()
 
 ALLOWED_TASK_TYPES = {
     TaskType.PATENT_ANALYSIS.value,
@@ -172,6 +201,11 @@ def _should_persist_progress_update(
     return (now - last_persist_at) >= max(0.1, float(throttle_seconds))
 
 
+def _clamp_reported_progress(progress: int, last_progress: int) -> int:
+    """进度只增不减：并行分支可能先后上报更小的进度，回退既误导用户又会多写一次库。"""
+    return max(0, min(95, max(progress, last_progress)))
+
+
 def _get_patent_checkpointer(task_id: str) -> InMemorySaver:
     checkpointer = PATENT_CHECKPOINTERS.get(task_id)
     if checkpointer is None:
@@ -245,15 +279,23 @@ def _validate_file_suffix(upload: UploadFile, allowed: set[str], label: str):
         raise HTTPException(status_code=400, detail=f"{label}仅支持 {allowed_text} 格式。")
 
 
-async def _save_upload_file(task_id: str, upload: UploadFile, subdir: str, prefix: str) -> str:
-    safe_name = Path(upload.filename or f"{prefix}.dat").name
+def _build_upload_path(task_id: str, subdir: str, prefix: str, original_name: Optional[str]) -> Path:
+    safe_name = _UNSAFE_UPLOAD_NAME_RE.sub("_", Path(original_name or f"{prefix}.dat").name)
     upload_dir = settings.UPLOAD_DIR / task_id / subdir
     upload_dir.mkdir(parents=True, exist_ok=True)
-    path = upload_dir / f"{prefix}_{safe_name}"
-    content = await upload.read()
-    with open(path, "wb") as handle:
-        handle.write(content)
-    return str(path)
+    return upload_dir / f"{prefix}_{safe_name}"
+
+
+async def _save_upload_file(task_id: str, upload: UploadFile, subdir: str, prefix: str) -> str:
+    path, _sha256 = await _save_upload_file_with_sha256(task_id, upload, subdir, prefix)
+    return path
+
+
+async def _save_upload_file_with_sha256(task_id: str, upload: UploadFile, subdir: str, prefix: str) -> Tuple[str, str]:
+    """分块落盘上传文件并同步计算 SHA-256，避免整文件驻留内存。"""
+    path = _build_upload_path(task_id, subdir, prefix, upload.filename)
+    _size, sha256 = await _write_upload_with_sha256(upload, path, UPLOAD_CHUNK_SIZE)
+    return str(path), sha256
 
 
 def _collect_upload_paths(task: Any) -> List[str]:
@@ -317,10 +359,7 @@ def _copy_existing_upload_file(
     if not source.exists() or not source.is_file():
         raise HTTPException(status_code=409, detail=f"原任务输入文件不存在，无法重试：{source}")
 
-    safe_name = Path(str(original_name or source.name or f"{prefix}.dat")).name
-    upload_dir = settings.UPLOAD_DIR / task_id / subdir
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    destination = upload_dir / f"{prefix}_{safe_name}"
+    destination = _build_upload_path(task_id, subdir, prefix, str(original_name or source.name or ""))
     shutil.copy2(source, destination)
     return str(destination)
 
@@ -417,7 +456,8 @@ def _enqueue_pipeline_task(
 ) -> None:
     task_type = _task_type(task)
     cancel_event = Event()
-    RUNNING_TASKS[task.id] = cancel_event
+    runtime = TaskRuntime(cancel_event=cancel_event, upload_file_path=upload_file_path)
+    RUNNING_TASKS[task.id] = runtime
     try:
         if task_type == TaskType.PATENT_ANALYSIS.value:
             pipeline_task = asyncio.create_task(
@@ -451,7 +491,24 @@ def _enqueue_pipeline_task(
         RUNNING_TASKS.pop(task.id, None)
         raise
 
-    pipeline_task.add_done_callback(lambda _task, task_id=task.id: RUNNING_TASKS.pop(task_id, None))
+    runtime.pipeline_task = pipeline_task
+    pipeline_task.add_done_callback(lambda _task, task_id=task.id: _release_running_task(task_id, runtime))
+
+
+def cancel_running_tasks_on_shutdown() -> int:
+    """应用关闭时通知流程线程在下一节点退出，并把任务标记为已取消，避免重启后残留“处理中”状态。"""
+    cancelled = 0
+    for task_id, runtime in list(RUNNING_TASKS.items()):
+        runtime.cancel_event.set()
+        if task_manager.cancel_task(task_id, "服务已停止，任务已中断"):
+            cancelled += 1
+    return cancelled
+
+
+def _release_running_task(task_id: str, runtime: TaskRuntime) -> None:
+    # 仅移除本次登记的运行态，避免误删同 ID 的新登记
+    if RUNNING_TASKS.get(task_id) is runtime:
+        RUNNING_TASKS.pop(task_id, None)
 
 
 def _prepare_retry_task(
@@ -555,15 +612,6 @@ def _resolve_input_sha256(input_sha256: Optional[str], fallback_file_path: Optio
     return _compute_file_sha256(fallback_file_path)
 
 
-def _load_json(path: Path) -> Optional[Dict[str, Any]]:
-    if not path.exists() or not path.is_file():
-        return None
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return None
-
-
 def _normalize_pn(value: Any) -> Optional[str]:
     normalized = str(value or "").strip().upper()
     return normalized or None
@@ -685,6 +733,15 @@ def _build_task_download_filename(task_type: str, task: Any) -> str:
     return f"AI 分析报告_{artifact_name}.pdf"
 
 
+def _stat_download_file(path: Path) -> Optional[os.stat_result]:
+    """单次 stat 判断下载文件是否存在，结果交给 FileResponse 复用。"""
+    try:
+        stat_result = path.stat()
+    except OSError:
+        return None
+    return stat_result if stat.S_ISREG(stat_result.st_mode) else None
+
+
 def _extract_ai_reply_application_number(result: Dict[str, Any]) -> Optional[str]:
     result_dict = _to_dict(result)
     prepared = _to_dict(result_dict.get("prepared_materials"))
@@ -816,6 +873,30 @@ def _build_ai_review_json_payload(
     }
 
 
+def _is_recent_r2_miss(key: str) -> bool:
+    with _r2_miss_cache_lock:
+        expires_at = _r2_miss_cache.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= monotonic():
+            _r2_miss_cache.pop(key, None)
+            return False
+        return True
+
+
+def _remember_r2_miss(key: str) -> None:
+    with _r2_miss_cache_lock:
+        _r2_miss_cache[key] = monotonic() + R2_MISS_CACHE_TTL_SECONDS
+        _r2_miss_cache.move_to_end(key)
+        while len(_r2_miss_cache) > R2_MISS_CACHE_MAX_SIZE:
+            _r2_miss_cache.popitem(last=False)
+
+
+def _forget_r2_miss(key: str) -> None:
+    with _r2_miss_cache_lock:
+        _r2_miss_cache.pop(key, None)
+
+
 def _get_cached_analysis_payload(
     *,
     pn: Optional[str],
@@ -839,8 +920,11 @@ def _get_cached_analysis_payload(
         return None
 
     analysis_key = r2_storage.build_analysis_json_key(resolved_pn)
+    if _is_recent_r2_miss(analysis_key):
+        return None
     analysis_bytes = r2_storage.get_bytes(analysis_key)
     if not analysis_bytes:
+        _remember_r2_miss(analysis_key)
         return None
 
     try:
@@ -852,6 +936,84 @@ def _get_cached_analysis_payload(
     return payload
 
 
+async def _run_task_workflow(run_workflow, *, timeout: Optional[float] = None) -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    semaphore = _TASK_WORKFLOW_SEMAPHORE
+    await semaphore.acquire()
+    try:
+        future = TASK_WORKFLOW_EXECUTOR.submit(run_workflow)
+    except BaseException:
+        semaphore.release()
+        raise
+
+    def _release_slot(_future) -> None:
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            # 事件循环已关闭
+            pass
+
+    # 线程结束才归还名额：超时或取消只停止等待，线程仍占用线程池
+    future.add_done_callback(_release_slot)
+    if timeout is None:
+        return await asyncio.wrap_future(future)
+    return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+
+
+def _schedule_r2_upload(coro) -> asyncio.Task:
+    upload_task = asyncio.create_task(coro)
+    _BACKGROUND_R2_UPLOADS.add(upload_task)
+    upload_task.add_done_callback(_BACKGROUND_R2_UPLOADS.discard)
+    return upload_task
+
+
+async def _upload_patent_analysis_artifacts(
+    task_id: str,
+    final_pn: str,
+    *,
+    output_pdf: str,
+    analysis_json_bytes: bytes,
+    patent_json_path: Path,
+) -> Dict[str, str]:
+    """后台上传 AI 分析产物到 R2，成功的对象键合并回任务的 output_files；失败只记日志。"""
+    r2_storage = _build_r2_storage()
+    if not r2_storage.enabled:
+        return {}
+
+    stored_keys: Dict[str, str] = {}
+    try:
+        async with _R2_UPLOAD_SEMAPHORE:
+            pdf_key = r2_storage.build_patent_pdf_key(final_pn)
+            if await asyncio.to_thread(r2_storage.put_file, pdf_key, output_pdf, "application/pdf"):
+                stored_keys["r2_key"] = pdf_key
+
+            analysis_key = r2_storage.build_analysis_json_key(final_pn)
+            if await asyncio.to_thread(r2_storage.put_bytes, analysis_key, analysis_json_bytes, "application/json"):
+                _forget_r2_miss(analysis_key)
+                stored_keys["analysis_r2_key"] = analysis_key
+
+            patent_key = r2_storage.build_patent_json_key(final_pn)
+            if patent_json_path.is_file():
+                # patent.json 由结构化节点以相同格式写出，直接上传原文件，无需解析再序列化
+                stored_patent = await asyncio.to_thread(
+                    r2_storage.put_file,
+                    patent_key,
+                    str(patent_json_path),
+                    "application/json",
+                )
+            else:
+                stored_patent = await asyncio.to_thread(r2_storage.put_bytes, patent_key, b"{}", "application/json")
+            if stored_patent:
+                stored_keys["patent_r2_key"] = patent_key
+
+        if stored_keys:
+            # 与完成通知邮件并发写 metadata，只在库内合并对象键，不整体覆盖
+            await asyncio.to_thread(task_manager.storage.merge_task_output_files, task_id, stored_keys)
+    except Exception as exc:
+        logger.warning(f"AI 分析产物上传 R2 失败：task_id={task_id} pn={final_pn} error={exc}")
+    return stored_keys
+
+
 def _best_effort_fail_task(task_id: str, message: str):
     try:
         task_manager.fail_task(task_id, message)
@@ -868,6 +1030,14 @@ def _get_owned_task(task_id: str, owner_id: str):
     return task
 
 
+def _get_owned_task_snapshot(task_id: str, owner_id: str):
+    """读路径的归属校验走进程内快照缓存。"""
+    task = task_manager.get_task_snapshot(task_id) if hasattr(task_manager, "get_task_snapshot") else task_manager.get_task(task_id)
+    if not task or task.owner_id != owner_id:
+        raise HTTPException(status_code=404, detail="任务不存在。")
+    return task
+
+
 async def run_patent_analysis_task(
     task_id: str,
     pn: Optional[str],
@@ -890,7 +1060,12 @@ async def run_patent_analysis_task(
         task_manager.start_task(task_id)
         r2_storage = _build_r2_storage()
 
-        cached_analysis_payload = _get_cached_analysis_payload(pn=pn, input_sha256=normalized_input_sha256)
+        # 按 PN 或上传内容 SHA-256 查找历史分析结果；涉及数据库与 R2 读取，放到线程中执行
+        cached_analysis_payload = await asyncio.to_thread(
+            _get_cached_analysis_payload,
+            pn=pn,
+            input_sha256=normalized_input_sha256,
+        )
         if cached_analysis_payload:
             metadata = cached_analysis_payload.get("metadata", {})
             resolved_pn = str(metadata.get("resolved_pn") or pn or "").strip().upper()
@@ -945,7 +1120,6 @@ async def run_patent_analysis_task(
         )
         task_manager.update_progress(task_id, 5, "正在准备材料")
 
-        loop = asyncio.get_event_loop()
 
         def run_workflow() -> Dict[str, Any]:
             workflow_start = perf_counter()
@@ -997,7 +1171,7 @@ async def run_patent_analysis_task(
                             progress = int(float(progress_raw))
                         except Exception:
                             continue
-                        progress = max(0, min(95, progress))
+                        progress = _clamp_reported_progress(progress, last_progress)
                         if progress <= 0:
                             continue
                         if progress != last_progress or step_label != last_step:
@@ -1031,11 +1205,9 @@ async def run_patent_analysis_task(
             finally:
                 workflow_elapsed = perf_counter() - workflow_start
                 status = str(last_state.get("status", "unknown")).strip().lower()
-                task_logger.info(
-                    f"patent_analysis workflow 总耗时: {workflow_elapsed:.3f}s status={status}"
-                )
+                task_logger.info("patent_analysis workflow 总耗时: {:.3f}s status={}", workflow_elapsed, status)
 
-        result = await loop.run_in_executor(None, run_workflow)
+        result = await _run_task_workflow(run_workflow)
 
         if cancel_event and cancel_event.is_set():
             task_manager.cancel_task(task_id, "任务已取消")
@@ -1119,8 +1291,8 @@ async def run_patent_analysis_task(
                 "pn": final_pn,
             }
 
-            pdf_bytes = await asyncio.to_thread(_read_local_pdf_bytes, output_pdf)
-            if not pdf_bytes:
+            has_pdf = await asyncio.to_thread(_local_file_has_content, output_pdf)
+            if not has_pdf:
                 error_msg = f"报告文件不存在或为空：{output_pdf}"
                 task_manager.fail_task(task_id, error_msg)
                 latest_task = task_manager.get_task(task_id)
@@ -1136,7 +1308,6 @@ async def run_patent_analysis_task(
             output_dir = settings.OUTPUT_DIR / task_id
             analysis_json_path = output_dir / "analysis.json"
             patent_json_path = output_dir / "patent.json"
-            patent_json_payload = _load_json(patent_json_path) or {}
             resolved_input_sha256 = _resolve_input_sha256(
                 normalized_input_sha256,
                 str(output_dir / "raw.pdf"),
@@ -1154,48 +1325,28 @@ async def run_patent_analysis_task(
                 output_pdf=output_pdf,
                 output_md=output_md,
             )
-            analysis_json_path.write_text(
-                json.dumps(analysis_payload, ensure_ascii=False, indent=2),
-                encoding="utf-8",
-            )
+            analysis_json_bytes = json.dumps(analysis_payload, ensure_ascii=False, indent=2).encode("utf-8")
+            # 分析 JSON 可达数 MB，落盘放到线程中执行，避免阻塞事件循环
+            await asyncio.to_thread(analysis_json_path.write_bytes, analysis_json_bytes)
             output_files["json"] = str(analysis_json_path)
 
-            if r2_storage.enabled:
-                pdf_key = r2_storage.build_patent_pdf_key(final_pn)
-                stored_pdf = await asyncio.to_thread(
-                    r2_storage.put_bytes,
-                    pdf_key,
-                    pdf_bytes,
-                    "application/pdf",
-                )
-                analysis_key = r2_storage.build_analysis_json_key(final_pn)
-                stored_analysis = await asyncio.to_thread(
-                    r2_storage.put_bytes,
-                    analysis_key,
-                    json.dumps(analysis_payload, ensure_ascii=False, indent=2).encode("utf-8"),
-                    "application/json",
-                )
-                patent_key = r2_storage.build_patent_json_key(final_pn)
-                stored_patent = await asyncio.to_thread(
-                    r2_storage.put_bytes,
-                    patent_key,
-                    json.dumps(patent_json_payload, ensure_ascii=False, indent=2).encode("utf-8"),
-                    "application/json",
-                )
-
-                if stored_pdf:
-                    output_files["r2_key"] = pdf_key
-                if stored_analysis:
-                    output_files["analysis_r2_key"] = analysis_key
-                if stored_patent:
-                    output_files["patent_r2_key"] = patent_key
-
             task_manager.complete_task(task_id, output_files=output_files)
             if hasattr(task_manager.storage, "record_patent_analysis"):
                 try:
                     task_manager.storage.record_patent_analysis(final_pn, resolved_input_sha256)
                 except TypeError:
                     task_manager.storage.record_patent_analysis(final_pn)
+            if r2_storage.enabled:
+                # 本地报告已可下载，R2 缓存在后台上传，完成后回写对象键
+                _schedule_r2_upload(
+                    _upload_patent_analysis_artifacts(
+                        task_id,
+                        final_pn,
+                        output_pdf=output_pdf,
+                        analysis_json_bytes=analysis_json_bytes,
+                        patent_json_path=patent_json_path,
+                    )
+                )
             task_logger.bind(stage="finalize_report").success(f"任务已完成：{output_pdf}")
             emit_system_log(
                 category="task_execution",
@@ -1319,8 +1470,11 @@ async def run_ai_review_task(
         )
         task_manager.update_progress(task_id, 5, "正在准备材料")
 
-        cached_analysis_payload = _get_cached_analysis_payload(pn=pn, input_sha256=input_sha256)
-        loop = asyncio.get_event_loop()
+        cached_analysis_payload = await asyncio.to_thread(
+            _get_cached_analysis_payload,
+            pn=pn,
+            input_sha256=input_sha256,
+        )
 
         def run_workflow() -> Dict[str, Any]:
             workflow_start = perf_counter()
@@ -1373,7 +1527,7 @@ async def run_ai_review_task(
                             progress = int(float(progress_raw))
                         except Exception:
                             continue
-                        progress = max(0, min(95, progress))
+                        progress = _clamp_reported_progress(progress, last_progress)
                         if progress <= 0:
                             continue
                         if progress != last_progress or step_label != last_step:
@@ -1406,11 +1560,9 @@ async def run_ai_review_task(
             finally:
                 workflow_elapsed = perf_counter() - workflow_start
                 status = str(last_state.get("status", "unknown")).strip().lower()
-                task_logger.info(
-                    f"ai_review workflow 总耗时: {workflow_elapsed:.3f}s status={status}"
-                )
+                task_logger.info("ai_review workflow 总耗时: {:.3f}s status={}", workflow_elapsed, status)
 
-        result = await loop.run_in_executor(None, run_workflow)
+        result = await _run_task_workflow(run_workflow)
 
         if cancel_event and cancel_event.is_set():
             task_manager.cancel_task(task_id, "任务已取消")
@@ -1476,8 +1628,8 @@ async def run_ai_review_task(
                     title=_build_task_title(TaskType.AI_REVIEW.value, pn=final_pn),
                 )
 
-            pdf_bytes = await asyncio.to_thread(_read_local_pdf_bytes, output_pdf)
-            if not pdf_bytes:
+            has_pdf = await asyncio.to_thread(_local_file_has_content, output_pdf)
+            if not has_pdf:
                 error_msg = f"报告文件不存在或为空：{output_pdf}"
                 task_manager.fail_task(task_id, error_msg)
                 task_logger.bind(stage="finalize_report").error(error_msg)
@@ -1510,9 +1662,9 @@ async def run_ai_review_task(
                 ai_review_pdf_key = r2_storage.build_ai_review_pdf_key(final_pn)
                 ai_review_json_key = r2_storage.build_ai_review_json_key(final_pn)
                 stored_pdf = await asyncio.to_thread(
-                    r2_storage.put_bytes,
+                    r2_storage.put_file,
                     ai_review_pdf_key,
-                    pdf_bytes,
+                    output_pdf,
                     "application/pdf",
                 )
                 stored_json = await asyncio.to_thread(
@@ -1628,7 +1780,6 @@ async def run_ai_reply_task(
         )
         task_manager.update_progress(task_id, 5, "正在准备材料")
 
-        loop = asyncio.get_event_loop()
 
         def run_workflow() -> Dict[str, Any]:
             from patent_agents.ai_reply.main import create_workflow
@@ -1686,7 +1837,7 @@ async def run_ai_reply_task(
                         progress = int(float(progress_raw))
                     except Exception:
                         continue
-                    progress = max(0, min(95, progress))
+                    progress = _clamp_reported_progress(progress, last_progress)
                     if progress <= 0:
                         continue
                     if progress != last_progress or step_label != last_step:
@@ -1717,10 +1868,7 @@ async def run_ai_reply_task(
                         last_step = step_label
             return last_state
 
-        result = await asyncio.wait_for(
-            loop.run_in_executor(None, run_workflow),
-            timeout=settings.OAR_WORKFLOW_TIMEOUT_SECONDS,
-        )
+        result = await _run_task_workflow(run_workflow, timeout=settings.OAR_WORKFLOW_TIMEOUT_SECONDS)
 
         if cancel_event and cancel_event.is_set():
             task_manager.cancel_task(task_id, "任务已取消")
@@ -1786,8 +1934,8 @@ async def run_ai_reply_task(
         md_path = artifacts.get("markdown_path") or str(output_dir / "final_report.md")
         json_path = str(output_dir / "final_report.json")
 
-        pdf_bytes = await asyncio.to_thread(_read_local_pdf_bytes, pdf_path)
-        if not pdf_bytes:
+        has_pdf = await asyncio.to_thread(_local_file_has_content, pdf_path)
+        if not has_pdf:
             error_msg = f"报告文件不存在或为空：{pdf_path}"
             task_manager.fail_task(task_id, error_msg)
             latest_task = task_manager.get_task(task_id)
@@ -1829,9 +1977,9 @@ async def run_ai_reply_task(
         if r2_storage.enabled and final_pn:
             ai_reply_pdf_key = r2_storage.build_ai_reply_pdf_key(final_pn)
             stored_pdf = await asyncio.to_thread(
-                r2_storage.put_bytes,
+                r2_storage.put_file,
                 ai_reply_pdf_key,
-                pdf_bytes,
+                pdf_path,
                 "application/pdf",
             )
             if stored_pdf:
@@ -1851,12 +1999,11 @@ async def run_ai_reply_task(
 
             json_file = Path(json_path)
             if json_file.exists():
-                json_bytes = await asyncio.to_thread(json_file.read_bytes)
                 ai_reply_json_key = r2_storage.build_ai_reply_json_key(final_pn)
                 stored_json = await asyncio.to_thread(
-                    r2_storage.put_bytes,
+                    r2_storage.put_file,
                     ai_reply_json_key,
-                    json_bytes,
+                    json_path,
                     "application/json",
                 )
                 if stored_json:
@@ -1977,15 +2124,21 @@ async def run_ai_reply_task(
 @router.get("/api/tasks")
 async def list_tasks(current_user: CurrentUser = Depends(_get_current_user)):
     """获取用户的任务列表"""
-    tasks = [
-        task
-        for task in task_manager.list_tasks(owner_id=current_user.user_id)
+    # 逐行解码并立即转为响应字典，不再整页持有 Task 列表
+    items = [
+        _task_to_response(task)
+        for task in task_manager.iter_tasks(
+            owner_id=current_user.user_id,
+            exclude_task_types=sorted(KNOWN_TASK_TYPES - VISIBLE_TASK_TYPES),
+            snapshot=True,
+        )
         if _task_type(task) in VISIBLE_TASK_TYPES
     ]
-    return {
-        "tasks": [_task_to_response(task) for task in tasks],
-        "total": len(tasks),
-    }
+    # 列表只含基础类型，直接编码为字节返回，跳过 FastAPI 对每个字段的 jsonable_encoder 递归
+    return Response(
+        content=dump_json_bytes({"tasks": items, "total": len(items)}),
+        media_type="application/json",
+    )
 
 
 @router.get("/api/tasks/patent-validation", response_model=PatentNumberValidationResponse)
@@ -2064,8 +2217,7 @@ async def create_task(
         upload_sha256: Optional[str] = None
         try:
             if file:
-                upload_file_path = await _save_upload_file(task.id, file, "patent", "source")
-                upload_sha256 = _compute_file_sha256(upload_file_path)
+                upload_file_path, upload_sha256 = await _save_upload_file_with_sha256(task.id, file, "patent", "source")
                 task_metadata["input_files"].append(
                     {
                         "file_type": "patent_pdf",
@@ -2216,12 +2368,7 @@ async def create_task(
 
 @router.get("/api/tasks/{task_id}")
 async def get_task(task_id: str, current_user: CurrentUser = Depends(_get_current_user)):
-    task = task_manager.get_task_snapshot(task_id) if hasattr(task_manager, "get_task_snapshot") else task_manager.get_task(task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="任务不存在。")
-    if task.owner_id != current_user.user_id:
-        raise HTTPException(status_code=404, detail="任务不存在。")
-    return _task_to_response(task)
+    return _task_to_response(_get_owned_task_snapshot(task_id, current_user.user_id))
 
 
 @router.post("/api/tasks/{task_id}/cancel", response_model=TaskResponse)
@@ -2246,7 +2393,7 @@ async def cancel_task(task_id: str, current_user: CurrentUser = Depends(_get_cur
 
     runtime = RUNNING_TASKS.get(task_id)
     if runtime:
-        runtime.set()
+        runtime.cancel_event.set()
     task_manager.cancel_task(task_id, "任务已取消")
     return TaskResponse(taskId=task_id, status="cancelled", message="任务已取消。")
 
@@ -2352,7 +2499,7 @@ async def delete_task(task_id: str, current_user: CurrentUser = Depends(_get_cur
 @router.delete("/api/tasks")
 async def clear_tasks(current_user: CurrentUser = Depends(_get_current_user)):
     tasks = task_manager.list_tasks(owner_id=current_user.user_id, limit=1000)
-    deleted = 0
+    deletable_ids: List[str] = []
     skipped_running = 0
     for task in tasks:
         if _is_running_task(task):
@@ -2364,12 +2511,13 @@ async def clear_tasks(current_user: CurrentUser = Depends(_get_current_user)):
         else:
             _cleanup_task_resources(task)
 
-        if task_manager.delete_task(task.id):
-            deleted += 1
+        deletable_ids.append(task.id)
         RUNNING_TASKS.pop(task.id, None)
         PATENT_CHECKPOINTERS.pop(task.id, None)
         AI_REVIEW_CHECKPOINTERS.pop(task.id, None)
         OAR_CHECKPOINTERS.pop(task.id, None)
+    # 逐条删除在 D1 下每条一次往返，改为批量软删除
+    deleted = task_manager.delete_tasks(deletable_ids)
 
     emit_system_log(
         category="task_execution",
@@ -2396,7 +2544,8 @@ async def download_result(task_id: str, current_user: CurrentUser = Depends(_get
     if task_type == TaskType.AI_SEARCH.value:
         report_path_text = str(output_files.get("ai_search_report_pdf") or "").strip()
         report_path = Path(report_path_text) if report_path_text else Path(task.output_dir or settings.OUTPUT_DIR / task_id) / "ai_search_report.pdf"
-        if not report_path.exists():
+        report_stat = await asyncio.to_thread(_stat_download_file, report_path)
+        if report_stat is None:
             return JSONResponse(
                 status_code=404,
                 content={
@@ -2416,20 +2565,39 @@ async def download_result(task_id: str, current_user: CurrentUser = Depends(_get
             message="下载 AI 检索报告",
             payload={"filename": filename},
         )
-        return FileResponse(
+        return ReportFileResponse(
             path=str(report_path),
             filename=filename,
             media_type="application/pdf",
+            stat_result=report_stat,
         )
 
     r2_storage = _build_r2_storage()
     r2_key = _build_task_pdf_r2_key(task_type, task.pn, r2_storage)
     if r2_key and r2_storage.enabled:
-        r2_pdf = await asyncio.to_thread(r2_storage.get_bytes, r2_key)
-        if r2_pdf:
-            from io import BytesIO
-            from urllib.parse import quote
-
+        presigned_ttl = settings.R2_PRESIGNED_DOWNLOAD_TTL_SECONDS
+        if presigned_ttl > 0 and await asyncio.to_thread(r2_storage.key_exists, r2_key):
+            # 浏览器直接从 R2 下载，文件不再经服务端内存与上行带宽
+            download_url = r2_storage.generate_download_url(
+                r2_key,
+                expires_in=presigned_ttl,
+                content_disposition=_attachment_content_disposition(filename),
+                content_type="application/pdf",
+            )
+            if download_url:
+                emit_system_log(
+                    category="task_execution",
+                    event_name="task_download",
+                    owner_id=current_user.user_id,
+                    task_id=task_id,
+                    task_type=task_type,
+                    success=True,
+                    message="下载任务报告（R2 预签名）",
+                    payload={"filename": filename},
+                )
+                return RedirectResponse(download_url, status_code=307)
+        r2_body = await asyncio.to_thread(r2_storage.open_stream, r2_key)
+        if r2_body is not None:
             emit_system_log(
                 category="task_execution",
                 event_name="task_download",
@@ -2441,10 +2609,10 @@ async def download_result(task_id: str, current_user: CurrentUser = Depends(_get
                 payload={"filename": filename},
             )
             return StreamingResponse(
-                BytesIO(r2_pdf),
+                r2_storage.iter_stream(r2_body),
                 media_type="application/pdf",
                 headers={
-                    "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+                    "Content-Disposition": _attachment_content_disposition(filename),
                 },
             )
 
@@ -2457,7 +2625,8 @@ async def download_result(task_id: str, current_user: CurrentUser = Depends(_get
         artifact_name = task.pn or task_id
         pdf_path = Path(task.output_dir or settings.OUTPUT_DIR / task_id) / f"{artifact_name}.pdf"
 
-    if not pdf_path.exists():
+    pdf_stat = await asyncio.to_thread(_stat_download_file, pdf_path)
+    if pdf_stat is None:
         return JSONResponse(
             status_code=404,
             content={
@@ -2479,8 +2648,9 @@ async def download_result(task_id: str, current_user: CurrentUser = Depends(_get
         payload={"filename": filename},
     )
 
-    return FileResponse(
+    return ReportFileResponse(
         path=str(pdf_path),
         filename=filename,
         media_type="application/pdf",
+        stat_result=pdf_stat,
     )
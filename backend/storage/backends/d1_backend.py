@@ -6,12 +6,14 @@ import hashlib
 import json
 import os
 import re
+import threading
 import time
 from time import perf_counter
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 import requests
 from loguru import logger
+from requests.adapters import HTTPAdapter
 
 from backend.system_logs import suppress_outbound_request_logging
 from backend.time_utils import utc_now_z
@@ -30,6 +32,9 @@ from ..schema.shared_schema import (
 )
 
 
+_SESSION_INIT_LOCK = threading.Lock()
+
+
 class D1Backend:
     SCHEMA_META_TABLE = D1_SCHEMA_META_TABLE
     SCHEMA_META_KEY = D1_SCHEMA_META_KEY
@@ -65,10 +70,30 @@ class D1Backend:
             self.retry_base_delay_seconds,
             float(os.getenv("D1_REQUEST_RETRY_MAX_DELAY_SECONDS", "4") or 4.0),
         )
+        self.pool_maxsize = max(1, int(os.getenv("D1_HTTP_POOL_MAXSIZE", "16") or 16))
+        self._session = self._build_session()
 
         self._init_database()
         logger.info("D1 任务存储初始化完成")
 
+    def _build_session(self) -> requests.Session:
+        # 复用 TCP/TLS 连接；重试由 _post_query 统一处理，适配器不再叠加重试
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=getattr(self, "pool_maxsize", 16))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(self.headers)
+        return session
+
+    def _http_session(self) -> requests.Session:
+        session = getattr(self, "_session", None)
+        if session is None:
+            with _SESSION_INIT_LOCK:
+                session = getattr(self, "_session", None)
+                if session is None:
+                    session = self._session = self._build_session()
+        return session
+
     @staticmethod
     def _parse_retry_after_seconds(response: Optional[requests.Response]) -> Optional[int]:
         if response is None:
@@ -96,16 +121,30 @@ class D1Backend:
         payload: Dict[str, Any] = {"sql": sql}
         if params:
             payload["params"] = [self._normalize_update_value(self._encode_metadata(v)) for v in params]
+        results = self._post_query(payload)
+        return results[0] if results else {}
+
+    def _request_batch(self, statements: Sequence[str]) -> List[Dict[str, Any]]:
+        """多条无参语句合并为一次 /query 调用，按顺序返回每条语句的结果。"""
+        statements = [str(sql).strip().rstrip(";") for sql in statements if str(sql or "").strip()]
+        if not statements:
+            return []
+        results = self._post_query({"sql": ";\n".join(statements)})
+        if len(results) != len(statements):
+            raise StorageError(
+                f"D1 batch returned {len(results)} results for {len(statements)} statements"
+            )
+        return results
 
+    def _post_query(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
         attempts = self.max_retries + 1
         last_error: Optional[Exception] = None
         last_cause = ""
         for attempt in range(1, attempts + 1):
             try:
                 with suppress_outbound_request_logging():
-                    response = requests.post(
+                    response = self._http_session().post(
                         self.endpoint,
-                        headers=self.headers,
                         json=payload,
                         timeout=self.timeout_seconds,
                     )
@@ -164,13 +203,10 @@ class D1Backend:
             raise StorageError(f"D1 API error: {data.get('errors') or data}")
 
         result = data.get("result") or []
-        if not result:
-            return {}
-
-        statement_result = result[0]
-        if statement_result.get("success") is False:
-            raise StorageError(f"D1 SQL execution failed: {statement_result}")
-        return statement_result
+        for statement_result in result:
+            if statement_result.get("success") is False:
+                raise StorageError(f"D1 SQL execution failed: {statement_result}")
+        return result
 
     def _retry_delay_seconds(self, attempt: int, retry_after_seconds: Optional[int]) -> float:
         if retry_after_seconds is not None:
@@ -217,17 +253,20 @@ class D1Backend:
     def _is_create_table_statement(sql: str) -> bool:
         return str(sql or "").strip().upper().startswith("CREATE TABLE")
 
-    def _ensure_schema_meta_table(self) -> None:
-        self._request(self.SCHEMA_META_TABLE_SQL)
-
-    def _get_schema_meta_value(self, key: str) -> Optional[str]:
-        row = self._fetchone(
-            f"SELECT value FROM {self.SCHEMA_META_TABLE} WHERE key = ?",
-            [str(key or "").strip()],
+    def _load_schema_meta_value(self, key: str) -> Optional[str]:
+        """建元数据表与读取版本号合并为一次请求，热启动只需一次往返。"""
+        # 批量语句不支持绑定参数；key 为类常量，仍按 SQL 字面量转义
+        literal_key = str(key or "").strip().replace("'", "''")
+        results = self._request_batch(
+            [
+                self.SCHEMA_META_TABLE_SQL,
+                f"SELECT value FROM {self.SCHEMA_META_TABLE} WHERE key = '{literal_key}'",
+            ]
         )
-        if not row:
+        rows = results[-1].get("results") if results else None
+        if not rows or not isinstance(rows, list):
             return None
-        value = row.get("value")
+        value = rows[0].get("value")
         text = str(value).strip() if value is not None else ""
         return text or None
 
@@ -255,9 +294,8 @@ class D1Backend:
 
     def _init_database(self):
         started_at = perf_counter()
-        self._ensure_schema_meta_table()
         target_version = self._schema_bootstrap_version()
-        current_version = self._get_schema_meta_value(self.SCHEMA_META_KEY)
+        current_version = self._load_schema_meta_value(self.SCHEMA_META_KEY)
         if current_version == target_version:
             elapsed_ms = round((perf_counter() - started_at) * 1000, 1)
             logger.info(
@@ -274,12 +312,12 @@ class D1Backend:
         added_columns = 0
         touched_tables: List[str] = []
 
-        for sql in table_statements:
-            self._request(sql)
-        for sql in other_statements:
-            self._request(sql)
+        # 建表、列探测、补列与建索引各合并为一次请求，冷启动只需少量往返
+        self._request_batch(table_statements + other_statements)
+        existing_columns_by_table = self._get_existing_columns_batch(self.REQUIRED_COLUMNS)
+        migration_statements: List[str] = []
         for table_name, required_columns in self.REQUIRED_COLUMNS.items():
-            existing_columns = self._get_existing_columns(table_name)
+            existing_columns = existing_columns_by_table.get(table_name, set())
             for column_name, ddl in required_columns:
                 if column_name not in existing_columns:
                     add_column_ddl = relax_column_ddl_for_add_column(ddl)
@@ -291,13 +329,11 @@ class D1Backend:
                             ddl,
                             add_column_ddl,
                         )
-                    self._request(f"ALTER TABLE {table_name} ADD COLUMN {add_column_ddl}")
+                    migration_statements.append(f"ALTER TABLE {table_name} ADD COLUMN {add_column_ddl}")
                     added_columns += 1
                     touched_tables.append(table_name)
-        for sql in index_statements:
-            self._request(sql)
-        for sql in self.EXTRA_INDEX_SQL:
-            self._request(sql)
+        # 索引可能依赖新补的列，需排在 ALTER 之后
+        self._request_batch(migration_statements + index_statements + list(self.EXTRA_INDEX_SQL))
         self._request(
             "UPDATE tasks SET task_type = ? WHERE task_type IS NULL OR task_type = ''",
             [TaskType.PATENT_ANALYSIS.value],
@@ -315,11 +351,22 @@ class D1Backend:
             elapsed_ms,
         )
 
-    def _get_existing_columns(self, table_name: str) -> set[str]:
-        rows = self._fetchall(f"PRAGMA table_info({table_name})")
+    @staticmethod
+    def _column_names(rows: Any) -> set[str]:
         columns = set()
-        for row in rows:
+        for row in rows if isinstance(rows, list) else []:
             name = row.get("name")
             if name:
                 columns.add(str(name))
         return columns
+
+    def _get_existing_columns(self, table_name: str) -> set[str]:
+        return self._column_names(self._fetchall(f"PRAGMA table_info({table_name})"))
+
+    def _get_existing_columns_batch(self, table_names: Iterable[str]) -> Dict[str, set[str]]:
+        table_names = list(table_names)
+        results = self._request_batch([f"PRAGMA table_info({table_name})" for table_name in table_names])
+        return {
+            table_name: self._column_names(result.get("results"))
+            for table_name, result in zip(table_names, results)
+        }
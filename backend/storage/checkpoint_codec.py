@@ -2,20 +2,16 @@
 
 from __future__ import annotations
 
-import base64
+import binascii
 import json
 from typing import Any, Tuple
 
 
 def encode_typed_value(value: Tuple[str, bytes]) -> str:
     kind, payload = value
-    return json.dumps(
-        {
-            "type": kind,
-            "data": base64.b64encode(payload).decode("ascii"),
-        },
-        ensure_ascii=False,
-    )
+    # base64 字母表无需 JSON 转义：直接拼接，避免编码器再扫描一遍大段载荷
+    data = binascii.b2a_base64(payload, newline=False).decode("ascii")
+    return f'{{"type": {json.dumps(kind, ensure_ascii=False)}, "data": "{data}"}}'
 
 
 def decode_typed_value(raw: Any) -> Tuple[str, bytes]:
@@ -28,4 +24,5 @@ def decode_typed_value(raw: Any) -> Tuple[str, bytes]:
     data = json.loads(raw)
     kind = str(data.get("type") or "")
     payload_b64 = str(data.get("data") or "")
-    return kind, base64.b64decode(payload_b64.encode("ascii"))
+    # a2b_base64 直接接受 ASCII str，省去 encode 出的中间 bytes
+    return kind, binascii.a2b_base64(payload_b64)
@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-import json
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+from backend.json_utils import dump_json_text, load_json
 from backend.time_utils import parse_storage_ts, to_utc_z
 from .models import (
     AccountMonthTarget,
@@ -17,6 +17,10 @@ from .models import (
 )
 
 
+# 枚举构造走 EnumMeta.__call__，逐行解码时直接查表
+_TASK_STATUS_BY_VALUE: Dict[str, TaskStatus] = {status.value: status for status in TaskStatus}
+
+
 class StorageCodecsMixin:
     @staticmethod
     def _parse_metadata(raw: Any) -> Dict[str, Any]:
@@ -26,7 +30,7 @@ class StorageCodecsMixin:
             return raw
         if isinstance(raw, str):
             try:
-                return json.loads(raw)
+                return load_json(raw)
             except Exception:
                 return {}
         return {}
@@ -34,7 +38,7 @@ class StorageCodecsMixin:
     @staticmethod
     def _encode_metadata(value: Any) -> Any:
         if isinstance(value, dict):
-            return json.dumps(value, ensure_ascii=False)
+            return dump_json_text(value)
         return value
 
     @staticmethod
@@ -42,7 +46,7 @@ class StorageCodecsMixin:
         if value is None:
             return None
         if isinstance(value, (dict, list, tuple)):
-            return json.dumps(value, ensure_ascii=False)
+            return dump_json_text(value)
         return value
 
     @staticmethod
@@ -65,21 +69,24 @@ class StorageCodecsMixin:
         return normalized
 
     def _row_to_task(self, row: Dict[str, Any]) -> Task:
+        status = row["status"]
+        completed_at = row.get("completed_at")
+        deleted_at = row.get("deleted_at")
         return Task(
             id=row["id"],
             owner_id=row.get("owner_id"),
             task_type=row.get("task_type") or TaskType.PATENT_ANALYSIS.value,
             pn=row.get("pn"),
             title=row.get("title"),
-            status=TaskStatus(row["status"]),
+            status=_TASK_STATUS_BY_VALUE.get(status) or TaskStatus(status),
             progress=row.get("progress", 0),
             current_step=row.get("current_step"),
             output_dir=row.get("output_dir"),
             error_message=row.get("error_message"),
             created_at=parse_storage_ts(row["created_at"], naive_strategy="utc"),
             updated_at=parse_storage_ts(row["updated_at"], naive_strategy="utc"),
-            completed_at=parse_storage_ts(row["completed_at"], naive_strategy="utc") if row.get("completed_at") else None,
-            deleted_at=parse_storage_ts(row["deleted_at"], naive_strategy="utc") if row.get("deleted_at") else None,
+            completed_at=parse_storage_ts(completed_at, naive_strategy="utc") if completed_at else None,
+            deleted_at=parse_storage_ts(deleted_at, naive_strategy="utc") if deleted_at else None,
             metadata=self._parse_metadata(row.get("metadata")),
         )
 
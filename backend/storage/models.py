@@ -85,7 +85,7 @@ class AccountMonthTarget:
     updated_at: datetime = field(default_factory=utc_now)
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     id: str
     owner_id: Optional[str] = None
@@ -2,15 +2,18 @@
 Pipeline 适配器：将 TaskStorage 与 PatentPipeline 集成。
 """
 
-import json
+import copy
+import secrets
 import threading
-import uuid
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from loguru import logger
 
 from config import settings
+from backend.stream_notifier import task_stream_notifier
 from backend.time_utils import utc_now
 from .models import Task, TaskStatus, TaskType
 from .interfaces import TaskStorage
@@ -30,19 +33,97 @@ DEFAULT_PIPELINE_STEPS = [
     ("render", "渲染报告"),
 ]
 
+LIVE_SNAPSHOT_TTL_SECONDS = 30.0
+LIVE_SNAPSHOT_MAX_SIZE = 10000
+# 完整任务行供流程与下载等路径读取，TTL 更短以缩小其他进程写入的可见延迟
+LIVE_TASK_TTL_SECONDS = 2.0
+LIVE_TASK_MAX_SIZE = 1024
+
+# 任务快照的进程内镜像：前端轮询任务详情时直接读内存；本进程任何 update_task/delete_task 写入都会经
+# task_stream_notifier 使对应条目失效，TTL 兜底其他进程的写入
+_live_snapshot_lock = threading.Lock()
+_live_snapshots: "OrderedDict[str, Tuple[int, float, Task]]" = OrderedDict()
+_live_tasks: "OrderedDict[str, Tuple[int, float, Task]]" = OrderedDict()
+# 每次失效递增；读库期间若发生写入则放弃回填，避免缓存旧值
+_live_snapshot_generation = 0
+
+
+# 创建、失败、取消会改变用户当日任务数或积分占用，按 owner 维度通知，供用量缓存等按用户失效
+OWNER_TASKS_NOTIFY_PREFIX = "owner-tasks:"
+
+
+def _notify_owner_tasks_changed(owner_id: Optional[str]) -> None:
+    if owner_id:
+        task_stream_notifier.notify(f"{OWNER_TASKS_NOTIFY_PREFIX}{owner_id}")
+
+
+def _invalidate_live_snapshot(task_id: str) -> None:
+    global _live_snapshot_generation
+    if task_id.startswith(OWNER_TASKS_NOTIFY_PREFIX):
+        return
+    with _live_snapshot_lock:
+        _live_snapshot_generation += 1
+        _live_snapshots.pop(task_id, None)
+        _live_tasks.pop(task_id, None)
+
+
+def _read_through_live_cache(
+    cache: "OrderedDict[str, Tuple[int, float, Task]]",
+    storage_key: int,
+    task_id: str,
+    ttl_seconds: float,
+    max_size: int,
+    loader: Callable[[str], Optional[Task]],
+) -> Optional[Task]:
+    now = time.monotonic()
+    with _live_snapshot_lock:
+        cached = cache.get(task_id)
+        if cached and cached[0] == storage_key and cached[1] > now:
+            cache.move_to_end(task_id)
+            return copy.deepcopy(cached[2])
+        generation = _live_snapshot_generation
+
+    task = loader(task_id)
+    if task is None:
+        return None
+
+    with _live_snapshot_lock:
+        if generation != _live_snapshot_generation:
+            return task
+        cache[task_id] = (storage_key, now + ttl_seconds, copy.deepcopy(task))
+        cache.move_to_end(task_id)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+    return task
+
+
+task_stream_notifier.add_listener(_invalidate_live_snapshot)
+
 
 class PipelineTaskManager:
     def __init__(self, storage: Optional[TaskStorage] = None):
         self.storage = storage or get_task_storage()
 
+    @staticmethod
+    def new_task_id() -> str:
+        # 保持 8 位十六进制格式（输出目录、默认标题识别均依赖），直接取随机字节，免去构造 UUID
+        return secrets.token_hex(4)
+
     def create_task(
         self,
         owner_id: Optional[str] = None,
         task_type: str = TaskType.PATENT_ANALYSIS.value,
         pn: Optional[str] = None,
         title: Optional[str] = None,
+        *,
+        task_id: Optional[str] = None,
+        status: TaskStatus = TaskStatus.PENDING,
+        progress: int = 0,
+        current_step: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
     ) -> Task:
-        task_id = str(uuid.uuid4())[:8]
+        """初始状态随 INSERT 一并写入，调用方无需创建后再补一次 update_task。"""
+        task_id = task_id or self.new_task_id()
 
         if not title and pn:
             title = f"AI 分析任务 - {pn}"
@@ -64,16 +145,19 @@ class PipelineTaskManager:
             task_type=task_type,
             pn=pn,
             title=title,
-            status=TaskStatus.PENDING,
-            progress=0,
+            status=TaskStatus(status),
+            progress=progress,
+            current_step=current_step,
             output_dir=output_dir,
             created_at=utc_now(),
             updated_at=utc_now(),
+            metadata=metadata or {},
         )
 
-        self.storage.create_task(task)
+        task = self.storage.create_task(task)
+        _notify_owner_tasks_changed(owner_id)
 
-        logger.info(f"任务已创建：{task_id}（PN: {pn}）")
+        logger.info("任务已创建：{}（PN: {}）", task_id, pn)
         return task
 
     def start_task(self, task_id: str) -> bool:
@@ -83,7 +167,7 @@ class PipelineTaskManager:
             updated_at=utc_now(),
         )
         if success:
-            logger.info(f"任务已开始：{task_id}")
+            logger.info("任务已开始：{}", task_id)
         return success
 
     def update_progress(
@@ -104,43 +188,26 @@ class PipelineTaskManager:
         return success
 
     def complete_task(self, task_id: str, output_files: Optional[Dict[str, str]] = None) -> bool:
-        now = utc_now()
-        metadata_updates = {}
-
-        if output_files:
-            task = self.storage.get_task(task_id)
-            if task and task.metadata:
-                metadata_updates = task.metadata.copy()
-            metadata_updates["output_files"] = output_files
-
-        updates = {
-            "status": TaskStatus.COMPLETED.value,
-            "progress": 100,
-            "completed_at": now.isoformat(),
-            "updated_at": now.isoformat(),
-        }
-        if metadata_updates:
-            updates["metadata"] = json.dumps(metadata_updates, ensure_ascii=False)
-
-        success = self.storage.update_task(task_id, **updates)
-        if success:
-            try:
-                task = self.storage.get_task(task_id)
-                analysis_pn = None
-                if output_files and isinstance(output_files, dict):
-                    analysis_pn = output_files.get("pn")
-                if not analysis_pn and task:
-                    analysis_pn = task.pn
-                if analysis_pn and task and str(task.task_type) == TaskType.PATENT_ANALYSIS.value:
-                    self.storage.record_patent_analysis(analysis_pn)
-            except Exception as exc:
-                logger.warning(f"记录 AI 分析统计失败（{task_id}）：{exc}")
-            logger.info(f"任务已完成：{task_id}")
-        return success
-
-    def _resolve_terminal_completed_at(self, task_id: str, now: datetime) -> str:
+        # 一次 UPDATE ... RETURNING 完成状态写入与元数据合并，并取回任务用于统计
+        task = self.storage.complete_task(task_id, output_files=output_files)
+        if task is None:
+            return False
+        try:
+            analysis_pn = None
+            if output_files and isinstance(output_files, dict):
+                analysis_pn = output_files.get("pn")
+            if not analysis_pn:
+                analysis_pn = task.pn
+            if analysis_pn and str(task.task_type) == TaskType.PATENT_ANALYSIS.value:
+                self.storage.record_patent_analysis(analysis_pn)
+        except Exception as exc:
+            logger.warning("记录 AI 分析统计失败（{}）：{}", task_id, exc)
+        logger.info("任务已完成：{}", task_id)
+        return True
+
+    @staticmethod
+    def _resolve_terminal_completed_at(task: Optional[Task], now: datetime) -> str:
         """终态时间以首次写入为准，避免重复失败/取消覆盖。"""
-        task = self.storage.get_task(task_id)
         completed_at = getattr(task, "completed_at", None) if task else None
         if not completed_at:
             return now.isoformat()
@@ -150,37 +217,58 @@ class PipelineTaskManager:
 
     def fail_task(self, task_id: str, error_message: str) -> bool:
         now = utc_now()
+        task = self.storage.get_task(task_id)
         success = self.storage.update_task(
             task_id,
             status=TaskStatus.FAILED.value,
             error_message=error_message,
-            completed_at=self._resolve_terminal_completed_at(task_id, now),
+            completed_at=self._resolve_terminal_completed_at(task, now),
             updated_at=now.isoformat(),
         )
         if success:
-            logger.error(f"任务失败：{task_id} - {error_message}")
+            _notify_owner_tasks_changed(getattr(task, "owner_id", None))
+            logger.error("任务失败：{} - {}", task_id, error_message)
         return success
 
     def cancel_task(self, task_id: str, error_message: str = "任务已取消") -> bool:
         now = utc_now()
+        task = self.storage.get_task(task_id)
         success = self.storage.update_task(
             task_id,
             status=TaskStatus.CANCELLED.value,
             error_message=error_message,
-            completed_at=self._resolve_terminal_completed_at(task_id, now),
+            completed_at=self._resolve_terminal_completed_at(task, now),
             updated_at=now.isoformat(),
         )
         if success:
-            logger.info(f"任务已取消：{task_id} - {error_message}")
+            _notify_owner_tasks_changed(getattr(task, "owner_id", None))
+            logger.info("任务已取消：{} - {}", task_id, error_message)
         return success
 
     def get_task(self, task_id: str) -> Optional[Task]:
-        return self.storage.get_task(task_id)
+        return _read_through_live_cache(
+            _live_tasks,
+            id(self.storage),
+            task_id,
+            LIVE_TASK_TTL_SECONDS,
+            LIVE_TASK_MAX_SIZE,
+            self.storage.get_task,
+        )
+
+    def invalidate_task(self, task_id: str) -> None:
+        """供绕过 update_task/delete_task 的写入方主动失效进程内缓存。"""
+        _invalidate_live_snapshot(task_id)
 
     def get_task_snapshot(self, task_id: str) -> Optional[Task]:
-        if hasattr(self.storage, "get_task_snapshot"):
-            return self.storage.get_task_snapshot(task_id)
-        return self.storage.get_task(task_id)
+        loader = self.storage.get_task_snapshot if hasattr(self.storage, "get_task_snapshot") else self.storage.get_task
+        return _read_through_live_cache(
+            _live_snapshots,
+            id(self.storage),
+            task_id,
+            LIVE_SNAPSHOT_TTL_SECONDS,
+            LIVE_SNAPSHOT_MAX_SIZE,
+            loader,
+        )
 
     def list_tasks(
         self,
@@ -189,6 +277,9 @@ class PipelineTaskManager:
         owner_id: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
+        exclude_task_types: Optional[List[str]] = None,
+        snapshot: bool = False,
+        task_type: Optional[str] = None,
     ) -> List[Task]:
         return self.storage.list_tasks(
             status=status,
@@ -196,6 +287,25 @@ class PipelineTaskManager:
             owner_id=owner_id,
             limit=limit,
             offset=offset,
+            exclude_task_types=exclude_task_types,
+            snapshot=snapshot,
+            task_type=task_type,
+        )
+
+    def iter_tasks(
+        self,
+        owner_id: Optional[str] = None,
+        limit: int = 100,
+        exclude_task_types: Optional[List[str]] = None,
+        snapshot: bool = False,
+        task_type: Optional[str] = None,
+    ) -> Iterator[Task]:
+        return self.storage.iter_tasks(
+            owner_id=owner_id,
+            limit=limit,
+            exclude_task_types=exclude_task_types,
+            snapshot=snapshot,
+            task_type=task_type,
         )
 
     def delete_task(self, task_id: str, delete_output: bool = False) -> bool:
@@ -207,13 +317,20 @@ class PipelineTaskManager:
                 try:
                     shutil.rmtree(task.output_dir, ignore_errors=True)
                 except Exception as e:
-                    logger.warning(f"删除输出目录失败：{e}")
+                    logger.warning("删除输出目录失败：{}", e)
 
         success = self.storage.delete_task(task_id)
         if success:
-            logger.info(f"任务已删除：{task_id}")
+            logger.info("任务已删除：{}", task_id)
         return success
 
+    def delete_tasks(self, task_ids: List[str]) -> int:
+        if not task_ids:
+            return 0
+        deleted = self.storage.delete_tasks(task_ids)
+        logger.info("批量删除任务：requested={} deleted={}", len(task_ids), deleted)
+        return deleted
+
 
 class LazyPipelineTaskManager:
     """Delay storage initialization until the manager is actually used."""
@@ -25,6 +25,7 @@ class AiSearchStorage(Protocol):
     def upsert_ai_search_documents(self, records: List[Dict[str, Any]]) -> int: ...
     def list_ai_search_documents(self, task_id: str, plan_version: Any, stages: Optional[List[str]] = None) -> List[Dict[str, Any]]: ...
     def update_ai_search_document(self, task_id: str, plan_version: int, document_id: str, **kwargs: Any) -> bool: ...
+    def update_ai_search_documents(self, task_id: str, plan_version: int, document_ids: List[str], **kwargs: Any) -> int: ...
     def put_ai_search_checkpoint(self, record: Dict[str, Any]) -> bool: ...
     def get_ai_search_checkpoint(self, thread_id: str, checkpoint_ns: str, checkpoint_id: Optional[str] = None) -> Optional[Dict[str, Any]]: ...
     def list_ai_search_checkpoints(self, thread_id: str, checkpoint_ns: Optional[str] = None, checkpoint_id: Optional[str] = None, before_checkpoint_id: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]: ...
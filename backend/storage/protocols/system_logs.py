@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, List, Optional, Protocol, Tuple
 
 
 class SystemLogsStorage(Protocol):
@@ -13,3 +13,4 @@ class SystemLogsStorage(Protocol):
     def cleanup_system_logs_before(self, cutoff_iso: str) -> int: ...
     def list_system_log_payload_paths_for_policy_cleanup(self) -> List[str]: ...
     def cleanup_system_logs_by_policy(self) -> int: ...
+    def purge_system_logs_by_policy(self) -> Tuple[int, List[str]]: ...
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, Iterator, List, Optional, Protocol
 
 from ..models import AccountMonthTarget, Task, TaskStatus
 
@@ -13,14 +13,19 @@ class TaskDomainStorage(Protocol):
     def get_task(self, task_id: str) -> Optional[Task]: ...
     def get_task_snapshot(self, task_id: str) -> Optional[Task]: ...
     def update_task(self, task_id: str, **kwargs: Any) -> bool: ...
+    def complete_task(self, task_id: str, output_files: Optional[Dict[str, Any]] = None) -> Optional[Task]: ...
+    def merge_task_output_files(self, task_id: str, output_files: Dict[str, Any]) -> bool: ...
     def delete_task(self, task_id: str) -> bool: ...
-    def list_tasks(self, status: Optional[TaskStatus] = None, pn: Optional[str] = None, owner_id: Optional[str] = None, limit: int = 100, offset: int = 0, order_by: str = "created_at", order_desc: bool = True) -> List[Task]: ...
+    def delete_tasks(self, task_ids: List[str]) -> int: ...
+    def list_tasks(self, status: Optional[TaskStatus] = None, pn: Optional[str] = None, owner_id: Optional[str] = None, limit: int = 100, offset: int = 0, order_by: str = "created_at", order_desc: bool = True, exclude_task_types: Optional[List[str]] = None, snapshot: bool = False, task_type: Optional[str] = None) -> List[Task]: ...
+    def iter_tasks(self, status: Optional[TaskStatus] = None, pn: Optional[str] = None, owner_id: Optional[str] = None, limit: int = 100, offset: int = 0, order_by: str = "created_at", order_desc: bool = True, exclude_task_types: Optional[List[str]] = None, snapshot: bool = False, task_type: Optional[str] = None) -> Iterator[Task]: ...
     def list_admin_tasks(self, **kwargs: Any) -> Dict[str, Any]: ...
     def summarize_admin_tasks(self) -> Dict[str, Any]: ...
     def get_admin_task_detail(self, task_id: str) -> Optional[Dict[str, Any]]: ...
     def count_tasks(self, status: Optional[TaskStatus] = None, pn: Optional[str] = None, owner_id: Optional[str] = None) -> int: ...
     def count_user_tasks_today(self, owner_id: str, tz_offset_hours: int = 8, task_type: Optional[str] = None, include_deleted: bool = False, statuses: Optional[List[str]] = None) -> int: ...
     def aggregate_user_tasks_today(self, owner_id: str, tz_offset_hours: int = 8, *, include_deleted: bool = False, occupied_statuses: Optional[List[str]] = None) -> Dict[str, Dict[str, int]]: ...
+    def count_tasks_by_status(self) -> Dict[str, Dict[str, int]]: ...
     def get_statistics(self) -> Dict[str, Any]: ...
     def record_patent_analysis(self, pn: Optional[str], sha256: Optional[str] = None) -> bool: ...
     def get_patent_analysis_by_pn(self, pn: Optional[str]) -> Optional[Dict[str, Any]]: ...
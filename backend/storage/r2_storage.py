@@ -7,21 +7,26 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Iterator, Optional
 
 from loguru import logger
 
 try:
     import boto3
+    from boto3.exceptions import S3UploadFailedError
     from botocore.client import Config
     from botocore.exceptions import BotoCoreError, ClientError
 except ImportError:  # pragma: no cover - guarded by runtime env
     boto3 = None
+    S3UploadFailedError = Exception
     Config = None
     BotoCoreError = Exception
     ClientError = Exception
 
 
+R2_STREAM_CHUNK_SIZE = 64 * 1024
+
+
 @dataclass
 class R2Config:
     endpoint_url: str
@@ -109,28 +114,80 @@ class R2Storage:
         date_prefix = datetime.utcnow().strftime("%Y/%m/%d")
         return f"avatar/{date_prefix}/{user_id}-{fname}"
 
-    def get_bytes(self, key: str, *, log_missing: bool = True) -> Optional[bytes]:
+    def _get_object(self, key: str, *, log_missing: bool) -> Optional[Dict[str, Any]]:
+        """读取对象响应；不存在或读取失败时记录日志并返回 None。"""
         if not self.enabled or not self.client:
             return None
         try:
-            response = self.client.get_object(Bucket=self.config.bucket, Key=key)
-            body = response.get("Body")
-            data = body.read() if body else None
-            if data:
-                logger.info(f"[R2] 文件已成功读取，key={key}，大小={len(data)}字节")
-            return data
+            return self.client.get_object(Bucket=self.config.bucket, Key=key)
         except ClientError as exc:
             error_code = (
                 exc.response.get("Error", {}).get("Code", "") if hasattr(exc, "response") else ""
             )
             if str(error_code) in {"NoSuchKey", "404"}:
                 if log_missing:
-                    logger.debug(f"[R2] 文件不存在，key={key}")
+                    logger.debug("[R2] 文件不存在，key={}", key)
                 return None
-            logger.warning(f"[R2] 读取失败，key={key}，错误：{exc}")
+            logger.warning("[R2] 读取失败，key={}，错误：{}", key, exc)
             return None
         except BotoCoreError as exc:
-            logger.warning(f"[R2] 读取失败，key={key}，错误：{exc}")
+            logger.warning("[R2] 读取失败，key={}，错误：{}", key, exc)
+            return None
+
+    def get_bytes(self, key: str, *, log_missing: bool = True) -> Optional[bytes]:
+        response = self._get_object(key, log_missing=log_missing)
+        body = response.get("Body") if response else None
+        if not body:
+            return None
+        try:
+            data = body.read()
+        except (ClientError, BotoCoreError) as exc:
+            logger.warning("[R2] 读取失败，key={}，错误：{}", key, exc)
+            return None
+        if data:
+            logger.info("[R2] 文件已成功读取，key={}，大小={}字节", key, len(data))
+        return data
+
+    def open_stream(self, key: str, *, log_missing: bool = True) -> Optional[Any]:
+        """打开对象的流式 Body，调用方负责迭代与关闭；空对象与 get_bytes 一致视为无内容，返回 None。"""
+        response = self._get_object(key, log_missing=log_missing)
+        body = response.get("Body") if response else None
+        if not body:
+            return None
+        if response.get("ContentLength") == 0:
+            body.close()
+            return None
+        return body
+
+    @staticmethod
+    def iter_stream(body: Any, chunk_size: int = R2_STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        try:
+            for chunk in body.iter_chunks(chunk_size=chunk_size):
+                if chunk:
+                    yield chunk
+        finally:
+            body.close()
+
+    def generate_download_url(
+        self,
+        key: str,
+        *,
+        expires_in: int,
+        content_disposition: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> Optional[str]:
+        """生成 GET 预签名地址（本地签名，无网络请求）；可覆盖响应的 Content-Disposition 与内容类型。"""
+        if not self.enabled or not self.client:
+            return None
+        params = {"Bucket": self.config.bucket, "Key": key}
+        if content_disposition:
+            params["ResponseContentDisposition"] = content_disposition
+        if content_type:
+            params["ResponseContentType"] = content_type
+        try:
+            return self.client.generate_presigned_url("get_object", Params=params, ExpiresIn=int(expires_in))
+        except (ClientError, BotoCoreError) as exc:
+            logger.warning("[R2] 生成预签名地址失败，key={}，错误：{}", key, exc)
             return None
 
     def key_exists(self, key: str) -> bool:
@@ -145,10 +202,10 @@ class R2Storage:
             )
             if str(error_code) in {"404", "NoSuchKey", "NotFound"}:
                 return False
-            logger.warning(f"[R2] key_exists 失败，key={key}，错误：{exc}")
+            logger.warning("[R2] key_exists 失败，key={}，错误：{}", key, exc)
             return False
         except BotoCoreError as exc:
-            logger.warning(f"[R2] key_exists 失败，key={key}，错误：{exc}")
+            logger.warning("[R2] key_exists 失败，key={}，错误：{}", key, exc)
             return False
 
     def list_keys(self, prefix: str, max_keys: int = 1000) -> list[str]:
@@ -176,7 +233,7 @@ class R2Storage:
                 if not continuation_token:
                     break
         except (ClientError, BotoCoreError) as exc:
-            logger.warning(f"[R2] list_keys 失败，prefix={prefix}，错误：{exc}")
+            logger.warning("[R2] list_keys 失败，prefix={}，错误：{}", prefix, exc)
             return keys
         return keys
 
@@ -189,10 +246,10 @@ class R2Storage:
                 CopySource={"Bucket": self.config.bucket, "Key": source_key},
                 Key=target_key,
             )
-            logger.info(f"[R2] 文件已复制，source={source_key} target={target_key}")
+            logger.info("[R2] 文件已复制，source={} target={}", source_key, target_key)
             return True
         except (ClientError, BotoCoreError) as exc:
-            logger.warning(f"[R2] 复制失败，source={source_key} target={target_key}，错误：{exc}")
+            logger.warning("[R2] 复制失败，source={} target={}，错误：{}", source_key, target_key, exc)
             return False
 
     def put_bytes(self, key: str, content: bytes, content_type: str = "application/octet-stream") -> bool:
@@ -205,10 +262,28 @@ class R2Storage:
                 Body=content,
                 ContentType=content_type,
             )
-            logger.info(f"[R2] 文件已成功存储，key={key}")
+            logger.info("[R2] 文件已成功存储，key={}", key)
             return True
         except (ClientError, BotoCoreError) as exc:
-            logger.warning(f"[R2] 写入失败，key={key}，错误：{exc}")
+            logger.warning("[R2] 写入失败，key={}，错误：{}", key, exc)
+            return False
+
+    def put_file(self, key: str, file_path: str, content_type: str = "application/octet-stream") -> bool:
+        """直接从本地文件分块上传，避免整文件读入内存。"""
+        if not self.enabled or not self.client:
+            return False
+        try:
+            self.client.upload_file(
+                str(file_path),
+                self.config.bucket,
+                key,
+                ExtraArgs={"ContentType": content_type},
+            )
+            logger.info("[R2] 文件已成功存储，key={}", key)
+            return True
+        except (ClientError, BotoCoreError, S3UploadFailedError, OSError) as exc:
+            # upload_file 经 S3Transfer 上传，服务端错误会被包装成 S3UploadFailedError
+            logger.warning("[R2] 写入失败，key={}，错误：{}", key, exc)
             return False
 
     def delete_key(self, key: str) -> bool:
@@ -216,8 +291,8 @@ class R2Storage:
             return False
         try:
             self.client.delete_object(Bucket=self.config.bucket, Key=key)
-            logger.info(f"[R2] 文件已删除，key={key}")
+            logger.info("[R2] 文件已删除，key={}", key)
             return True
         except (ClientError, BotoCoreError) as exc:
-            logger.warning(f"[R2] 删除失败，key={key}，错误：{exc}")
+            logger.warning("[R2] 删除失败，key={}，错误：{}", key, exc)
             return False
@@ -2,14 +2,113 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from backend.time_utils import utc_now_z
 
 from .base import AiSearchRunLookupMixin
 
 
+_DOCUMENT_ROW_PLACEHOLDERS = "(" + ", ".join(["?"] * 43) + ")"
+
+_DOCUMENT_UPSERT_SQL = """
+    INSERT INTO ai_search_documents (
+        run_id, document_id, task_id, plan_version, source_type, external_id, canonical_id, pn, doi, url, title, abstract,
+        venue, language, publication_date, application_date, primary_ipc, document_type, claim_ids_json, evidence_locations_json,
+        evidence_summary, report_row_order, ipc_cpc_json, source_batches_json, source_lanes_json, source_sub_plans_json,
+        source_steps_json, stage, score, agent_reason, key_passages_json, user_pinned, user_removed, coarse_status, coarse_reason,
+        coarse_screened_at, close_read_status, close_read_reason, close_read_at, detail_fingerprint, detail_source, created_at, updated_at
+    ) VALUES {values}
+    ON CONFLICT(run_id, document_id) DO UPDATE SET
+        source_type = excluded.source_type,
+        external_id = excluded.external_id,
+        canonical_id = excluded.canonical_id,
+        pn = excluded.pn,
+        doi = excluded.doi,
+        url = excluded.url,
+        title = excluded.title,
+        abstract = excluded.abstract,
+        venue = excluded.venue,
+        language = excluded.language,
+        publication_date = excluded.publication_date,
+        application_date = excluded.application_date,
+        primary_ipc = excluded.primary_ipc,
+        document_type = excluded.document_type,
+        claim_ids_json = excluded.claim_ids_json,
+        evidence_locations_json = excluded.evidence_locations_json,
+        evidence_summary = excluded.evidence_summary,
+        report_row_order = excluded.report_row_order,
+        ipc_cpc_json = excluded.ipc_cpc_json,
+        source_batches_json = excluded.source_batches_json,
+        source_lanes_json = excluded.source_lanes_json,
+        source_sub_plans_json = excluded.source_sub_plans_json,
+        source_steps_json = excluded.source_steps_json,
+        stage = excluded.stage,
+        score = excluded.score,
+        agent_reason = excluded.agent_reason,
+        key_passages_json = excluded.key_passages_json,
+        user_pinned = excluded.user_pinned,
+        user_removed = excluded.user_removed,
+        coarse_status = excluded.coarse_status,
+        coarse_reason = excluded.coarse_reason,
+        coarse_screened_at = excluded.coarse_screened_at,
+        close_read_status = excluded.close_read_status,
+        close_read_reason = excluded.close_read_reason,
+        close_read_at = excluded.close_read_at,
+        detail_fingerprint = excluded.detail_fingerprint,
+        detail_source = excluded.detail_source,
+        created_at = COALESCE(ai_search_documents.created_at, excluded.created_at),
+        updated_at = excluded.updated_at
+"""
+
+_DOCUMENT_UPDATE_FIELDS = frozenset(
+    {
+        "stage",
+        "score",
+        "agent_reason",
+        "source_type",
+        "external_id",
+        "canonical_id",
+        "doi",
+        "url",
+        "key_passages_json",
+        "venue",
+        "language",
+        "publication_date",
+        "application_date",
+        "primary_ipc",
+        "document_type",
+        "claim_ids_json",
+        "evidence_locations_json",
+        "evidence_summary",
+        "report_row_order",
+        "user_pinned",
+        "user_removed",
+        "title",
+        "abstract",
+        "source_batches_json",
+        "source_lanes_json",
+        "source_sub_plans_json",
+        "source_steps_json",
+        "ipc_cpc_json",
+        "coarse_status",
+        "coarse_reason",
+        "coarse_screened_at",
+        "close_read_status",
+        "close_read_reason",
+        "close_read_at",
+        "detail_fingerprint",
+        "detail_source",
+        "updated_at",
+    }
+)
+
+
 class AiSearchDocumentsRepositoryMixin(AiSearchRunLookupMixin):
+    AI_SEARCH_DOCUMENT_UPSERT_BATCH_ROWS = 2
+    # 每块 ID 数 + SET 列数不超过 D1 单条语句 100 个绑定参数
+    AI_SEARCH_DOCUMENT_UPDATE_BATCH_SIZE = 50
+
     def _row_to_ai_search_document(self, row: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "run_id": row.get("run_id"),
@@ -60,8 +159,9 @@ class AiSearchDocumentsRepositoryMixin(AiSearchRunLookupMixin):
     def upsert_ai_search_documents(self, records: List[Dict[str, Any]]) -> int:
         if not records:
             return 0
-        changed = 0
         now = utc_now_z()
+        resolved_run_ids: Dict[Tuple[str, int], str] = {}
+        rows: List[List[Any]] = []
         for record in records:
             document_id = str(record.get("document_id") or "").strip()
             run_id = str(record.get("run_id") or "").strip()
@@ -69,106 +169,75 @@ class AiSearchDocumentsRepositoryMixin(AiSearchRunLookupMixin):
             plan_version = int(record.get("plan_version") or 0)
             stage = str(record.get("stage") or "").strip()
             if not run_id and task_id and plan_version > 0:
-                run_id = str(self._resolve_ai_search_run_id(task_id, plan_version) or "").strip()
+                # 同批文档通常属于同一轮检索，run_id 只查一次
+                run_key = (task_id, plan_version)
+                if run_key not in resolved_run_ids:
+                    resolved_run_ids[run_key] = str(self._resolve_ai_search_run_id(task_id, plan_version) or "").strip()
+                run_id = resolved_run_ids[run_key]
             if not document_id or not run_id or not task_id or plan_version <= 0 or not stage:
                 continue
+            rows.append(
+                [
+                    run_id,
+                    document_id,
+                    task_id,
+                    plan_version,
+                    record.get("source_type"),
+                    record.get("external_id"),
+                    record.get("canonical_id"),
+                    record.get("pn"),
+                    record.get("doi"),
+                    record.get("url"),
+                    record.get("title"),
+                    record.get("abstract"),
+                    record.get("venue"),
+                    record.get("language"),
+                    record.get("publication_date"),
+                    record.get("application_date"),
+                    record.get("primary_ipc"),
+                    record.get("document_type"),
+                    self._encode_json_value(record.get("claim_ids_json") or []),
+                    self._encode_json_value(record.get("evidence_locations_json") or []),
+                    record.get("evidence_summary"),
+                    record.get("report_row_order"),
+                    self._encode_json_value(record.get("ipc_cpc_json") or []),
+                    self._encode_json_value(record.get("source_batches_json") or []),
+                    self._encode_json_value(record.get("source_lanes_json") or []),
+                    self._encode_json_value(record.get("source_sub_plans_json") or []),
+                    self._encode_json_value(record.get("source_steps_json") or []),
+                    stage,
+                    record.get("score"),
+                    record.get("agent_reason"),
+                    self._encode_json_value(record.get("key_passages_json") or []),
+                    1 if record.get("user_pinned") else 0,
+                    1 if record.get("user_removed") else 0,
+                    str(record.get("coarse_status") or "pending"),
+                    record.get("coarse_reason"),
+                    record.get("coarse_screened_at"),
+                    str(record.get("close_read_status") or "pending"),
+                    record.get("close_read_reason"),
+                    record.get("close_read_at"),
+                    record.get("detail_fingerprint"),
+                    record.get("detail_source"),
+                    str(record.get("created_at") or now),
+                    str(record.get("updated_at") or now),
+                ]
+            )
+
+        if not rows:
+            return 0
+        request_many = getattr(self, "_request_many", None)
+        if request_many is not None:
+            # SQLite：单行语句 executemany，整批在一个事务内提交
+            return request_many(_DOCUMENT_UPSERT_SQL.format(values=_DOCUMENT_ROW_PLACEHOLDERS), rows)
+
+        # D1：多行 VALUES 批量 upsert；每行 43 个参数，每批行数受单条语句 100 个绑定参数的限制
+        changed = 0
+        for offset in range(0, len(rows), self.AI_SEARCH_DOCUMENT_UPSERT_BATCH_ROWS):
+            batch = rows[offset:offset + self.AI_SEARCH_DOCUMENT_UPSERT_BATCH_ROWS]
+            values = ", ".join([_DOCUMENT_ROW_PLACEHOLDERS] * len(batch))
             changed += self._changed_rows(
-                self._request(
-                    """
-                INSERT INTO ai_search_documents (
-                    run_id, document_id, task_id, plan_version, source_type, external_id, canonical_id, pn, doi, url, title, abstract,
-                    venue, language, publication_date, application_date, primary_ipc, document_type, claim_ids_json, evidence_locations_json,
-                    evidence_summary, report_row_order, ipc_cpc_json, source_batches_json, source_lanes_json, source_sub_plans_json,
-                    source_steps_json, stage, score, agent_reason, key_passages_json, user_pinned, user_removed, coarse_status, coarse_reason,
-                    coarse_screened_at, close_read_status, close_read_reason, close_read_at, detail_fingerprint, detail_source, created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(run_id, document_id) DO UPDATE SET
-                    source_type = excluded.source_type,
-                    external_id = excluded.external_id,
-                    canonical_id = excluded.canonical_id,
-                    pn = excluded.pn,
-                    doi = excluded.doi,
-                    url = excluded.url,
-                    title = excluded.title,
-                    abstract = excluded.abstract,
-                    venue = excluded.venue,
-                    language = excluded.language,
-                    publication_date = excluded.publication_date,
-                    application_date = excluded.application_date,
-                    primary_ipc = excluded.primary_ipc,
-                    document_type = excluded.document_type,
-                    claim_ids_json = excluded.claim_ids_json,
-                    evidence_locations_json = excluded.evidence_locations_json,
-                    evidence_summary = excluded.evidence_summary,
-                    report_row_order = excluded.report_row_order,
-                    ipc_cpc_json = excluded.ipc_cpc_json,
-                    source_batches_json = excluded.source_batches_json,
-                    source_lanes_json = excluded.source_lanes_json,
-                    source_sub_plans_json = excluded.source_sub_plans_json,
-                    source_steps_json = excluded.source_steps_json,
-                    stage = excluded.stage,
-                    score = excluded.score,
-                    agent_reason = excluded.agent_reason,
-                    key_passages_json = excluded.key_passages_json,
-                    user_pinned = excluded.user_pinned,
-                    user_removed = excluded.user_removed,
-                    coarse_status = excluded.coarse_status,
-                    coarse_reason = excluded.coarse_reason,
-                    coarse_screened_at = excluded.coarse_screened_at,
-                    close_read_status = excluded.close_read_status,
-                    close_read_reason = excluded.close_read_reason,
-                    close_read_at = excluded.close_read_at,
-                    detail_fingerprint = excluded.detail_fingerprint,
-                    detail_source = excluded.detail_source,
-                    created_at = COALESCE(ai_search_documents.created_at, excluded.created_at),
-                    updated_at = excluded.updated_at
-                """,
-                    [
-                        run_id,
-                        document_id,
-                        task_id,
-                        plan_version,
-                        record.get("source_type"),
-                        record.get("external_id"),
-                        record.get("canonical_id"),
-                        record.get("pn"),
-                        record.get("doi"),
-                        record.get("url"),
-                        record.get("title"),
-                        record.get("abstract"),
-                        record.get("venue"),
-                        record.get("language"),
-                        record.get("publication_date"),
-                        record.get("application_date"),
-                        record.get("primary_ipc"),
-                        record.get("document_type"),
-                        self._encode_json_value(record.get("claim_ids_json") or []),
-                        self._encode_json_value(record.get("evidence_locations_json") or []),
-                        record.get("evidence_summary"),
-                        record.get("report_row_order"),
-                        self._encode_json_value(record.get("ipc_cpc_json") or []),
-                        self._encode_json_value(record.get("source_batches_json") or []),
-                        self._encode_json_value(record.get("source_lanes_json") or []),
-                        self._encode_json_value(record.get("source_sub_plans_json") or []),
-                        self._encode_json_value(record.get("source_steps_json") or []),
-                        stage,
-                        record.get("score"),
-                        record.get("agent_reason"),
-                        self._encode_json_value(record.get("key_passages_json") or []),
-                        1 if record.get("user_pinned") else 0,
-                        1 if record.get("user_removed") else 0,
-                        str(record.get("coarse_status") or "pending"),
-                        record.get("coarse_reason"),
-                        record.get("coarse_screened_at"),
-                        str(record.get("close_read_status") or "pending"),
-                        record.get("close_read_reason"),
-                        record.get("close_read_at"),
-                        record.get("detail_fingerprint"),
-                        record.get("detail_source"),
-                        str(record.get("created_at") or now),
-                        str(record.get("updated_at") or now),
-                    ],
-                )
+                self._request(_DOCUMENT_UPSERT_SQL.format(values=values), [value for row in batch for value in row])
             )
         return changed
 
@@ -204,60 +273,27 @@ class AiSearchDocumentsRepositoryMixin(AiSearchRunLookupMixin):
         )
         return [self._row_to_ai_search_document(row) for row in rows]
 
+    def _ai_search_document_updates(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        updates = {key: kwargs[key] for key in kwargs if key in _DOCUMENT_UPDATE_FIELDS}
+        if not updates:
+            return updates
+        updates.setdefault("updated_at", utc_now_z())
+        for key in list(updates.keys()):
+            if key.endswith("_json"):
+                updates[key] = self._encode_json_value(updates[key])
+            elif key in {"user_pinned", "user_removed"}:
+                updates[key] = 1 if updates[key] else 0
+        return updates
+
     def update_ai_search_document(
         self, task_id: str, plan_version: int, document_id: str, **kwargs
     ) -> bool:
         run_id = self._resolve_ai_search_run_id(task_id, plan_version)
         if not run_id:
             return False
-        allowed_fields = {
-            "stage",
-            "score",
-            "agent_reason",
-            "source_type",
-            "external_id",
-            "canonical_id",
-            "doi",
-            "url",
-            "key_passages_json",
-            "venue",
-            "language",
-            "publication_date",
-            "application_date",
-            "primary_ipc",
-            "document_type",
-            "claim_ids_json",
-            "evidence_locations_json",
-            "evidence_summary",
-            "report_row_order",
-            "user_pinned",
-            "user_removed",
-            "title",
-            "abstract",
-            "source_batches_json",
-            "source_lanes_json",
-            "source_sub_plans_json",
-            "source_steps_json",
-            "ipc_cpc_json",
-            "coarse_status",
-            "coarse_reason",
-            "coarse_screened_at",
-            "close_read_status",
-            "close_read_reason",
-            "close_read_at",
-            "detail_fingerprint",
-            "detail_source",
-            "updated_at",
-        }
-        updates = {key: kwargs[key] for key in kwargs if key in allowed_fields}
+        updates = self._ai_search_document_updates(kwargs)
         if not updates:
             return False
-        updates.setdefault("updated_at", utc_now_z())
-        for key in list(updates.keys()):
-            if key.endswith("_json"):
-                updates[key] = self._encode_json_value(updates[key])
-            elif key in {"user_pinned", "user_removed"}:
-                updates[key] = 1 if updates[key] else 0
         set_clause = ", ".join(f"{key} = ?" for key in updates.keys())
         return self._changed_rows(
             self._request(
@@ -265,3 +301,29 @@ class AiSearchDocumentsRepositoryMixin(AiSearchRunLookupMixin):
                 [*updates.values(), task_id, run_id, document_id],
             )
         ) > 0
+
+    def update_ai_search_documents(
+        self, task_id: str, plan_version: int, document_ids: List[str], **kwargs
+    ) -> int:
+        """同一组字段批量更新多篇文献：run_id 只解析一次，按块合并为 IN 列表 UPDATE。"""
+        normalized_ids = list(dict.fromkeys(str(document_id) for document_id in document_ids if document_id))
+        if not normalized_ids:
+            return 0
+        run_id = self._resolve_ai_search_run_id(task_id, plan_version)
+        if not run_id:
+            return 0
+        updates = self._ai_search_document_updates(kwargs)
+        if not updates:
+            return 0
+        set_clause = ", ".join(f"{key} = ?" for key in updates.keys())
+        changed = 0
+        for offset in range(0, len(normalized_ids), self.AI_SEARCH_DOCUMENT_UPDATE_BATCH_SIZE):
+            batch = normalized_ids[offset:offset + self.AI_SEARCH_DOCUMENT_UPDATE_BATCH_SIZE]
+            placeholders = ", ".join(["?"] * len(batch))
+            changed += self._changed_rows(
+                self._request(
+                    f"UPDATE ai_search_documents SET {set_clause} WHERE task_id = ? AND run_id = ? AND document_id IN ({placeholders})",
+                    [*updates.values(), task_id, run_id, *batch],
+                )
+            )
+        return changed
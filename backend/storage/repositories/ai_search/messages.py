@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+from backend.stream_notifier import task_stream_notifier
 from backend.time_utils import utc_now_z
 
 
@@ -135,6 +136,7 @@ class AiSearchMessagesPlansRepositoryMixin:
                 payload["created_at"],
             ],
         )
+        task_stream_notifier.notify(payload["session_id"])
         row = self._fetchone("SELECT * FROM ai_search_stream_events WHERE event_id = ? LIMIT 1", [payload["event_id"]])
         return self._row_to_ai_search_stream_event(row) if row else None
 
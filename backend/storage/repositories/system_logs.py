@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from backend.time_utils import utc_now_z
 
@@ -223,3 +223,10 @@ class SystemLogsRepositoryMixin:
 
     def cleanup_system_logs_by_policy(self) -> int:
         return self._changed_rows(self._request(f"DELETE FROM system_logs WHERE {self.POLICY_CLEANUP_WHERE}"))
+
+    def purge_system_logs_by_policy(self) -> Tuple[int, List[str]]:
+        """按策略删除并通过 RETURNING 取回被删行的 payload 路径：单次往返，且删除集与路径集一致。"""
+        result = self._request(f"DELETE FROM system_logs WHERE {self.POLICY_CLEANUP_WHERE} RETURNING payload_file_path")
+        rows = result.get("results") or []
+        paths = [str(row.get("payload_file_path") or "").strip() for row in rows]
+        return len(rows), [path for path in paths if path]
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-import json
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from loguru import logger
 
+from backend.stream_notifier import task_stream_notifier
 from backend.time_utils import (
     local_day_start_end_to_utc,
     local_recent_day_window_to_utc,
@@ -19,19 +20,59 @@ from backend.time_utils import (
 from ..models import AccountMonthTarget, Task, TaskStatus
 
 
+_TASK_UPDATE_FIELDS = frozenset(
+    {"owner_id", "task_type", "pn", "title", "status", "progress", "current_step", "output_dir", "error_message", "completed_at", "deleted_at", "metadata", "updated_at"}
+)
+
+# 可能传入 TaskStatus/datetime 的列
+_TASK_UPDATE_NORMALIZED_FIELDS = frozenset({"status", "completed_at", "deleted_at"})
+
+_TASK_ORDER_COLUMNS = frozenset({"created_at", "updated_at", "progress", "status", "pn"})
+
+_ADMIN_TASK_SORT_COLUMNS = {
+    "task_id": "t.id",
+    "title": "COALESCE(t.title, '')",
+    "user_name": "COALESCE(u.name, '')",
+    "task_type": "COALESCE(t.task_type, '')",
+    "status": "COALESCE(t.status, '')",
+    "created_at": "COALESCE(t.created_at, '')",
+    "updated_at": "COALESCE(t.updated_at, '')",
+    "completed_at": "COALESCE(t.completed_at, '')",
+}
+
+
+@lru_cache(maxsize=256)
+def _update_task_sql(fields: Tuple[str, ...]) -> str:
+    # 字段均来自白名单，组合数有限：按字段序列缓存 SQL 文本
+    set_clause = ", ".join(f"{field} = ?" for field in fields)
+    return f"UPDATE tasks SET {set_clause} WHERE id = ?"
+
+
 class TaskRepositoryMixin:
     TASK_SNAPSHOT_COLUMNS = (
         "id, owner_id, task_type, pn, title, status, progress, current_step, "
         "error_message, created_at, updated_at, completed_at, metadata"
     )
+    TASK_BULK_DELETE_BATCH_SIZE = 90
+    TASK_STATUS_COUNTS_SQL = """
+        SELECT
+            status,
+            COUNT(*) AS total_count,
+            SUM(CASE WHEN created_at >= ? AND created_at < ? THEN 1 ELSE 0 END) AS today_count
+        FROM tasks
+        WHERE deleted_at IS NULL
+        GROUP BY status
+    """
 
     def create_task(self, task: Task) -> Task:
-        self._request(
+        # RETURNING 在同一次往返内取回落库后的行，返回值以数据库为准
+        result = self._request(
             """
             INSERT INTO tasks (
                 id, owner_id, task_type, pn, title, status, progress, current_step,
                 output_dir, error_message, created_at, updated_at, completed_at, metadata
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            RETURNING *
             """,
             [
                 task.id,
@@ -47,10 +88,11 @@ class TaskRepositoryMixin:
                 to_utc_z(task.created_at, naive_strategy="utc"),
                 to_utc_z(task.updated_at, naive_strategy="utc"),
                 to_utc_z(task.completed_at, naive_strategy="utc") if task.completed_at else None,
-                json.dumps(task.metadata, ensure_ascii=False) if task.metadata else None,
+                self._encode_metadata(task.metadata) if task.metadata else None,
             ],
         )
-        return task
+        rows = result.get("results") or []
+        return self._row_to_task(rows[0]) if rows else task
 
     def get_task(self, task_id: str) -> Optional[Task]:
         row = self._fetchone("SELECT * FROM tasks WHERE id = ?", [task_id])
@@ -61,25 +103,100 @@ class TaskRepositoryMixin:
         return self._row_to_task(row) if row else None
 
     def update_task(self, task_id: str, **kwargs) -> bool:
-        allowed_fields = {"owner_id", "task_type", "pn", "title", "status", "progress", "current_step", "output_dir", "error_message", "completed_at", "deleted_at", "metadata", "updated_at"}
-        updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
+        # 只对需要转换的列做编码/归一化，其余值原样绑定
+        updates: Dict[str, Any] = {}
+        for key, value in kwargs.items():
+            if key == "metadata":
+                value = self._encode_metadata(value)
+            elif key in _TASK_UPDATE_NORMALIZED_FIELDS:
+                value = self._normalize_update_value(value)
+            elif key not in _TASK_UPDATE_FIELDS:
+                continue
+            updates[key] = value
         if not updates:
             return False
+        # 已是存储格式的字符串，直接绑定，无需再走归一化
         updates["updated_at"] = utc_now_z()
-        for key in list(updates.keys()):
-            updates[key] = self._normalize_update_value(self._encode_metadata(updates[key]))
-        set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
         values = list(updates.values()) + [task_id]
-        return self._changed_rows(self._request(f"UPDATE tasks SET {set_clause} WHERE id = ?", values)) > 0
+        changed = self._changed_rows(self._request(_update_task_sql(tuple(updates)), values)) > 0
+        if changed:
+            task_stream_notifier.notify(task_id)
+        return changed
+
+    def complete_task(self, task_id: str, output_files: Optional[Dict[str, Any]] = None) -> Optional[Task]:
+        """标记完成并返回落库后的任务；output_files 在库内合并进 metadata，无需先读后写。"""
+        now = utc_now_z()
+        assignments = ["status = ?", "progress = 100", "completed_at = ?", "updated_at = ?"]
+        params: List[Any] = [TaskStatus.COMPLETED.value, now, now]
+        if output_files:
+            assignments.append(
+                "metadata = json_set("
+                "CASE WHEN json_valid(metadata) THEN CASE json_type(metadata) WHEN 'object' THEN metadata ELSE '{}' END ELSE '{}' END, "
+                "'$.output_files', json(?))"
+            )
+            params.append(self._encode_json_value(output_files))
+        result = self._request(
+            f"UPDATE tasks SET {', '.join(assignments)} WHERE id = ? RETURNING *",
+            params + [task_id],
+        )
+        rows = result.get("results") or []
+        if not rows:
+            return None
+        task_stream_notifier.notify(task_id)
+        return self._row_to_task(rows[0])
+
+    def merge_task_output_files(self, task_id: str, output_files: Dict[str, Any]) -> bool:
+        """在库内把键写入 metadata.output_files，不覆盖其余 metadata，避免与其他读改写并发丢更新。"""
+        entries = [(str(key), value) for key, value in (output_files or {}).items() if key]
+        if not entries:
+            return False
+        path_args: List[Any] = []
+        for key, value in entries:
+            path_args.extend([f'$.output_files."{key}"', value])
+        result = self._request(
+            "UPDATE tasks SET metadata = json_set("
+            "CASE WHEN json_valid(metadata) THEN CASE json_type(metadata) WHEN 'object' THEN metadata ELSE '{}' END ELSE '{}' END, "
+            f"{', '.join(['?, ?'] * len(entries))}), updated_at = ? WHERE id = ?",
+            path_args + [utc_now_z(), task_id],
+        )
+        changed = self._changed_rows(result) > 0
+        if changed:
+            task_stream_notifier.notify(task_id)
+        return changed
 
     def delete_task(self, task_id: str) -> bool:
+        now = utc_now_z()
         result = self._request(
             "UPDATE tasks SET deleted_at = ?, updated_at = ? WHERE id = ? AND deleted_at IS NULL",
-            [utc_now_z(), utc_now_z(), task_id],
+            [now, now, task_id],
         )
-        return self._changed_rows(result) > 0
+        changed = self._changed_rows(result) > 0
+        if changed:
+            task_stream_notifier.notify(task_id)
+        return changed
+
+    def delete_tasks(self, task_ids: List[str]) -> int:
+        """批量软删除，按块合并为少量 UPDATE；每块参数数受 D1 单条语句 100 个绑定参数限制。"""
+        normalized_ids = list(dict.fromkeys(str(task_id) for task_id in task_ids if task_id))
+        now = utc_now_z()
+        deleted = 0
+        for offset in range(0, len(normalized_ids), self.TASK_BULK_DELETE_BATCH_SIZE):
+            batch = normalized_ids[offset:offset + self.TASK_BULK_DELETE_BATCH_SIZE]
+            placeholders = ", ".join(["?"] * len(batch))
+            result = self._request(
+                f"UPDATE tasks SET deleted_at = ?, updated_at = ? WHERE id IN ({placeholders}) AND deleted_at IS NULL",
+                [now, now, *batch],
+            )
+            deleted += self._changed_rows(result)
+        for task_id in normalized_ids:
+            task_stream_notifier.notify(task_id)
+        return deleted
+
+    def list_tasks(self, status: Optional[TaskStatus] = None, pn: Optional[str] = None, owner_id: Optional[str] = None, limit: int = 100, offset: int = 0, order_by: str = "created_at", order_desc: bool = True, exclude_task_types: Optional[List[str]] = None, snapshot: bool = False, task_type: Optional[str] = None) -> List[Task]:
+        return list(self.iter_tasks(status=status, pn=pn, owner_id=owner_id, limit=limit, offset=offset, order_by=order_by, order_desc=order_desc, exclude_task_types=exclude_task_types, snapshot=snapshot, task_type=task_type))
 
-    def list_tasks(self, status: Optional[TaskStatus] = None, pn: Optional[str] = None, owner_id: Optional[str] = None, limit: int = 100, offset: int = 0, order_by: str = "created_at", order_desc: bool = True) -> List[Task]:
+    def iter_tasks(self, status: Optional[TaskStatus] = None, pn: Optional[str] = None, owner_id: Optional[str] = None, limit: int = 100, offset: int = 0, order_by: str = "created_at", order_desc: bool = True, exclude_task_types: Optional[List[str]] = None, snapshot: bool = False, task_type: Optional[str] = None) -> Iterator[Task]:
+        """逐行解码为 Task，供只需遍历的调用方边解码边消费，不再整页持有 Task 列表。"""
         where = ["deleted_at IS NULL"]
         params: List[Any] = []
         if status:
@@ -91,13 +208,21 @@ class TaskRepositoryMixin:
         if owner_id:
             where.append("owner_id = ?")
             params.append(owner_id)
-        allowed_order_columns = {"created_at", "updated_at", "progress", "status", "pn"}
-        safe_order_by = order_by if order_by in allowed_order_columns else "created_at"
+        if task_type:
+            where.append("task_type = ?")
+            params.append(task_type)
+        if exclude_task_types:
+            placeholders = ", ".join(["?"] * len(exclude_task_types))
+            where.append(f"task_type NOT IN ({placeholders})")
+            params.extend(exclude_task_types)
+        safe_order_by = order_by if order_by in _TASK_ORDER_COLUMNS else "created_at"
         direction = "DESC" if order_desc else "ASC"
-        sql = f"SELECT * FROM tasks WHERE {' AND '.join(where)} ORDER BY {safe_order_by} {direction} LIMIT ? OFFSET ?"
+        columns = self.TASK_SNAPSHOT_COLUMNS if snapshot else "*"
+        sql = f"SELECT {columns} FROM tasks WHERE {' AND '.join(where)} ORDER BY {safe_order_by} {direction} LIMIT ? OFFSET ?"
         params.extend([limit, offset])
         rows = self._fetchall(sql, params)
-        return [self._row_to_task(row) for row in rows]
+        for row in rows:
+            yield self._row_to_task(row)
 
     def list_admin_tasks(self, *, q: Optional[str] = None, user_name: Optional[str] = None, task_type: Optional[str] = None, status: Optional[str] = None, date_from: Optional[str] = None, date_to: Optional[str] = None, page: int = 1, page_size: int = 10, sort_by: str = "created_at", sort_order: str = "desc") -> Dict[str, Any]:
         where = ["t.deleted_at IS NULL"]
@@ -122,24 +247,15 @@ class TaskRepositoryMixin:
             where.append("(t.id LIKE ? OR COALESCE(t.title, '') LIKE ? OR COALESCE(t.pn, '') LIKE ? OR COALESCE(t.owner_id, '') LIKE ? OR COALESCE(u.name, '') LIKE ?)")
             params.extend([wildcard, wildcard, wildcard, wildcard, wildcard])
         where_clause = " AND ".join(where)
-        safe_sort_map = {
-            "task_id": "t.id",
-            "title": "COALESCE(t.title, '')",
-            "user_name": "COALESCE(u.name, '')",
-            "task_type": "COALESCE(t.task_type, '')",
-            "status": "COALESCE(t.status, '')",
-            "created_at": "COALESCE(t.created_at, '')",
-            "updated_at": "COALESCE(t.updated_at, '')",
-            "completed_at": "COALESCE(t.completed_at, '')",
-        }
-        safe_sort = safe_sort_map.get(sort_by, "COALESCE(t.created_at, '')")
+        safe_sort = _ADMIN_TASK_SORT_COLUMNS.get(sort_by, "COALESCE(t.created_at, '')")
         direction = "ASC" if str(sort_order or "").strip().lower() == "asc" else "DESC"
         offset = max(0, (page - 1) * page_size)
-        total_row = self._fetchone(f"SELECT COUNT(*) AS c FROM tasks t LEFT JOIN users u ON t.owner_id = u.owner_id WHERE {where_clause}", params)
+        # 总数随分页结果一起返回（窗口函数），非空页只需一次往返
         rows = self._fetchall(
             f"""
             SELECT t.id AS task_id, t.title AS title, t.owner_id AS owner_id, u.name AS user_name, t.task_type AS task_type,
-                   t.status AS status, t.created_at AS created_at, t.updated_at AS updated_at, t.completed_at AS completed_at
+                   t.status AS status, t.created_at AS created_at, t.updated_at AS updated_at, t.completed_at AS completed_at,
+                   COUNT(*) OVER () AS total_count
             FROM tasks t
             LEFT JOIN users u ON t.owner_id = u.owner_id
             WHERE {where_clause}
@@ -148,6 +264,13 @@ class TaskRepositoryMixin:
             """,
             params + [page_size, offset],
         )
+        if rows:
+            total = int(rows[0].get("total_count") or 0)
+        elif offset > 0:
+            total_row = self._fetchone(f"SELECT COUNT(*) AS c FROM tasks t LEFT JOIN users u ON t.owner_id = u.owner_id WHERE {where_clause}", params)
+            total = int((total_row or {}).get("c") or 0)
+        else:
+            total = 0
 
         def _parse_iso(value: Any) -> Optional[datetime]:
             return parse_storage_ts(value, naive_strategy="utc")
@@ -163,7 +286,7 @@ class TaskRepositoryMixin:
                 return None
             return max(0, seconds)
 
-        return {"total": int((total_row or {}).get("c") or 0), "items": [{
+        return {"total": total, "items": [{
             "task_id": row.get("task_id"),
             "title": row.get("title"),
             "owner_id": row.get("owner_id"),
@@ -299,25 +422,51 @@ class TaskRepositoryMixin:
             }
         return aggregated
 
+    def count_tasks_by_status(self) -> Dict[str, Dict[str, int]]:
+        """单次聚合返回各状态的任务总数与今日新建数。"""
+        today_start_iso, today_end_iso = local_recent_day_window_to_utc(1)
+        rows = self._fetchall(self.TASK_STATUS_COUNTS_SQL, [today_start_iso, today_end_iso])
+        return {
+            str(row["status"]): {
+                "total": int(row.get("total_count") or 0),
+                "today": int(row.get("today_count") or 0),
+            }
+            for row in rows
+        }
+
     def get_statistics(self) -> Dict[str, Any]:
-        rows = self._fetchall("SELECT status, COUNT(*) AS count FROM tasks WHERE deleted_at IS NULL GROUP BY status")
-        status_counts = {row["status"]: int(row["count"]) for row in rows}
+        # 状态分组与标量统计合并为一条查询，D1 下只需一次往返；无任务时 LEFT JOIN 仍保留标量行
         today_start_iso, today_end_iso = local_recent_day_window_to_utc(1)
-        today_count_row = self._fetchone("SELECT COUNT(*) AS c FROM tasks WHERE created_at >= ? AND created_at < ? AND deleted_at IS NULL", [today_start_iso, today_end_iso])
-        avg_row = self._fetchone(
-            """
-            SELECT AVG((julianday(completed_at) - julianday(created_at)) * 24 * 60) AS avg_minutes
-            FROM tasks
-            WHERE status = 'completed' AND completed_at IS NOT NULL AND deleted_at IS NULL
-            """
+        rows = self._fetchall(
+            f"""
+            WITH status_counts AS ({self.TASK_STATUS_COUNTS_SQL})
+            SELECT
+                status_counts.status AS status,
+                status_counts.total_count AS total_count,
+                status_counts.today_count AS today_count,
+                scalars.avg_minutes AS avg_minutes,
+                scalars.completed_patents AS completed_patents
+            FROM (
+                SELECT
+                    (
+                        SELECT AVG((julianday(completed_at) - julianday(created_at)) * 24 * 60)
+                        FROM tasks
+                        WHERE status = 'completed' AND completed_at IS NOT NULL AND deleted_at IS NULL
+                    ) AS avg_minutes,
+                    (SELECT COUNT(*) FROM patent_analyses) AS completed_patents
+            ) AS scalars
+            LEFT JOIN status_counts ON 1 = 1
+            """,
+            [today_start_iso, today_end_iso],
         )
-        completed_patents_row = self._fetchone("SELECT COUNT(*) AS c FROM patent_analyses")
-        avg_duration = avg_row.get("avg_minutes") if avg_row else None
+        status_rows = [row for row in rows if row.get("status") is not None]
+        scalar_row = rows[0] if rows else {}
+        avg_duration = scalar_row.get("avg_minutes")
         return {
-            "by_status": status_counts,
-            "today_created": int(today_count_row["c"]) if today_count_row else 0,
+            "by_status": {str(row["status"]): int(row.get("total_count") or 0) for row in status_rows},
+            "today_created": sum(int(row.get("today_count") or 0) for row in status_rows),
             "avg_duration_minutes": round(float(avg_duration), 2) if avg_duration else None,
-            "completed_patents": int(completed_patents_row["c"]) if completed_patents_row else 0,
+            "completed_patents": int(scalar_row.get("completed_patents") or 0),
         }
 
     def record_patent_analysis(self, pn: Optional[str], sha256: Optional[str] = None) -> bool:
@@ -361,21 +510,15 @@ class TaskRepositoryMixin:
 
     def cleanup_old_tasks(self, days: int = 365, dry_run: bool = False) -> int:
         cutoff = to_utc_z(datetime.utcnow() - timedelta(days=days), naive_strategy="utc")
-        rows = self._fetchall(
-            """
-            SELECT id FROM tasks
-            WHERE deleted_at IS NOT NULL AND deleted_at < ?
+        predicate = """
+            deleted_at IS NOT NULL AND deleted_at < ?
             OR (updated_at < ? AND status IN ('completed', 'failed', 'cancelled') AND deleted_at IS NULL)
-            """,
-            [cutoff, cutoff],
-        )
-        task_ids = [row["id"] for row in rows]
+        """
         if dry_run:
-            return len(task_ids)
-        if task_ids:
-            placeholders = ",".join(["?"] * len(task_ids))
-            self._request(f"DELETE FROM tasks WHERE id IN ({placeholders})", task_ids)
-        return len(task_ids)
+            row = self._fetchone(f"SELECT COUNT(*) AS c FROM tasks WHERE {predicate}", [cutoff, cutoff])
+            return int(row["c"]) if row else 0
+        # 直接按条件删除：单次往返，且不受 IN 列表绑定参数上限约束
+        return self._changed_rows(self._request(f"DELETE FROM tasks WHERE {predicate}", [cutoff, cutoff]))
 
     def vacuum(self):
         try:
@@ -8,6 +8,8 @@ from backend.time_utils import utc_now_z
 
 
 class UsageRepositoryMixin:
+    LLM_PRICING_INSERT_BATCH_ROWS = 7
+
     def _row_to_task_llm_usage(self, row: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "task_id": row.get("task_id"),
@@ -173,33 +175,43 @@ class UsageRepositoryMixin:
             "DELETE FROM llm_pricing_entries WHERE region = ? AND billing_mode = ?",
             [normalized_region, normalized_billing_mode],
         )
-        inserted = 0
+        rows: List[List[Any]] = []
         for entry in entries or []:
-            payload = {
-                "model": str(entry.get("model") or "").strip(),
-                "region": normalized_region,
-                "billing_mode": normalized_billing_mode,
-                "input_tier_min_tokens": int(entry.get("input_tier_min_tokens") or 0),
-                "input_tier_max_tokens": int(entry["input_tier_max_tokens"]) if entry.get("input_tier_max_tokens") is not None else None,
-                "prompt_price_per_million_cny": float(entry.get("prompt_price_per_million_cny") or 0),
-                "completion_price_per_million_cny": float(entry.get("completion_price_per_million_cny") or 0),
-                "source_url": str(entry.get("source_url") or "").strip(),
-                "source_hash": str(entry.get("source_hash") or "").strip(),
-                "fetched_at": self._normalize_usage_timestamp(entry.get("fetched_at") or utc_now_z(), field="fetched_at"),
-                "expires_at": self._normalize_usage_timestamp(entry.get("expires_at") or utc_now_z(), field="expires_at"),
-                "parse_status": str(entry.get("parse_status") or "ok").strip() or "ok",
-                "parse_error": str(entry.get("parse_error") or "").strip(),
-                "updated_at": self._normalize_usage_timestamp(entry.get("updated_at") or utc_now_z(), field="updated_at"),
-            }
-            if not payload["model"] or payload["input_tier_min_tokens"] <= 0:
+            model = str(entry.get("model") or "").strip()
+            input_tier_min_tokens = int(entry.get("input_tier_min_tokens") or 0)
+            if not model or input_tier_min_tokens <= 0:
                 continue
+            rows.append(
+                [
+                    model,
+                    normalized_region,
+                    normalized_billing_mode,
+                    input_tier_min_tokens,
+                    int(entry["input_tier_max_tokens"]) if entry.get("input_tier_max_tokens") is not None else None,
+                    float(entry.get("prompt_price_per_million_cny") or 0),
+                    float(entry.get("completion_price_per_million_cny") or 0),
+                    str(entry.get("source_url") or "").strip(),
+                    str(entry.get("source_hash") or "").strip(),
+                    self._normalize_usage_timestamp(entry.get("fetched_at") or utc_now_z(), field="fetched_at"),
+                    self._normalize_usage_timestamp(entry.get("expires_at") or utc_now_z(), field="expires_at"),
+                    str(entry.get("parse_status") or "ok").strip() or "ok",
+                    str(entry.get("parse_error") or "").strip(),
+                    self._normalize_usage_timestamp(entry.get("updated_at") or utc_now_z(), field="updated_at"),
+                ]
+            )
+
+        # 多行 VALUES 批量写入；每批行数受 D1 单条语句 100 个绑定参数的限制
+        inserted = 0
+        for offset in range(0, len(rows), self.LLM_PRICING_INSERT_BATCH_ROWS):
+            batch = rows[offset:offset + self.LLM_PRICING_INSERT_BATCH_ROWS]
+            placeholders = ", ".join(["(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"] * len(batch))
             result = self._request(
-                """
+                f"""
                 INSERT INTO llm_pricing_entries (
                     model, region, billing_mode, input_tier_min_tokens, input_tier_max_tokens,
                     prompt_price_per_million_cny, completion_price_per_million_cny,
                     source_url, source_hash, fetched_at, expires_at, parse_status, parse_error, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ) VALUES {placeholders}
                 ON CONFLICT(model, region, billing_mode, input_tier_min_tokens) DO UPDATE SET
                     input_tier_max_tokens = excluded.input_tier_max_tokens,
                     prompt_price_per_million_cny = excluded.prompt_price_per_million_cny,
@@ -212,22 +224,7 @@ class UsageRepositoryMixin:
                     parse_error = excluded.parse_error,
                     updated_at = excluded.updated_at
                 """,
-                [
-                    payload["model"],
-                    payload["region"],
-                    payload["billing_mode"],
-                    payload["input_tier_min_tokens"],
-                    payload["input_tier_max_tokens"],
-                    payload["prompt_price_per_million_cny"],
-                    payload["completion_price_per_million_cny"],
-                    payload["source_url"],
-                    payload["source_hash"],
-                    payload["fetched_at"],
-                    payload["expires_at"],
-                    payload["parse_status"],
-                    payload["parse_error"],
-                    payload["updated_at"],
-                ],
+                [value for row in batch for value in row],
             )
             inserted += max(0, self._changed_rows(result))
         return inserted
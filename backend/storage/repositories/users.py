@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 from typing import Any, Dict, Optional
 
 from backend.time_utils import to_utc_z, utc_now_z
@@ -13,7 +12,7 @@ class UserRepositoryMixin:
     def upsert_authing_user(self, user: User) -> User:
         now_iso = utc_now_z()
         created_at_iso = to_utc_z(user.created_at, naive_strategy="utc") if user.created_at else now_iso
-        raw_profile = json.dumps(user.raw_profile, ensure_ascii=False) if user.raw_profile else None
+        raw_profile = self._encode_json_value(user.raw_profile) if user.raw_profile else None
         self._request(
             """
             INSERT INTO users (
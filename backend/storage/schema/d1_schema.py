@@ -175,6 +175,7 @@ CREATE INDEX IF NOT EXISTS idx_tasks_deleted_created_at ON tasks(deleted_at, cre
 CREATE INDEX IF NOT EXISTS idx_tasks_deleted_owner_id ON tasks(deleted_at, owner_id);
 CREATE INDEX IF NOT EXISTS idx_tasks_owner_created_deleted_type ON tasks(owner_id, created_at, deleted_at, task_type);
 CREATE INDEX IF NOT EXISTS idx_tasks_owner_created_deleted_type_status ON tasks(owner_id, created_at, deleted_at, task_type, status);
+CREATE INDEX IF NOT EXISTS idx_tasks_owner_completed_at ON tasks(owner_id, completed_at);
 CREATE INDEX IF NOT EXISTS idx_tasks_deleted_status_created_at ON tasks(deleted_at, status, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_tasks_deleted_task_type_created_at ON tasks(deleted_at, task_type, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_patent_analyses_completed_at ON patent_analyses(first_completed_at);
@@ -0,0 +1,89 @@
+"""
+进程内任务变更通知：存储写入后唤醒等待中的 SSE 订阅者，替代固定间隔轮询。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Callable, Dict, List, Set, Tuple
+
+
+_Waiter = Tuple[asyncio.AbstractEventLoop, asyncio.Event]
+
+
+class StreamSubscription:
+    def __init__(self, notifier: "StreamNotifier", key: str):
+        self._notifier = notifier
+        self._key = key
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    @property
+    def waiter(self) -> _Waiter:
+        return self._loop, self._event
+
+    async def wait(self, timeout: float) -> bool:
+        """等待下一次通知；超时返回 False。返回前清除已收到的信号。"""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._event.clear()
+
+    def __enter__(self) -> "StreamSubscription":
+        self._notifier._register(self._key, self.waiter)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._notifier._unregister(self._key, self.waiter)
+
+
+class StreamNotifier:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters: Dict[str, Set[_Waiter]] = {}
+        self._listeners: List[Callable[[str], None]] = []
+
+    def add_listener(self, callback: Callable[[str], None]) -> None:
+        """注册同步回调，每次通知时在调用方线程内执行（用于失效进程内缓存）。"""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def subscribe(self, key: str) -> StreamSubscription:
+        """需在事件循环内调用；先订阅再读取存储，避免漏掉两者之间的写入。"""
+        return StreamSubscription(self, str(key or ""))
+
+    def notify(self, key: str) -> None:
+        """可在任意线程调用。"""
+        key = str(key or "")
+        with self._lock:
+            listeners = list(self._listeners)
+            waiters = list(self._waiters.get(key, ()))
+        for callback in listeners:
+            callback(key)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # 订阅者所在事件循环已关闭
+                continue
+
+    def _register(self, key: str, waiter: _Waiter) -> None:
+        with self._lock:
+            self._waiters.setdefault(key, set()).add(waiter)
+
+    def _unregister(self, key: str, waiter: _Waiter) -> None:
+        with self._lock:
+            waiters = self._waiters.get(key)
+            if not waiters:
+                return
+            waiters.discard(waiter)
+            if not waiters:
+                self._waiters.pop(key, None)
+
+
+task_stream_notifier = StreamNotifier()
@@ -17,6 +17,7 @@ import threading
 import time
 import uuid
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
@@ -42,12 +43,13 @@ REDACTED_VALUE = "***REDACTED***"
 INTERNAL_API_PATH_PREFIX = "/api/internal/"
 
 
+# 凭据均为 ASCII：re.ASCII 让 \b/\s/IGNORECASE 只查 ASCII 表，大段 LLM 文本扫描约快一倍
 _SENSITIVE_KEY_RE = re.compile(
     r"(authorization|api[-_]?key|token|secret|password|cookie|set-cookie|access[-_]?key|private[-_]?key)",
-    re.IGNORECASE,
+    re.IGNORECASE | re.ASCII,
 )
-_BEARER_RE = re.compile(r"\bBearer\s+[A-Za-z0-9._\-~+/]+=*", re.IGNORECASE)
-_OPENAI_KEY_RE = re.compile(r"\bsk-[A-Za-z0-9]{10,}\b")
+_BEARER_RE = re.compile(r"\bBearer\s+[A-Za-z0-9._\-~+/]+=*", re.IGNORECASE | re.ASCII)
+_OPENAI_KEY_RE = re.compile(r"\bsk-[A-Za-z0-9]{10,}\b", re.ASCII)
 _SAFE_USAGE_KEYS = {
     "prompt_tokens",
     "completion_tokens",
@@ -107,6 +109,9 @@ class LazySystemLogStorageProxy:
     def list_system_log_payload_paths_for_policy_cleanup(self) -> Any:
         return self._storage().list_system_log_payload_paths_for_policy_cleanup()
 
+    def purge_system_logs_by_policy(self) -> Any:
+        return self._storage().purge_system_logs_by_policy()
+
 
 def _json_default(value: Any) -> str:
     return str(value)
@@ -120,12 +125,18 @@ def _sanitize_text(text: str) -> str:
     if not text:
         return text
     redacted = _BEARER_RE.sub("Bearer ***", text)
-    redacted = _OPENAI_KEY_RE.sub(REDACTED_VALUE, redacted)
+    if "sk-" in redacted:
+        redacted = _OPENAI_KEY_RE.sub(REDACTED_VALUE, redacted)
     return redacted
 
 
 def _is_sensitive_key(key: Any) -> bool:
-    key_text = str(key or "")
+    return _is_sensitive_key_text(str(key or ""))
+
+
+@lru_cache(maxsize=1024)
+def _is_sensitive_key_text(key_text: str) -> bool:
+    # 载荷字段名集合很小且反复出现，按键名缓存判定结果
     if key_text.lower() in _SAFE_USAGE_KEYS:
         return False
     return bool(_SENSITIVE_KEY_RE.search(key_text))
@@ -447,7 +458,6 @@ def emit_system_log(
     message: Optional[str] = None,
     payload: Optional[Any] = None,
 ) -> str:
-    now = utc_now_z(timespec="microseconds")
     log_id = uuid.uuid4().hex
     context = get_request_context()
     resolved_category = str(category or "").strip() or "system"
@@ -462,6 +472,8 @@ def emit_system_log(
     ):
         return log_id
 
+    # 高频的成功事件在上面直接返回，时间戳等只为需要落库的日志生成
+    now = utc_now_z(timespec="microseconds")
     safe_payload = redact_sensitive(payload or {})
     payload_record = _persist_payload(safe_payload, log_id, now)
 
@@ -751,13 +763,19 @@ def cleanup_system_logs_by_policy() -> Dict[str, int]:
     if storage and hasattr(storage, "cleanup_system_logs_by_policy"):
         try:
             with internal_log_write_context():
-                if hasattr(storage, "list_system_log_payload_paths_for_policy_cleanup"):
-                    payload_paths = [
-                        str(item).strip()
-                        for item in (storage.list_system_log_payload_paths_for_policy_cleanup() or [])
-                        if str(item).strip()
-                    ]
-                deleted_db = int(storage.cleanup_system_logs_by_policy() or 0)
+                if hasattr(storage, "purge_system_logs_by_policy"):
+                    # DELETE ... RETURNING 一次取回删除数与 payload 路径
+                    deleted_db, payload_paths = storage.purge_system_logs_by_policy()
+                    payload_paths = [str(item).strip() for item in (payload_paths or []) if str(item).strip()]
+                    deleted_db = int(deleted_db or 0)
+                else:
+                    if hasattr(storage, "list_system_log_payload_paths_for_policy_cleanup"):
+                        payload_paths = [
+                            str(item).strip()
+                            for item in (storage.list_system_log_payload_paths_for_policy_cleanup() or [])
+                            if str(item).strip()
+                        ]
+                    deleted_db = int(storage.cleanup_system_logs_by_policy() or 0)
         except Exception as exc:
             if _is_storage_temporarily_unavailable(exc):
                 logger.debug("[系统日志] 存储暂不可用，跳过策略数据库清理：{}", exc)
@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import os
 from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
 from typing import Literal, Optional, Union
 from zoneinfo import ZoneInfo
 
@@ -32,15 +33,24 @@ def parse_storage_ts(
     if value is None:
         return None
     if isinstance(value, datetime):
-        parsed = value
-    else:
-        text = str(value).strip()
-        if not text:
-            return None
-        try:
-            parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
-        except ValueError:
-            return None
+        return _normalize_to_utc(value, naive_strategy)
+    return _parse_storage_text(str(value), naive_strategy)
+
+
+@lru_cache(maxsize=4096)
+def _parse_storage_text(value: str, naive_strategy: NaiveStrategy) -> Optional[datetime]:
+    # 存储行的时间字符串重复度高（列表/轮询反复读取同一批任务），datetime 不可变，可安全复用解析结果
+    text = value.strip()
+    if not text:
+        return None
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return _normalize_to_utc(parsed, naive_strategy)
+
+
+def _normalize_to_utc(parsed: datetime, naive_strategy: NaiveStrategy) -> datetime:
     if parsed.tzinfo is None:
         base_tz = APP_TZ if naive_strategy == "local" else UTC
         parsed = parsed.replace(tzinfo=base_tz)
@@ -93,12 +103,14 @@ def local_recent_day_window_to_utc(
     timespec: str = "seconds",
 ) -> tuple[str, str]:
     resolved_now = now.astimezone(APP_TZ) if now else utc_now().astimezone(APP_TZ)
-    end = datetime.combine(resolved_now.date() + timedelta(days=1), time.min, APP_TZ)
-    start = datetime.combine(
-        resolved_now.date() - timedelta(days=max(1, int(day_count or 1)) - 1),
-        time.min,
-        APP_TZ,
-    )
+    return _local_day_window(resolved_now.date(), max(1, int(day_count or 1)), timespec)
+
+
+@lru_cache(maxsize=64)
+def _local_day_window(local_day: date, day_count: int, timespec: str) -> tuple[str, str]:
+    # 同一本地日内窗口不变，按日期缓存，配额/统计查询无需每次重建边界字符串
+    end = datetime.combine(local_day + timedelta(days=1), time.min, APP_TZ)
+    start = datetime.combine(local_day - timedelta(days=day_count - 1), time.min, APP_TZ)
     return (
         _datetime_to_z(start.astimezone(UTC), timespec=timespec),
         _datetime_to_z(end.astimezone(UTC), timespec=timespec),
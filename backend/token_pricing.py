@@ -38,6 +38,9 @@ _ASCII_MODEL_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9._:-]*")
 _NUMERIC_PATTERN = re.compile(r"(\d+(?:\.\d+)?)")
 _TOKEN_BOUND_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([KkMm]?)")
 _NON_DIGIT_WHITESPACE_PATTERN = re.compile(r"\s+")
+_TOKEN_LOWER_BOUND_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([KkMm]?)<Token")
+_TOKEN_UPPER_BOUND_PATTERN = re.compile(r"≤(\d+(?:\.\d+)?)\s*([KkMm]?)")
+_TOKEN_RANGE_OPERATOR_PATTERN = re.compile(r"[<≤>=]")
 _MODEL_TOKEN_STOPWORDS = {"batch", "id", "k", "m", "model", "token"}
 
 _CACHE_LOCK = threading.Lock()
@@ -99,8 +102,8 @@ def _parse_token_range(value: Any) -> Tuple[int, Optional[int]]:
     if not text:
         return 1, None
 
-    lower_match = re.search(r"(\d+(?:\.\d+)?)\s*([KkMm]?)<Token", text)
-    upper_match = re.search(r"≤(\d+(?:\.\d+)?)\s*([KkMm]?)", text)
+    lower_match = _TOKEN_LOWER_BOUND_PATTERN.search(text)
+    upper_match = _TOKEN_UPPER_BOUND_PATTERN.search(text)
 
     min_tokens = 1
     max_tokens: Optional[int] = None
@@ -140,7 +143,8 @@ def _extract_model_name(value: Any) -> str:
         normalized = candidate.lower()
         if normalized in _MODEL_TOKEN_STOPWORDS:
             continue
-        if not any(char.isdigit() for char in candidate) and not any(char in candidate for char in "-._:"):
+        # 候选仅由 ASCII 字母、数字与 "._:-" 组成，纯字母即不含数字和分隔符
+        if candidate.isalpha():
             continue
         return candidate
     return ""
@@ -152,7 +156,7 @@ def _looks_like_token_range(value: Any) -> bool:
         return False
     if "无阶梯" in text:
         return True
-    return "token" in text.lower() and bool(re.search(r"[<≤>=]", text))
+    return "token" in text.lower() and bool(_TOKEN_RANGE_OPERATOR_PATTERN.search(text))
 
 
 def _extract_doc_content_html(page_html: str) -> str:
@@ -2,15 +2,20 @@
 用户使用额度管理
 """
 import os
+import threading
+import time
 from decimal import Decimal, InvalidOperation
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
 from fastapi import HTTPException
 
-from backend.auth import APP_TZ_OFFSET_HOURS, _quota_reset_utc
+from backend.auth import APP_TZ_OFFSET_HOURS, _quota_reset_iso
 from backend.models import UsageResponse
 from backend.storage import TaskType
 from backend.storage import get_pipeline_manager
+from backend.storage.pipeline_adapter import OWNER_TASKS_NOTIFY_PREFIX
+from backend.stream_notifier import task_stream_notifier
 
 
 task_manager = get_pipeline_manager()
@@ -30,9 +35,21 @@ ALLOWED_TASK_TYPES = {
     TaskType.AI_SEARCH.value,
 }
 POINT_OCCUPIED_STATUSES = ("pending", "processing", "paused", "completed")
+# 枚举 .value 属性访问较慢，热路径用预先取出的字符串
+_ANALYSIS_TYPE = TaskType.PATENT_ANALYSIS.value
+_REVIEW_TYPE = TaskType.AI_REVIEW.value
+_REPLY_TYPE = TaskType.AI_REPLY.value
+_SEARCH_TYPE = TaskType.AI_SEARCH.value
+USAGE_CACHE_TTL_SECONDS = 10.0
+USAGE_CACHE_MAX_SIZE = 50000
 
+_usage_cache_lock = threading.Lock()
+_usage_cache: Dict[str, Tuple[float, str, Dict[str, Dict[str, int]]]] = {}
 
+
+@lru_cache(maxsize=16)
 def _parse_point_limit_units(value: Optional[str], fallback_points: float) -> int:
+    # 按原始环境变量文本缓存：仍随环境变量变化生效，但不再每次走 Decimal 解析
     fallback_units = int(fallback_points * POINT_UNITS_PER_POINT)
     if value is None:
         return fallback_units
@@ -52,9 +69,9 @@ def _parse_point_limit_units(value: Optional[str], fallback_points: float) -> in
 
 
 def _normalize_task_type(raw: Optional[str]) -> str:
-    task_type = (raw or TaskType.PATENT_ANALYSIS.value).strip().lower()
+    task_type = (raw or _ANALYSIS_TYPE).strip().lower()
     if task_type not in ALLOWED_TASK_TYPES:
-        return TaskType.PATENT_ANALYSIS.value
+        return _ANALYSIS_TYPE
     return task_type
 
 
@@ -109,29 +126,64 @@ def _today_point_occupied_count(owner_id: str, task_type: str) -> int:
     )
 
 
-def _get_user_usage(owner_id: str, task_type: Optional[str] = None) -> UsageResponse:
-    auth_type = _auth_type_for_owner_id(owner_id)
-    daily_limit_units = _daily_point_limit_units_for_auth_type(auth_type)
-    aggregated_today = task_manager.storage.aggregate_user_tasks_today(
+def _invalidate_user_usage_cache(owner_id: str) -> None:
+    with _usage_cache_lock:
+        _usage_cache.pop(owner_id, None)
+
+
+def _invalidate_usage_on_owner_tasks_changed(key: str) -> None:
+    if key.startswith(OWNER_TASKS_NOTIFY_PREFIX):
+        _invalidate_user_usage_cache(key[len(OWNER_TASKS_NOTIFY_PREFIX):])
+
+
+# 任务创建、失败、取消落库后才失效，避免失效与写入之间的读取把旧用量重新缓存
+task_stream_notifier.add_listener(_invalidate_usage_on_owner_tasks_changed)
+
+
+def _aggregate_user_tasks_today(owner_id: str, reset_at: str, *, use_cache: bool) -> Dict[str, Dict[str, int]]:
+    now = time.monotonic()
+    if use_cache:
+        with _usage_cache_lock:
+            cached = _usage_cache.get(owner_id)
+        if cached and cached[0] > now and cached[1] == reset_at:
+            return cached[2]
+
+    aggregated = task_manager.storage.aggregate_user_tasks_today(
         owner_id,
         tz_offset_hours=APP_TZ_OFFSET_HOURS,
         include_deleted=True,
         occupied_statuses=list(POINT_OCCUPIED_STATUSES),
     )
+    if use_cache:
+        with _usage_cache_lock:
+            if len(_usage_cache) >= USAGE_CACHE_MAX_SIZE:
+                for key in [key for key, entry in _usage_cache.items() if entry[0] <= now]:
+                    _usage_cache.pop(key, None)
+                if len(_usage_cache) >= USAGE_CACHE_MAX_SIZE:
+                    _usage_cache.clear()
+            _usage_cache[owner_id] = (now + USAGE_CACHE_TTL_SECONDS, reset_at, aggregated)
+    return aggregated
+
+
+def _get_user_usage(owner_id: str, task_type: Optional[str] = None, *, use_cache: bool = True) -> UsageResponse:
+    auth_type = _auth_type_for_owner_id(owner_id)
+    daily_limit_units = _daily_point_limit_units_for_auth_type(auth_type)
+    reset_at = _quota_reset_iso()
+    aggregated_today = _aggregate_user_tasks_today(owner_id, reset_at, use_cache=use_cache)
 
     def _counts(task_type_key: str) -> tuple[int, int]:
         row = aggregated_today.get(task_type_key, {})
         return int(row.get("created_count") or 0), int(row.get("occupied_count") or 0)
 
-    analysis_count, analysis_occupied_count = _counts(TaskType.PATENT_ANALYSIS.value)
-    review_count, review_occupied_count = _counts(TaskType.AI_REVIEW.value)
-    reply_count, reply_occupied_count = _counts(TaskType.AI_REPLY.value)
-    search_count, search_occupied_count = _counts(TaskType.AI_SEARCH.value)
+    analysis_count, analysis_occupied_count = _counts(_ANALYSIS_TYPE)
+    review_count, review_occupied_count = _counts(_REVIEW_TYPE)
+    reply_count, reply_occupied_count = _counts(_REPLY_TYPE)
+    search_count, search_occupied_count = _counts(_SEARCH_TYPE)
     used_units = (
-        analysis_occupied_count * TASK_POINT_COST_UNITS[TaskType.PATENT_ANALYSIS.value]
-        + review_occupied_count * TASK_POINT_COST_UNITS[TaskType.AI_REVIEW.value]
-        + reply_occupied_count * TASK_POINT_COST_UNITS[TaskType.AI_REPLY.value]
-        + search_occupied_count * TASK_POINT_COST_UNITS[TaskType.AI_SEARCH.value]
+        analysis_occupied_count * TASK_POINT_COST_UNITS[_ANALYSIS_TYPE]
+        + review_occupied_count * TASK_POINT_COST_UNITS[_REVIEW_TYPE]
+        + reply_occupied_count * TASK_POINT_COST_UNITS[_REPLY_TYPE]
+        + search_occupied_count * TASK_POINT_COST_UNITS[_SEARCH_TYPE]
     )
     remaining_units = max(0, daily_limit_units - used_units)
 
@@ -139,7 +191,6 @@ def _get_user_usage(owner_id: str, task_type: Optional[str] = None) -> UsageResp
     requested_task_units = _task_point_cost_units(requested_task_type) if requested_task_type else None
     can_create_requested = (remaining_units >= requested_task_units) if requested_task_units is not None else None
 
-    reset_at = _quota_reset_utc().isoformat()
     return UsageResponse(
         userId=owner_id,
         authType=auth_type,
@@ -147,10 +198,10 @@ def _get_user_usage(owner_id: str, task_type: Optional[str] = None) -> UsageResp
         usedPoints=_units_to_points(used_units),
         remainingPoints=_units_to_points(remaining_units),
         costPerTask={
-            "patentAnalysis": _units_to_points(TASK_POINT_COST_UNITS[TaskType.PATENT_ANALYSIS.value]),
-            "aiReview": _units_to_points(TASK_POINT_COST_UNITS[TaskType.AI_REVIEW.value]),
-            "officeActionReply": _units_to_points(TASK_POINT_COST_UNITS[TaskType.AI_REPLY.value]),
-            "aiSearch": _units_to_points(TASK_POINT_COST_UNITS[TaskType.AI_SEARCH.value]),
+            "patentAnalysis": _units_to_points(TASK_POINT_COST_UNITS[_ANALYSIS_TYPE]),
+            "aiReview": _units_to_points(TASK_POINT_COST_UNITS[_REVIEW_TYPE]),
+            "officeActionReply": _units_to_points(TASK_POINT_COST_UNITS[_REPLY_TYPE]),
+            "aiSearch": _units_to_points(TASK_POINT_COST_UNITS[_SEARCH_TYPE]),
         },
         createdToday={
             "analysisCount": analysis_count,
@@ -168,7 +219,8 @@ def _get_user_usage(owner_id: str, task_type: Optional[str] = None) -> UsageResp
 
 def _enforce_daily_quota(owner_id: str, task_type: Optional[str] = None):
     normalized_task_type = _normalize_task_type(task_type)
-    usage = _get_user_usage(owner_id, task_type=normalized_task_type)
+    # 额度校验始终读库，不受用量缓存影响
+    usage = _get_user_usage(owner_id, task_type=normalized_task_type, use_cache=False)
     if usage.canCreateRequestedTask is False:
         required_points = usage.requestedTaskPoints or _units_to_points(_task_point_cost_units(normalized_task_type))
         should_prompt_login = usage.authType == "guest"
@@ -1,10 +1,72 @@
 """
 API 工具函数
 """
+import asyncio
+import copy
+import hashlib
 import os
 import shutil
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse
+from loguru import logger
+from starlette.datastructures import Headers
+from starlette.types import Message, Receive, Scope, Send
+
+
+REPORT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# SSE 响应头：禁止 Nginx 等反向代理缓冲事件帧；空闲保活由各流自行按间隔发送注释帧
+SSE_RESPONSE_HEADERS = {"Cache-Control": "no-cache", "Connection": "keep-alive", "X-Accel-Buffering": "no"}
+
+
+class ReportFileResponse(FileResponse):
+    """报告 PDF 下载响应：服务器不支持零拷贝发送时，以 1 MiB 块读取以减少线程往返。"""
+
+    chunk_size = REPORT_DOWNLOAD_CHUNK_SIZE
+
+
+def _is_download_response(headers: Headers) -> bool:
+    media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+    disposition = headers.get("content-disposition", "").lstrip().lower()
+    return media_type == "application/pdf" or disposition.startswith("attachment")
+
+
+class DownloadAwareGZipMiddleware(GZipMiddleware):
+    """PDF 与附件下载不经 GZip：保留 Content-Length 与 Range 支持，PDF 本身已压缩，再压缩收益很小。"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        downstream = self.app
+
+        async def _route_by_response(scope: Scope, receive: Receive, gzip_send: Send) -> None:
+            passthrough = False
+
+            async def _send(message: Message) -> None:
+                nonlocal passthrough
+                if message["type"] == "http.response.start":
+                    passthrough = _is_download_response(Headers(raw=message["headers"]))
+                # 下载响应绕过压缩层直接发出，其余响应仍交给 GZip 按大小与类型处理
+                await (send if passthrough else gzip_send)(message)
+
+            await downstream(scope, receive, _send)
+
+        # 浅拷贝只替换 app，压缩参数沿用当前实例，兼容不同 Starlette 版本的构造参数
+        gzip = copy.copy(self)
+        gzip.app = _route_by_response
+        await GZipMiddleware.__call__(gzip, scope, receive, send)
+
+
+@lru_cache(maxsize=1024)
+def _attachment_content_disposition(filename: str) -> str:
+    """RFC 5987 编码的附件下载头；报告文件名按公开号重复出现，缓存编码结果。"""
+    return f"attachment; filename*=UTF-8''{quote(filename)}"
 
 
 def _parse_bool(value: Optional[str]) -> bool:
@@ -28,28 +90,63 @@ def _cleanup_path(path: Optional[str]):
         elif target.exists():
             target.unlink(missing_ok=True)
     except Exception as exc:
-        print(f"[清理] 删除资源失败: {path} - {exc}")
+        logger.warning("[清理] 删除资源失败: {} - {}", path, exc)
 
 
-def _read_local_pdf_bytes(pdf_path: str) -> Optional[bytes]:
-    if not pdf_path:
-        return None
+async def _write_upload_with_sha256(upload: Any, path: Path, chunk_size: int) -> Tuple[int, str]:
+    """分块把上传文件写入 path 并同步计算 SHA-256，返回 (字节数, 摘要)；内存占用与文件大小无关。"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "wb") as handle:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            digest.update(chunk)
+            await asyncio.to_thread(handle.write, chunk)
+    return size, digest.hexdigest()
 
-    path = Path(pdf_path)
-    if not path.exists() or not path.is_file():
-        return None
-    return path.read_bytes()
 
+def _local_file_has_content(file_path: str) -> bool:
+    if not file_path:
+        return False
 
-def _build_r2_storage():
+    path = Path(file_path)
+    return path.is_file() and path.stat().st_size > 0
+
+
+@lru_cache(maxsize=4)
+def _cached_r2_storage(
+    endpoint_url: str,
+    access_key_id: str,
+    secret_access_key: str,
+    bucket: str,
+    enabled: bool,
+    region: str,
+    key_prefix: str,
+):
     from backend.storage.r2_storage import R2Config, R2Storage
     config = R2Config(
-        endpoint_url=os.getenv("R2_ENDPOINT_URL", ""),
-        access_key_id=os.getenv("R2_ACCESS_KEY_ID", ""),
-        secret_access_key=os.getenv("R2_SECRET_ACCESS_KEY", ""),
-        bucket=os.getenv("R2_BUCKET", ""),
-        enabled=_parse_bool(os.getenv("R2_ENABLED", "false")),
-        region=os.getenv("R2_REGION", "auto"),
-        key_prefix=os.getenv("R2_KEY_PREFIX", "patent"),
+        endpoint_url=endpoint_url,
+        access_key_id=access_key_id,
+        secret_access_key=secret_access_key,
+        bucket=bucket,
+        enabled=enabled,
+        region=region,
+        key_prefix=key_prefix,
     )
     return R2Storage(config)
+
+
+def _build_r2_storage():
+    """按当前环境配置返回 R2Storage；同一配置复用同一实例（boto3 client 线程安全），避免每次请求重建客户端。"""
+    return _cached_r2_storage(
+        os.getenv("R2_ENDPOINT_URL", ""),
+        os.getenv("R2_ACCESS_KEY_ID", ""),
+        os.getenv("R2_SECRET_ACCESS_KEY", ""),
+        os.getenv("R2_BUCKET", ""),
+        _parse_bool(os.getenv("R2_ENABLED", "false")),
+        os.getenv("R2_REGION", "auto"),
+        os.getenv("R2_KEY_PREFIX", "patent"),
+    )
@@ -89,6 +89,20 @@ class Settings:
     MINERU_TEMP_FOLDER = "mineru_raw"
     MINERU_REQUEST_TIMEOUT_SECONDS = int(os.getenv("MINERU_REQUEST_TIMEOUT_SECONDS", "60"))
 
+    # --- Web 服务 ---
+    # uvicorn 进程数；SSE 通知、任务取消与快照缓存均在进程内，默认单进程
+    WEB_WORKERS = max(1, int(os.getenv("WEB_WORKERS", "1")))
+    # 允许跨域的前端来源，逗号分隔；默认放开全部来源
+    CORS_ALLOW_ORIGINS = [item.strip() for item in os.getenv("CORS_ALLOW_ORIGINS", "*").split(",") if item.strip()] or ["*"]
+    # 浏览器缓存预检结果的时长，期间同类跨域请求不再发送 OPTIONS
+    CORS_MAX_AGE_SECONDS = max(0, int(os.getenv("CORS_MAX_AGE_SECONDS", "600")))
+    # 报告下载改为重定向到 R2 预签名地址的有效期（秒）；0 表示仍由服务端转发文件流
+    R2_PRESIGNED_DOWNLOAD_TTL_SECONDS = max(0, int(os.getenv("R2_PRESIGNED_DOWNLOAD_TTL_SECONDS", "0")))
+
+    # --- 任务流程执行 ---
+    # 同时运行的 AI 分析/审查/答复流程上限，流程在专用线程池中执行，不占用默认线程池
+    TASK_WORKFLOW_MAX_WORKERS = max(1, int(os.getenv("TASK_WORKFLOW_MAX_WORKERS", "4")))
+
     # --- Office Action Reply 并行配置 ---
     OAR_MAX_CONCURRENCY = max(1, int(os.getenv("OAR_MAX_CONCURRENCY", "4")))
     OAR_WORKFLOW_TIMEOUT_SECONDS = int(os.getenv("OAR_WORKFLOW_TIMEOUT_SECONDS", "1800"))
@@ -10,7 +10,6 @@ from pathlib import Path
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import InMemorySaver
 from backend.log_context import bind_task_logger, task_log_context
-from backend.logging_setup import setup_logging_utc8
 from patent_agents.ai_reply.src.state import WorkflowState, InputFile, WorkflowConfig
 from patent_agents.ai_reply.src.nodes.document_processing import DocumentProcessingNode
 from patent_agents.ai_reply.src.nodes.patent_retrieval import PatentRetrievalNode
@@ -27,6 +26,7 @@ from patent_agents.ai_reply.src.nodes.report_generation import ReportGenerationN
 from patent_agents.ai_reply.src.nodes.final_report_render import FinalReportRenderNode
 from patent_agents.ai_reply.src.edges import handle_error
 from patent_agents.common.utils.serialization import item_get
+from patent_agents.common.workflow.runtime import build_runtime_config as _build_runtime_config, setup_workflow_logging
 
 
 from langgraph.types import RetryPolicy
@@ -183,22 +183,12 @@ def create_workflow(config: WorkflowConfig = None):
 
 
 def build_runtime_config(task_id: str, checkpoint_ns: str = "ai_reply"):
-    return {
-        "configurable": {
-            "thread_id": str(task_id).strip() or "oar-task",
-            "checkpoint_ns": str(checkpoint_ns).strip() or "ai_reply",
-        }
-    }
+    return _build_runtime_config(task_id, checkpoint_ns, default_thread_id="oar-task", default_checkpoint_ns="ai_reply")
 
 
 def setup_logging(log_dir: str = None):
     """设置日志配置"""
-    log_file = None
-    if log_dir:
-        log_dir = Path(log_dir)
-        log_dir.mkdir(parents=True, exist_ok=True)
-        log_file = str(log_dir / "workflow.log")
-    setup_logging_utc8(level="INFO", log_file=log_file, file_level="DEBUG", rotation="10 MB")
+    setup_workflow_logging(log_dir)
 
 
 def main():
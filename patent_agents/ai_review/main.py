@@ -29,8 +29,8 @@ from patent_agents.ai_review.src.nodes import (
 from patent_agents.ai_review.src.state import WorkflowConfig, WorkflowState
 from patent_agents.ai_review.src.edges import handle_error
 from patent_agents.ai_review.src.workflow_utils import item_get
+from patent_agents.common.workflow.runtime import build_runtime_config as _build_runtime_config, setup_workflow_logging
 from backend.log_context import bind_task_logger, task_log_context
-from backend.logging_setup import setup_logging_utc8
 from config import settings
 
 
@@ -123,21 +123,11 @@ def create_workflow(config: WorkflowConfig | None = None):
 
 
 def build_runtime_config(task_id: str, checkpoint_ns: str = "ai_review") -> Dict[str, Dict[str, str]]:
-    return {
-        "configurable": {
-            "thread_id": str(task_id).strip() or "ai-review-task",
-            "checkpoint_ns": str(checkpoint_ns).strip() or "ai_review",
-        }
-    }
+    return _build_runtime_config(task_id, checkpoint_ns, default_thread_id="ai-review-task", default_checkpoint_ns="ai_review")
 
 
 def setup_logging(log_dir: str | None = None) -> None:
-    log_file = None
-    if log_dir:
-        log_dir_path = Path(log_dir)
-        log_dir_path.mkdir(parents=True, exist_ok=True)
-        log_file = str(log_dir_path / "workflow.log")
-    setup_logging_utc8(level="INFO", log_file=log_file, file_level="DEBUG", rotation="10 MB")
+    setup_workflow_logging(log_dir)
 
 
 def _to_dict(value: Any) -> Dict[str, Any]:
@@ -39,6 +39,12 @@ from patent_agents.common.retrieval.academic_search import AcademicSearchClient
 from patent_agents.common.search_clients.factory import SearchClientFactory
 
 
+PATENT_NUMBER_NON_ALNUM_RE = re.compile(r"[^A-Z0-9]")
+PATENT_NUMBER_TEXT_RE = re.compile(r"\b[A-Z]{2}\s*\d{5,}[A-Z]\d?\b", re.IGNORECASE)
+PATENT_NUMBER_TOKEN_RE = re.compile(r"^[A-Z]{2}\s*\d{5,}[A-Z0-9]*$", re.IGNORECASE)
+PATENT_NUMBER_SPLIT_RE = re.compile(r"[\s,，;；、|]+")
+
+
 DEFAULT_STOP_POLICY: Dict[str, Any] = {
     "max_rounds": 5,
     "max_queries": 30,
@@ -280,15 +286,15 @@ def _normalize_patent_number(value: Any) -> str:
     text = str(value or "").strip().upper()
     if text.startswith("PATENT:"):
         text = text.split(":", 1)[1]
-    return re.sub(r"[^A-Z0-9]", "", text)
+    return PATENT_NUMBER_NON_ALNUM_RE.sub("", text)
 
 
 def _extract_patent_numbers(value: Any) -> List[str]:
-    text = str(value or "").upper()
+    text = str(value or "")
     if not text:
         return []
-    matches = re.findall(r"\b[A-Z]{2}\s*\d{5,}[A-Z]\d?\b", text)
-    return [_normalize_patent_number(item) for item in matches if _normalize_patent_number(item)]
+    numbers = (_normalize_patent_number(item) for item in PATENT_NUMBER_TEXT_RE.findall(text))
+    return [number for number in numbers if number]
 
 
 def _target_patent_numbers(ctx: AiSearchRuntimeContext) -> set[str]:
@@ -317,7 +323,8 @@ def _is_target_patent(ctx: AiSearchRuntimeContext, item: Dict[str, Any]) -> bool
         item.get("external_id"),
         item.get("canonical_id"),
     ]
-    return any(_normalize_patent_number(value) in targets for value in identifiers if _normalize_patent_number(value))
+    normalized = (_normalize_patent_number(value) for value in identifiers)
+    return any(number and number in targets for number in normalized)
 
 
 def _ensure_policy_databases(ctx: AiSearchRuntimeContext, sources: List[str]) -> None:
@@ -1641,11 +1648,11 @@ async def run_review_agent(
 def _parse_patent_number_list(value: Any, *, limit: int) -> List[str]:
     numbers = _extract_patent_numbers(value)
     if not numbers:
-        tokens = re.split(r"[\s,，;；、|]+", str(value or "").upper())
+        tokens = PATENT_NUMBER_SPLIT_RE.split(str(value or ""))
         numbers = [
             _normalize_patent_number(token)
             for token in tokens
-            if re.match(r"^[A-Z]{2}\s*\d{5,}[A-Z0-9]*$", token.strip())
+            if PATENT_NUMBER_TOKEN_RE.match(token.strip())
         ]
     deduped: List[str] = []
     seen: set[str] = set()
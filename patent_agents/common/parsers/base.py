@@ -1,5 +1,51 @@
+import shutil
+import zipfile
 from abc import ABC, abstractmethod
-from pathlib import Path
+from pathlib import Path, PurePosixPath
+
+
+# 在线解析结果 zip 的下载/解压块大小
+RESULT_STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def extract_markdown_bundle(zip_path: Path, output_dir: Path) -> Path:
+    """
+    从 MinerU 结果 zip 中只解出 Markdown 与其同级 images/ 目录
+
+    按成员流式写到 output_dir/raw.md 与 output_dir/images/，
+    不再整包解压到临时目录（结果包内还含原始 PDF、布局 JSON 等大文件）。
+    """
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        members = [info for info in zip_ref.infolist() if not info.is_dir()]
+        md_member = next((info for info in members if info.filename.lower().endswith(".md")), None)
+        if md_member is None:
+            raise FileNotFoundError("No markdown file found in the downloaded zip.")
+
+        target_md = output_dir / "raw.md"
+        with zip_ref.open(md_member) as source, open(target_md, "wb") as target:
+            shutil.copyfileobj(source, target, RESULT_STREAM_CHUNK_SIZE)
+
+        images_prefix = PurePosixPath(md_member.filename).parent / "images"
+        image_members = []
+        for info in members:
+            try:
+                relative = PurePosixPath(info.filename).relative_to(images_prefix)
+            except ValueError:
+                continue
+            if ".." not in relative.parts:
+                image_members.append((info, relative))
+
+        target_img_dir = output_dir / "images"
+        if image_members and target_img_dir.exists():
+            shutil.rmtree(target_img_dir)
+        target_img_dir.mkdir(parents=True, exist_ok=True)
+        for info, relative in image_members:
+            target = target_img_dir.joinpath(*relative.parts)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with zip_ref.open(info) as source, open(target, "wb") as handle:
+                shutil.copyfileobj(source, handle, RESULT_STREAM_CHUNK_SIZE)
+
+    return target_md
 
 
 class BaseParser(ABC):
@@ -1,14 +1,12 @@
 import os
 import time
-import zipfile
-import shutil
 import re
 from pathlib import Path
 from loguru import logger
 
 # Import config
 from config import settings
-from patent_agents.common.parsers.base import BaseParser
+from patent_agents.common.parsers.base import RESULT_STREAM_CHUNK_SIZE, BaseParser, extract_markdown_bundle
 from patent_agents.common.utils.http import request_with_retry
 
 # Import Mineru local backend (only used if local parsing is active)
@@ -260,42 +258,14 @@ class OnlinePDFParser(BaseParser):
         ) as r:
             r.raise_for_status()
             with open(zip_path, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
+                for chunk in r.iter_content(chunk_size=RESULT_STREAM_CHUNK_SIZE):
                     f.write(chunk)
 
-        # 2. Extract
-        extract_tmp = output_dir / "tmp_extract"
-        extract_tmp.mkdir(exist_ok=True)
-
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_tmp)
-
-        # 3. Organize (Move files to expected structure)
-        # Expected: output_dir/raw.md, output_dir/images/
-
-        # Find the markdown file in the extracted folders
-        md_files = list(extract_tmp.rglob("*.md"))
-        if not md_files:
-            raise FileNotFoundError("No markdown file found in the downloaded zip.")
-
-        source_md = md_files[0]
-        target_md = output_dir / "raw.md"
-        shutil.move(str(source_md), str(target_md))
-
-        # Find images folder (usually in the same dir as the md file)
-        source_img_dir = source_md.parent / "images"
-        target_img_dir = output_dir / "images"
-
-        if source_img_dir.exists():
-            if target_img_dir.exists():
-                shutil.rmtree(target_img_dir)
-            shutil.move(str(source_img_dir), str(target_img_dir))
-        else:
-            target_img_dir.mkdir(exist_ok=True)
+        # 2. Extract only the markdown and its images into output_dir/raw.md, output_dir/images/
+        target_md = extract_markdown_bundle(zip_path, output_dir)
 
         # Cleanup
         zip_path.unlink()
-        shutil.rmtree(extract_tmp)
 
         return target_md
 
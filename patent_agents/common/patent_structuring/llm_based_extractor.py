@@ -57,7 +57,10 @@ class LLMBasedExtractor:
             # 提供更详细的错误信息
             logger.error(f"错误类型: {type(e).__name__}")
             if 'json_data' in locals():
-                logger.error(f"无效 JSON 数据: {json.dumps(json_data, ensure_ascii=False, indent=2)}")
+                logger.opt(lazy=True).error(
+                    "无效 JSON 数据: {}",
+                    lambda: json.dumps(json_data, ensure_ascii=False, indent=2),
+                )
             raise e
 
     @staticmethod
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import json
+import re
 from pathlib import Path
 from typing import Any, Dict
 
 
+# \w 与 str.isalnum() 加下划线逐字符等价，整串替换在 C 层完成
+_UNSAFE_ARTIFACT_CHARS_RE = re.compile(r"[^\w-]")
+
+
 class PipelineCancelled(RuntimeError):
     pass
 
@@ -16,7 +21,7 @@ def item_get(item: Any, key: str, default: Any = None) -> Any:
 
 
 def safe_artifact_name(value: str) -> str:
-    return "".join([c for c in str(value or "") if c.isalnum() or c in ("-", "_")])
+    return _UNSAFE_ARTIFACT_CHARS_RE.sub("", str(value or ""))
 
 
 def resolve_pn(input_pn: str, patent_data: Dict[str, Any], fallback: str) -> str:
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Optional
+
+from backend.logging_setup import setup_logging_utc8
+
+
+def build_runtime_config(
+    task_id: str,
+    checkpoint_ns: str,
+    *,
+    default_thread_id: str,
+    default_checkpoint_ns: str,
+) -> Dict[str, Dict[str, str]]:
+    """各工作流入口共用的 LangGraph 运行配置。"""
+    return {
+        "configurable": {
+            "thread_id": str(task_id).strip() or default_thread_id,
+            "checkpoint_ns": str(checkpoint_ns).strip() or default_checkpoint_ns,
+        }
+    }
+
+
+def setup_workflow_logging(log_dir: Optional[str] = None) -> None:
+    log_file = None
+    if log_dir:
+        log_dir_path = Path(log_dir)
+        log_dir_path.mkdir(parents=True, exist_ok=True)
+        log_file = str(log_dir_path / "workflow.log")
+    setup_logging_utc8(level="INFO", log_file=log_file, file_level="DEBUG", rotation="10 MB")
@@ -17,7 +17,6 @@ from langgraph.types import RetryPolicy
 from loguru import logger
 
 from backend.log_context import bind_task_logger, task_log_context
-from backend.logging_setup import setup_logging_utc8
 from config import settings
 
 from patent_agents.patent_analysis.src.edges import handle_error
@@ -37,6 +36,7 @@ from patent_agents.patent_analysis.src.nodes import (
 )
 from patent_agents.patent_analysis.src.state import WorkflowConfig, WorkflowState
 from patent_agents.patent_analysis.src.workflow_utils import item_get
+from patent_agents.common.workflow.runtime import build_runtime_config as _build_runtime_config, setup_workflow_logging
 
 
 def create_workflow(config: WorkflowConfig | None = None):
@@ -152,21 +152,11 @@ def create_workflow(config: WorkflowConfig | None = None):
 
 
 def build_runtime_config(task_id: str, checkpoint_ns: str = "patent_analysis") -> Dict[str, Dict[str, str]]:
-    return {
-        "configurable": {
-            "thread_id": str(task_id).strip() or "patent-task",
-            "checkpoint_ns": str(checkpoint_ns).strip() or "patent_analysis",
-        }
-    }
+    return _build_runtime_config(task_id, checkpoint_ns, default_thread_id="patent-task", default_checkpoint_ns="patent_analysis")
 
 
 def setup_logging(log_dir: str | None = None) -> None:
-    log_file = None
-    if log_dir:
-        log_dir_path = Path(log_dir)
-        log_dir_path.mkdir(parents=True, exist_ok=True)
-        log_file = str(log_dir_path / "workflow.log")
-    setup_logging_utc8(level="INFO", log_file=log_file, file_level="DEBUG", rotation="10 MB")
+    setup_workflow_logging(log_dir)
 
 
 def _to_dict(value: Any) -> Dict[str, Any]:
@@ -406,3 +406,34 @@ def test_account_notification_settings_allow_duplicate_addresses(monkeypatch, tm
 
     assert saved.workNotificationEmail == 'same@example.com'
     assert saved.personalNotificationEmail == 'same@example.com'
+
+
+def test_post_avatar_reads_at_most_limit_plus_one_byte(monkeypatch, tmp_path):
+    storage = _mount_storage(monkeypatch, tmp_path)
+    user = CurrentUser(user_id='authing:avatar-user')
+    storage.upsert_authing_user(User(owner_id=user.user_id, authing_sub='avatar-user', name='头像用户'))
+    monkeypatch.setattr(account, '_build_r2_storage', lambda: SimpleNamespace(enabled=False))
+    monkeypatch.setattr(account, 'AVATAR_LOCAL_DIR', tmp_path / 'avatars')
+
+    reads = []
+
+    class _Upload:
+        filename = 'avatar.png'
+        content_type = 'image/png'
+
+        def __init__(self, size):
+            self._data = b'x' * size
+
+        async def read(self, size=-1):
+            reads.append(size)
+            return self._data if size < 0 else self._data[:size]
+
+    request = SimpleNamespace(base_url='https://unit.test/')
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(account.post_account_profile_avatar(request=request, file=_Upload(account.AVATAR_MAX_BYTES * 3), current_user=user))
+    assert exc_info.value.status_code == 400
+    assert reads == [account.AVATAR_MAX_BYTES + 1]
+
+    uploaded = asyncio.run(account.post_account_profile_avatar(request=request, file=_Upload(16), current_user=user))
+    assert uploaded.url.startswith('https://unit.test/api/account/profile/avatar/local/')
+    assert [path.stat().st_size for path in (tmp_path / 'avatars').iterdir()] == [16]
@@ -39,6 +39,7 @@ class _FakeR2Storage:
         self.fail_pdf = fail_pdf
         self.fail_json = fail_json
         self.put_calls: List[Dict[str, Any]] = []
+        self.file_keys: List[str] = []
 
     def build_ai_reply_pdf_key(self, pn: str) -> str:
         return f"workspace/{pn}/ai_reply.pdf"
@@ -46,6 +47,10 @@ class _FakeR2Storage:
     def build_ai_reply_json_key(self, pn: str) -> str:
         return f"workspace/{pn}/ai_reply.json"
 
+    def put_file(self, key: str, file_path: str, content_type: str = "application/octet-stream") -> bool:
+        self.file_keys.append(key)
+        return self.put_bytes(key, Path(file_path).read_bytes(), content_type)
+
     def put_bytes(self, key: str, content: bytes, content_type: str = "application/octet-stream") -> bool:
         self.put_calls.append({"key": key, "content_type": content_type, "size": len(content)})
         if content_type == "application/pdf":
@@ -144,6 +149,7 @@ def test_ai_reply_uploads_pdf_and_json_to_r2_and_updates_pn(monkeypatch, tmp_pat
     assert output_files.get("ai_reply_r2_key") == "workspace/CN115655695A/ai_reply.json"
     content_types = {item["content_type"] for item in fake_r2.put_calls}
     assert content_types == {"application/pdf", "application/json"}
+    assert fake_r2.file_keys == ["workspace/CN115655695A/ai_reply.pdf", "workspace/CN115655695A/ai_reply.json"]
     assert notify_calls == [
         {
             "task_id": task.id,
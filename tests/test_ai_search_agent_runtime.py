@@ -4,7 +4,7 @@ import importlib
 import asyncio
 
 from patent_agents.ai_search.src import runtime as agent_runtime_module
-from patent_agents.ai_search.src.runtime import _patent_items_from_response, _reasoning_summary_text, _stream_text_delta, normalize_stop_policy
+from patent_agents.ai_search.src.runtime import _parse_patent_number_list, _patent_items_from_response, _reasoning_summary_text, _stream_text_delta, normalize_stop_policy
 from patent_agents.ai_search.src.analysis_seed import seed_prompt_from_analysis, seed_search_elements_from_analysis
 from patent_agents.ai_search.src.reply_seed import seed_prompt_from_reply, seed_search_elements_from_reply
 from patent_agents.ai_search.src.search_elements import normalize_search_elements_payload
@@ -84,6 +84,11 @@ def test_patent_items_from_response_accepts_zhihuiya_results_shape() -> None:
     assert _patent_items_from_response({"data": {"results": [{"pn": "CN3"}]}}) == [{"pn": "CN3"}]
 
 
+def test_parse_patent_number_list_matches_case_insensitively_and_dedupes() -> None:
+    assert _parse_patent_number_list("对比 cn 112345678a 与 CN112345678A、us1234567b2", limit=10) == ["CN112345678A", "US1234567B2"]
+    assert _parse_patent_number_list("cn12345678x, ep1234567", limit=1) == ["CN12345678X"]
+
+
 def test_stream_text_delta_accepts_responses_text_delta() -> None:
     class RawEvent:
         type = "raw_response_event"
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import io
 import json
 import uuid
 from typing import Any, AsyncIterator
@@ -9,6 +10,7 @@ import pytest
 from agents import RunContextWrapper
 
 from backend.ai_search import agent_run_service as agent_run_service_module
+from backend.json_utils import dump_json_bytes
 from patent_agents.ai_search.src.runtime import (
     AiSearchRuntimeContext,
     SYSTEM_PROMPT,
@@ -24,10 +26,10 @@ from patent_agents.ai_search.src.ids import stable_ai_search_document_id
 from patent_agents.ai_search.src.state import PHASE_IDLE, PHASE_RUNNING, get_ai_search_meta, merge_ai_search_meta
 
 
-async def _collect_stream(stream: AsyncIterator[str]) -> list[dict[str, Any]]:
+async def _collect_stream(stream: AsyncIterator[bytes]) -> list[dict[str, Any]]:
     events: list[dict[str, Any]] = []
     async for chunk in stream:
-        text = str(chunk or "").strip()
+        text = chunk.decode("utf-8").strip()
         if not text.startswith("data: "):
             continue
         events.append(json.loads(text.removeprefix("data: ")))
@@ -49,6 +51,26 @@ def _create_session(service: AiSearchService, owner_id: str = "guest_ai_search")
     return created, task
 
 
+def test_create_session_inserts_initial_state_without_follow_up_update(monkeypatch, tmp_path) -> None:
+    service, storage = _build_service(tmp_path)
+    task_updates: list[str] = []
+    original_update_task = storage.update_task
+    monkeypatch.setattr(
+        storage,
+        "update_task",
+        lambda task_id, **kwargs: task_updates.append(task_id) or original_update_task(task_id, **kwargs),
+    )
+
+    created, task = _create_session(service)
+
+    assert task_updates == []
+    assert task.title == f"AI 检索会话 - {created.sessionId}"
+    assert task.status == TaskStatus.PROCESSING
+    meta = get_ai_search_meta(task)
+    assert meta["thread_id"] == created.threadId == f"ai-search-{created.sessionId}"
+    assert meta["current_phase"] == PHASE_IDLE
+
+
 def _append_stream_event(
     storage: SQLiteTaskStorage,
     task_id: str,
@@ -486,10 +508,10 @@ def test_supplement_documents_imports_user_pdf(monkeypatch, tmp_path) -> None:
     class FakeUpload:
         def __init__(self, filename: str, content: bytes) -> None:
             self.filename = filename
-            self._content = content
+            self._stream = io.BytesIO(content)
 
-        async def read(self):
-            return self._content
+        async def read(self, size: int = -1):
+            return self._stream.read(size)
 
     monkeypatch.setattr(
         service.supplements,
@@ -533,8 +555,11 @@ def test_supplement_documents_returns_friendly_pdf_text_failure(monkeypatch, tmp
     class FakeUpload:
         filename = "scan.pdf"
 
-        async def read(self):
-            return b"%PDF scan content"
+        def __init__(self) -> None:
+            self._stream = io.BytesIO(b"%PDF scan content")
+
+        async def read(self, size: int = -1):
+            return self._stream.read(size)
 
     monkeypatch.setattr(service.supplements, "_extract_pdf_text", lambda _path: "")
 
@@ -583,7 +608,7 @@ def test_subscribe_stream_waits_for_new_events_while_session_is_running(tmp_path
     async def collect_until_trace() -> list[dict[str, Any]]:
         events: list[dict[str, Any]] = []
         async for chunk in service.subscribe_stream(created.sessionId, "guest_ai_search", after_seq=0):
-            text = str(chunk or "").strip()
+            text = chunk.decode("utf-8").strip()
             if not text.startswith("data: "):
                 continue
             event = json.loads(text.removeprefix("data: "))
@@ -1208,3 +1233,14 @@ def test_export_office_action_requires_source_context(tmp_path) -> None:
 
     assert exc_info.value.status_code == 409
     assert exc_info.value.detail["code"] == "AI_SEARCH_OFFICE_ACTION_SOURCE_CONTEXT_REQUIRED"
+
+
+def test_sse_json_encoding_round_trips_unicode_and_oversized_ints() -> None:
+    message = {"type": "trace.completed", "payload": {"label": "检索完成", 1: "int-key"}, "seq": 7}
+    assert json.loads(dump_json_bytes(message)) == {
+        "type": "trace.completed",
+        "payload": {"label": "检索完成", "1": "int-key"},
+        "seq": 7,
+    }
+    assert json.loads(dump_json_bytes({"seq": 2**70})) == {"seq": 2**70}
+    assert "检索完成".encode("utf-8") in dump_json_bytes(message)
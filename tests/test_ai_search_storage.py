@@ -77,3 +77,83 @@ def test_ai_search_storage_roundtrip_for_agent_run_and_documents(tmp_path) -> No
     assert run["selected_document_count"] == 1
     assert docs[0]["document_id"] == "doc-1"
     assert docs[0]["key_passages_json"] == [{"text": "关键段落"}]
+
+
+def test_upsert_ai_search_documents_batches_rows_and_resolves_run_once(tmp_path, monkeypatch) -> None:
+    storage = SQLiteTaskStorage(tmp_path / "ai_search_batch.db")
+    storage.create_task(Task(id="task-batch", owner_id="guest:u", task_type=TaskType.AI_SEARCH.value))
+    assert storage.create_ai_search_run(
+        {"run_id": "run-1", "task_id": "task-batch", "plan_version": 1, "phase": "running", "status": "processing"}
+    )
+    storage.upsert_ai_search_documents(
+        [{"run_id": "run-1", "task_id": "task-batch", "plan_version": 1, "document_id": "doc-0", "stage": "candidate", "title": "旧"}]
+    )
+    lookups: list[int] = []
+    original_get_run = storage.get_ai_search_run
+    monkeypatch.setattr(storage, "get_ai_search_run", lambda *args, **kwargs: lookups.append(1) or original_get_run(*args, **kwargs))
+    executemany_rows: list[int] = []
+    original_request_many = storage._request_many
+    monkeypatch.setattr(
+        storage,
+        "_request_many",
+        lambda sql, params_seq: executemany_rows.append(len(params_seq)) or original_request_many(sql, params_seq),
+    )
+    inserts: list[str] = []
+    original_request = storage._request
+    monkeypatch.setattr(
+        storage,
+        "_request",
+        lambda sql, params=None: (inserts.append(sql) if "INSERT INTO ai_search_documents" in sql else None) or original_request(sql, params),
+    )
+
+    records = [
+        {"task_id": "task-batch", "plan_version": 1, "document_id": f"doc-{index}", "stage": "candidate", "title": f"文献{index}"}
+        for index in range(5)
+    ]
+    records.append({"task_id": "task-batch", "plan_version": 1, "document_id": "doc-x", "stage": ""})
+
+    # SQLite 走单事务 executemany，不拼多行 VALUES
+    assert storage.upsert_ai_search_documents(records) == 5
+    assert len(lookups) == 1
+    assert executemany_rows == [5]
+    assert inserts == []
+    docs = {doc["document_id"]: doc for doc in storage.list_ai_search_documents("task-batch", 1)}
+    assert sorted(docs) == [f"doc-{index}" for index in range(5)]
+    assert docs["doc-0"]["title"] == "文献0"
+
+    # 无 _request_many 的后端（D1）按 AI_SEARCH_DOCUMENT_UPSERT_BATCH_ROWS 拼多行 VALUES
+    monkeypatch.setattr(storage, "_request_many", None)
+    for record in records:
+        record["title"] = f"{record.get('title')}-新"
+    assert storage.upsert_ai_search_documents(records) == 5
+    assert len(inserts) == 3
+    assert storage.list_ai_search_documents("task-batch", 1)[0]["title"].endswith("-新")
+
+def test_update_ai_search_documents_updates_ids_in_one_statement(tmp_path, monkeypatch) -> None:
+    storage = SQLiteTaskStorage(tmp_path / "ai_search_bulk_update.db")
+    storage.create_task(Task(id="task-bulk", owner_id="guest:u", task_type=TaskType.AI_SEARCH.value))
+    assert storage.create_ai_search_run(
+        {"run_id": "run-1", "task_id": "task-bulk", "plan_version": 1, "phase": "running", "status": "processing"}
+    )
+    storage.upsert_ai_search_documents(
+        [
+            {"run_id": "run-1", "task_id": "task-bulk", "plan_version": 1, "document_id": f"doc-{index}", "stage": "candidate"}
+            for index in range(3)
+        ]
+    )
+    updates: list[str] = []
+    original_request = storage._request
+    monkeypatch.setattr(
+        storage,
+        "_request",
+        lambda sql, params=None: (updates.append(sql) if sql.startswith("UPDATE ai_search_documents") else None) or original_request(sql, params),
+    )
+
+    assert storage.update_ai_search_documents("task-bulk", 1, ["doc-0", "doc-2", "doc-0", "missing"], stage="selected", user_pinned=True) == 2
+    assert len(updates) == 1
+    assert storage.update_ai_search_documents("task-bulk", 1, []) == 0
+    assert storage.update_ai_search_documents("task-bulk", 1, ["doc-1"], unknown="x") == 0
+
+    docs = {doc["document_id"]: doc for doc in storage.list_ai_search_documents("task-bulk", 1)}
+    assert [docs[key]["stage"] for key in sorted(docs)] == ["selected", "candidate", "selected"]
+    assert docs["doc-0"]["user_pinned"] is True and docs["doc-1"]["user_pinned"] is False
@@ -194,3 +194,56 @@ def test_migrate_r2_task_artifacts_respects_limit():
     assert stats["success"] == 1
     assert stats["failed"] == 0
     assert len(storage.copy_calls) == 1
+
+
+def test_r2_put_file_returns_false_when_transfer_upload_fails(monkeypatch, tmp_path):
+    from boto3.exceptions import S3UploadFailedError
+
+    class _FailingClient:
+        def upload_file(self, filename, bucket, key, ExtraArgs=None):
+            raise S3UploadFailedError("Failed to upload report.pdf: AccessDenied")
+
+    source = tmp_path / "report.pdf"
+    source.write_bytes(b"%PDF-1.7\n")
+    storage = R2Storage(R2Config(endpoint_url="", access_key_id="", secret_access_key="", bucket="bucket"))
+    storage.client = _FailingClient()
+    monkeypatch.setattr(R2Storage, "enabled", property(lambda self: True))
+
+    assert storage.put_file("workspace/CN123/ai_analysis.pdf", str(source), "application/pdf") is False
+
+
+def test_r2_open_stream_treats_empty_and_missing_objects_like_get_bytes(monkeypatch):
+    from botocore.exceptions import ClientError
+
+    class _Body:
+        def __init__(self, data: bytes):
+            self.data = data
+            self.closed = False
+
+        def read(self):
+            return self.data
+
+        def close(self):
+            self.closed = True
+
+    bodies: dict[str, _Body] = {}
+
+    class _FakeClient:
+        def get_object(self, Bucket: str, Key: str):
+            if Key == "missing.pdf":
+                raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+            data = b"" if Key == "empty.pdf" else b"%PDF-1.7\n"
+            bodies[Key] = _Body(data)
+            return {"Body": bodies[Key], "ContentLength": len(data)}
+
+    storage = R2Storage(R2Config(endpoint_url="", access_key_id="", secret_access_key="", bucket="bucket"))
+    storage.client = _FakeClient()
+    monkeypatch.setattr(R2Storage, "enabled", property(lambda self: True))
+
+    assert storage.open_stream("missing.pdf") is None
+    assert storage.get_bytes("missing.pdf") is None
+    assert storage.open_stream("empty.pdf") is None
+    assert bodies["empty.pdf"].closed
+    assert not storage.get_bytes("empty.pdf")
+    assert storage.open_stream("report.pdf") is bodies["report.pdf"]
+    assert storage.get_bytes("report.pdf") == b"%PDF-1.7\n"
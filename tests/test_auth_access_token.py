@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from backend import auth
+
+
+def test_verified_token_cache_still_enforces_expiry(monkeypatch):
+    monkeypatch.setattr(auth, "_verified_token_cache", auth.OrderedDict())
+    token, exp = auth._issue_access_token("user-1")
+
+    payload, reason = auth._verify_access_token_with_reason(token)
+    assert reason is None
+    assert payload["uid"] == "user-1"
+    assert token in auth._verified_token_cache
+
+    monkeypatch.setattr(auth.time, "time", lambda: exp + 1)
+    payload, reason = auth._verify_access_token_with_reason(token)
+    assert payload is None
+    assert reason == "EXPIRED"
+    assert token not in auth._verified_token_cache
+
+
+def test_verified_token_cache_skips_invalid_tokens_and_is_bounded(monkeypatch):
+    monkeypatch.setattr(auth, "_verified_token_cache", auth.OrderedDict())
+    monkeypatch.setattr(auth, "VERIFIED_TOKEN_CACHE_MAX_SIZE", 2)
+
+    token, _exp = auth._issue_access_token("user-1")
+    forged = f"{token.split('.', 1)[0]}.deadbeef"
+    assert auth._verify_access_token_with_reason(forged) == (None, "INVALID")
+    assert len(auth._verified_token_cache) == 0
+
+    tokens = [auth._issue_access_token(f"user-{index}")[0] for index in range(3)]
+    for item in tokens:
+        assert auth._verify_token(item) is not None
+    assert list(auth._verified_token_cache) == tokens[1:]
+
+
+def test_quota_reset_is_next_local_midnight_in_utc(monkeypatch):
+    monkeypatch.setattr(auth, "APP_TZ_OFFSET_HOURS", 8)
+    auth._quota_reset_utc_for_local_day.cache_clear()
+    auth._quota_reset_iso_for_local_day.cache_clear()
+    local_day = auth.datetime(2026, 3, 1).toordinal()
+
+    assert auth._quota_reset_iso_for_local_day(local_day) == "2026-03-01T16:00:00+00:00"
+    assert auth._quota_reset_utc_for_local_day(local_day) == auth.datetime(2026, 3, 1, 16, tzinfo=auth.timezone.utc)
+    auth._quota_reset_utc_for_local_day.cache_clear()
+    auth._quota_reset_iso_for_local_day.cache_clear()
+
+
+def test_token_payload_encoding_matches_compact_json():
+    payload = {"uid": "guest_abc", "iat": 1700000000, "exp": 1700001800, "typ": "access"}
+    expected = auth.json.dumps(payload, separators=(",", ":"), ensure_ascii=True).encode("utf-8")
+
+    assert auth.dump_json_bytes(payload) == expected
+    assert auth._b64url_decode(auth._b64url_encode(expected)) == expected
+    assert "=" not in auth._b64url_encode(b"x")
+
+
+def test_token_payload_decoding_rejects_non_object_payloads(monkeypatch):
+    monkeypatch.setattr(auth, "_verified_token_cache", auth.OrderedDict())
+    payload_b64 = auth._b64url_encode(b'["guest_abc"]')
+    token = f"{payload_b64}.{auth._sign_payload(payload_b64)}"
+
+    assert auth._verify_access_token_with_reason(token) == (None, "INVALID")
+    assert auth.load_json(b'{"uid":"guest_abc","exp":1}') == {"uid": "guest_abc", "exp": 1}
+
+
+def test_sign_payload_rejects_non_ascii_payload_as_invalid(monkeypatch):
+    monkeypatch.setattr(auth, "_verified_token_cache", auth.OrderedDict())
+    token, _exp = auth._issue_access_token("user-1")
+    payload_b64, signature = token.split(".", 1)
+
+    assert auth._sign_payload(payload_b64) == signature
+    assert auth._verify_access_token_with_reason(f"{payload_b64}é.{signature}") == (None, "INVALID")
+
+
+def test_b64url_helpers_match_stdlib_without_padding():
+    import base64
+
+    for raw in (b"", b"x", b"xy", b"xyz", bytes(range(256))):
+        encoded = auth._b64url_encode(raw)
+        assert encoded == base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+        assert auth._b64url_decode(encoded) == raw
+
+
+def test_verify_splits_on_first_dot_and_accepts_bytes_payload(monkeypatch):
+    monkeypatch.setattr(auth, "_verified_token_cache", auth.OrderedDict())
+    token, _exp = auth._issue_access_token("user-1")
+    payload_b64, signature = token.split(".", 1)
+
+    assert auth._sign_payload(payload_b64.encode("ascii")) == signature
+    assert auth._verify_access_token_with_reason(f"{payload_b64}.{signature}.x") == (None, "INVALID")
+    assert auth._verify_access_token_with_reason(payload_b64) == (None, "INVALID")
+    assert auth._verify_token(token)["uid"] == "user-1"
+
+
+def test_current_user_dependency_runs_on_event_loop(monkeypatch):
+    import asyncio
+
+    monkeypatch.setattr(auth, "_verified_token_cache", auth.OrderedDict())
+    token, _exp = auth._issue_access_token("user-1")
+
+    assert asyncio.iscoroutinefunction(auth._get_current_user)
+    user = asyncio.run(auth._get_current_user(authorization=f"Bearer {token}", token=None))
+    assert user.user_id == "user-1"
+
+
+def test_local_day_ordinal_matches_datetime_arithmetic(monkeypatch):
+    monkeypatch.setattr(auth, "APP_TZ_OFFSET_HOURS", 8)
+    for moment in (
+        auth.datetime(2026, 3, 1, 15, 59, 59, tzinfo=auth.timezone.utc),
+        auth.datetime(2026, 3, 1, 16, 0, 0, tzinfo=auth.timezone.utc),
+        auth.datetime(1999, 12, 31, 23, 30, tzinfo=auth.timezone.utc),
+    ):
+        monkeypatch.setattr(auth.time, "time", lambda moment=moment: moment.timestamp())
+        expected = (moment + auth.timedelta(hours=8)).toordinal()
+        assert auth._local_day_ordinal() == expected
@@ -49,6 +49,44 @@ def test_guest_auth_refresh_rotates_token(monkeypatch, tmp_path):
     assert new_after.replaced_by_token_hash is None
 
 
+def test_guest_auth_keeps_device_user_id_and_reuses_recent_session(monkeypatch, tmp_path):
+    _mount_storage(monkeypatch, tmp_path)
+    monkeypatch.setattr(auth_routes, "_recent_guest_sessions", auth_routes.OrderedDict())
+    request = auth_routes.GuestAuthRequest(deviceId="device-1")
+
+    first = asyncio.run(auth_routes.create_guest_auth(request))
+    second = asyncio.run(auth_routes.create_guest_auth(request))
+    assert first.user_id == "guest_" + auth_routes.hashlib.sha256(b"device-1").hexdigest()[:24]
+    assert second.refresh_token == first.refresh_token
+
+    asyncio.run(
+        auth_routes.logout_auth_session(
+            payload=auth_routes.LogoutRequest(refresh_token=first.refresh_token),
+            current_user=CurrentUser(user_id=first.user_id),
+        )
+    )
+    third = asyncio.run(auth_routes.create_guest_auth(request))
+    assert third.user_id == first.user_id
+    assert third.refresh_token != first.refresh_token
+
+
+def test_guest_auth_reuse_window_is_bounded_and_per_device(monkeypatch, tmp_path):
+    _mount_storage(monkeypatch, tmp_path)
+    monkeypatch.setattr(auth_routes, "_recent_guest_sessions", auth_routes.OrderedDict())
+    assert 0 < auth_routes.GUEST_SESSION_REUSE_SECONDS <= auth_routes.ACCESS_TOKEN_TTL_MINUTES * 60 / 2
+
+    first = asyncio.run(auth_routes.create_guest_auth(auth_routes.GuestAuthRequest(deviceId="device-1")))
+    other = asyncio.run(auth_routes.create_guest_auth(auth_routes.GuestAuthRequest(deviceId="device-2")))
+    assert other.user_id != first.user_id
+    assert other.access_token != first.access_token
+
+    refreshed = asyncio.run(
+        auth_routes.refresh_auth_session(auth_routes.RefreshTokenRequest(refresh_token=first.refresh_token))
+    )
+    again = asyncio.run(auth_routes.create_guest_auth(auth_routes.GuestAuthRequest(deviceId="device-1")))
+    assert again.refresh_token not in {first.refresh_token, refreshed.refresh_token}
+
+
 def test_logout_revokes_given_refresh_token(monkeypatch, tmp_path):
     storage = _mount_storage(monkeypatch, tmp_path)
     auth = asyncio.run(auth_routes.create_guest_auth())
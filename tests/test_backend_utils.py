@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from backend import utils
+
+
+def test_build_r2_storage_reuses_instance_per_config(monkeypatch) -> None:
+    utils._cached_r2_storage.cache_clear()
+    monkeypatch.setenv("R2_ENABLED", "false")
+    monkeypatch.setenv("R2_KEY_PREFIX", "patent")
+
+    first = utils._build_r2_storage()
+    assert utils._build_r2_storage() is first
+    assert first.enabled is False
+
+    monkeypatch.setenv("R2_KEY_PREFIX", "workspace")
+    second = utils._build_r2_storage()
+    assert second is not first
+    assert second.config.key_prefix == "workspace"
+    utils._cached_r2_storage.cache_clear()
+
+
+def test_attachment_content_disposition_encodes_utf8_filename() -> None:
+    header = utils._attachment_content_disposition("AI 分析报告_CN1A.pdf")
+
+    assert header == "attachment; filename*=UTF-8''AI%20%E5%88%86%E6%9E%90%E6%8A%A5%E5%91%8A_CN1A.pdf"
+    assert utils._attachment_content_disposition("AI 分析报告_CN1A.pdf") is header
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import base64
+import json
+
+import pytest
+
+from backend.storage.checkpoint_codec import decode_typed_value, encode_typed_value
+
+
+def test_encode_typed_value_matches_json_dumps_layout() -> None:
+    for kind, payload in (("msgpack", bytes(range(256)) * 3), ("类型\"x", b""), ("json", b"{}")):
+        expected = json.dumps({"type": kind, "data": base64.b64encode(payload).decode("ascii")}, ensure_ascii=False)
+        encoded = encode_typed_value((kind, payload))
+
+        assert encoded == expected
+        assert decode_typed_value(encoded) == (kind, payload)
+
+
+def test_decode_typed_value_accepts_tuples_and_rejects_non_strings() -> None:
+    assert decode_typed_value(("bytes", bytearray(b"ab"))) == ("bytes", b"ab")
+    with pytest.raises(ValueError):
+        decode_typed_value(b"{}")
+    with pytest.raises(ValueError):
+        decode_typed_value('{"type": "x", "data": "数据"}')
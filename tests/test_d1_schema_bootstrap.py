@@ -4,7 +4,7 @@ import requests
 import pytest
 
 from backend.storage import D1TaskStorage
-from backend.storage.errors import StorageRateLimitedError, StorageUnavailableError
+from backend.storage.errors import StorageError, StorageRateLimitedError, StorageUnavailableError
 from backend.storage.schema.ddl_utils import relax_column_ddl_for_add_column
 
 
@@ -22,19 +22,19 @@ def test_d1_init_database_skips_full_bootstrap_when_schema_version_matches(monke
     storage = object.__new__(D1TaskStorage)
     calls: list[tuple[str, str | None]] = []
 
-    def _ensure_schema_meta_table():
-        calls.append(("ensure", None))
+    def _request_batch(statements):
+        calls.append(("batch", len(statements)))
+        return [{"results": []}, {"results": [{"value": "schema-v1"}]}]
 
-    monkeypatch.setattr(storage, "_ensure_schema_meta_table", _ensure_schema_meta_table)
+    monkeypatch.setattr(storage, "_request_batch", _request_batch)
     monkeypatch.setattr(storage, "_schema_bootstrap_version", lambda: "schema-v1")
-    monkeypatch.setattr(storage, "_get_schema_meta_value", lambda key: "schema-v1")
     monkeypatch.setattr(storage, "_request", lambda sql, params=None: calls.append(("request", sql)))
     monkeypatch.setattr(storage, "_get_existing_columns", lambda table: set())
     monkeypatch.setattr(storage, "_set_schema_meta_value", lambda key, value: calls.append(("set", value)))
 
     storage._init_database()
 
-    assert calls == [("ensure", None)]
+    assert calls == [("batch", 2)]
 
 
 def test_d1_init_database_adds_missing_columns_before_indexes(monkeypatch):
@@ -52,23 +52,26 @@ def test_d1_init_database_adds_missing_columns_before_indexes(monkeypatch):
         if name != "canonical_id"
     }
 
-    monkeypatch.setattr(storage, "_ensure_schema_meta_table", lambda: None)
     monkeypatch.setattr(storage, "_schema_bootstrap_version", lambda: "schema-v2")
-    monkeypatch.setattr(storage, "_get_schema_meta_value", lambda key: None)
+    monkeypatch.setattr(storage, "_load_schema_meta_value", lambda key: None)
     monkeypatch.setattr(
         storage,
-        "_get_existing_columns",
-        lambda table: set(existing_columns.get(table, set())),
+        "_get_existing_columns_batch",
+        lambda tables: {table: set(existing_columns.get(table, set())) for table in tables},
     )
+    batches: list[list[str]] = []
 
     def _request(sql, params=None):
         request_calls.append(str(sql).strip())
-        normalized = " ".join(str(sql).split())
-        if normalized.startswith("ALTER TABLE ai_search_documents ADD COLUMN canonical_id TEXT"):
-            existing_columns["ai_search_documents"].add("canonical_id")
         return {}
 
+    def _request_batch(statements):
+        batches.append([str(sql).strip() for sql in statements])
+        request_calls.extend(batches[-1])
+        return [{} for _ in statements]
+
     monkeypatch.setattr(storage, "_request", _request)
+    monkeypatch.setattr(storage, "_request_batch", _request_batch)
     monkeypatch.setattr(storage, "_set_schema_meta_value", lambda key, value: schema_updates.append((key, value)))
 
     storage._init_database()
@@ -79,6 +82,8 @@ def test_d1_init_database_adds_missing_columns_before_indexes(monkeypatch):
     assert alter_sql in request_calls
     assert index_sql in request_calls
     assert request_calls.index(alter_sql) < request_calls.index(index_sql)
+    assert len(batches) == 2
+    assert alter_sql in batches[1] and index_sql in batches[1]
     assert schema_updates == [(D1TaskStorage.SCHEMA_META_KEY, "schema-v2")]
 
 
@@ -99,7 +104,7 @@ def test_d1_request_wraps_rate_limit_as_storage_rate_limited(monkeypatch):
     def _raise_http_error(*args, **kwargs):
         raise requests.exceptions.HTTPError(response=response)
 
-    monkeypatch.setattr(requests, "post", _raise_http_error)
+    monkeypatch.setattr(requests.Session, "post", _raise_http_error)
 
     with pytest.raises(StorageRateLimitedError) as exc_info:
         storage._request("SELECT 1")
@@ -116,7 +121,7 @@ def test_d1_request_wraps_timeout_as_storage_unavailable(monkeypatch):
     storage.retry_base_delay_seconds = 0.5
     storage.retry_max_delay_seconds = 4.0
 
-    monkeypatch.setattr(requests, "post", lambda *args, **kwargs: (_ for _ in ()).throw(requests.exceptions.ReadTimeout("timed out")))
+    monkeypatch.setattr(requests.Session, "post", lambda *args, **kwargs: (_ for _ in ()).throw(requests.exceptions.ReadTimeout("timed out")))
 
     with pytest.raises(StorageUnavailableError):
         storage._request("SELECT 1")
@@ -149,7 +154,7 @@ def test_d1_request_retries_rate_limit_then_succeeds(monkeypatch):
             return response_429
         return response_ok
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(requests.Session, "post", fake_post)
     monkeypatch.setattr("backend.storage.backends.d1_backend.time.sleep", lambda _seconds: None)
 
     result = storage._request("SELECT 1")
@@ -173,7 +178,7 @@ def test_d1_request_does_not_retry_generic_request_exception(monkeypatch):
         calls["count"] += 1
         raise requests.exceptions.RequestException("generic failure")
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(requests.Session, "post", fake_post)
     monkeypatch.setattr("backend.storage.backends.d1_backend.time.sleep", lambda _seconds: None)
 
     with pytest.raises(StorageUnavailableError) as exc_info:
@@ -181,3 +186,93 @@ def test_d1_request_does_not_retry_generic_request_exception(monkeypatch):
 
     assert str(exc_info.value) == "D1 request failed"
     assert calls["count"] == 1
+
+
+def test_d1_request_batch_posts_statements_once_and_checks_each_result(monkeypatch):
+    storage = object.__new__(D1TaskStorage)
+    storage.endpoint = "https://api.cloudflare.com/client/v4/accounts/test/d1/database/test/query"
+    storage.headers = {"Authorization": "Bearer test"}
+    storage.timeout_seconds = 20
+    storage.max_retries = 0
+    storage.retry_base_delay_seconds = 0.5
+    storage.retry_max_delay_seconds = 4.0
+
+    payloads: list[dict] = []
+    response_ok = requests.Response()
+    response_ok.status_code = 200
+    response_ok._content = (
+        b'{"success":true,"result":[{"success":true,"results":[{"name":"id"}]},'
+        b'{"success":true,"results":[{"name":"pn"},{"name":"sha256"}]}]}'
+    )
+    response_ok.url = storage.endpoint
+
+    def fake_post(*args, **kwargs):
+        payloads.append(kwargs["json"])
+        return response_ok
+
+    monkeypatch.setattr(requests.Session, "post", fake_post)
+
+    columns = storage._get_existing_columns_batch(["tasks", "patent_analyses"])
+
+    assert payloads == [{"sql": "PRAGMA table_info(tasks);\nPRAGMA table_info(patent_analyses)"}]
+    assert columns == {"tasks": {"id"}, "patent_analyses": {"pn", "sha256"}}
+    with pytest.raises(StorageError):
+        storage._request_batch(["SELECT 1"])
+    assert storage._request_batch([" ", ""]) == []
+
+
+def test_d1_requests_reuse_one_pooled_session(monkeypatch):
+    storage = object.__new__(D1TaskStorage)
+    storage.endpoint = "https://api.cloudflare.com/client/v4/accounts/test/d1/database/test/query"
+    storage.headers = {"Authorization": "Bearer test"}
+    storage.timeout_seconds = 20
+    storage.max_retries = 0
+    storage.retry_base_delay_seconds = 0.5
+    storage.retry_max_delay_seconds = 4.0
+
+    response_ok = requests.Response()
+    response_ok.status_code = 200
+    response_ok._content = b'{"success":true,"result":[{"success":true,"results":[]}]}'
+    response_ok.url = storage.endpoint
+    sessions: list[requests.Session] = []
+
+    def fake_post(self, *args, **kwargs):
+        sessions.append(self)
+        assert "headers" not in kwargs
+        return response_ok
+
+    monkeypatch.setattr(requests.Session, "post", fake_post)
+
+    storage._request("SELECT 1")
+    storage._request("SELECT 2")
+
+    assert len(sessions) == 2 and sessions[0] is sessions[1]
+    assert sessions[0].headers["Authorization"] == "Bearer test"
+    assert sessions[0].get_adapter(storage.endpoint)._pool_maxsize == 16
+
+
+def test_d1_schema_meta_lookup_creates_table_and_reads_version_in_one_query(monkeypatch):
+    storage = object.__new__(D1TaskStorage)
+    storage.endpoint = "https://api.cloudflare.com/client/v4/accounts/test/d1/database/test/query"
+    storage.headers = {"Authorization": "Bearer test"}
+    storage.timeout_seconds = 20
+    storage.max_retries = 0
+    storage.retry_base_delay_seconds = 0.5
+    storage.retry_max_delay_seconds = 4.0
+
+    payloads: list[dict] = []
+    response_ok = requests.Response()
+    response_ok.status_code = 200
+    response_ok._content = b'{"success":true,"result":[{"success":true,"results":[]},{"success":true,"results":[{"value":" v3 "}]}]}'
+    response_ok.url = storage.endpoint
+
+    def fake_post(self, *args, **kwargs):
+        payloads.append(kwargs["json"])
+        return response_ok
+
+    monkeypatch.setattr(requests.Session, "post", fake_post)
+
+    assert storage._load_schema_meta_value(D1TaskStorage.SCHEMA_META_KEY) == "v3"
+    assert len(payloads) == 1
+    assert payloads[0]["sql"].startswith("CREATE TABLE IF NOT EXISTS _schema_meta")
+    assert f"WHERE key = '{D1TaskStorage.SCHEMA_META_KEY}'" in payloads[0]["sql"]
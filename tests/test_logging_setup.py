@@ -30,3 +30,19 @@ def _make_access_record(path: str, status_code: int) -> logging.LogRecord:
 def test_should_suppress_uvicorn_access_log(path: str, status_code: int, expected: bool):
     record = _make_access_record(path, status_code)
     assert should_suppress_uvicorn_access_log(record) is expected
+
+
+def test_enqueued_file_sink_writes_from_background_thread(tmp_path):
+    from loguru import logger
+
+    from backend.logging_setup import add_loguru_file_sink
+
+    log_file = tmp_path / "app.log"
+    handler_id = add_loguru_file_sink(str(log_file), level="INFO", fmt="{message}", enqueue=True)
+    try:
+        logger.info("任务进度 {}", 42)
+        logger.complete()
+    finally:
+        logger.remove(handler_id)
+
+    assert log_file.read_text(encoding="utf-8").strip() == "任务进度 42"
@@ -48,3 +48,95 @@ def test_importing_main_and_entering_lifespan_does_not_initialize_storage(monkey
     assert isinstance(configured[0], LazySystemLogStorageProxy)
 
     pipeline_adapter._lazy_pipeline_manager._manager = None
+
+
+def test_main_app_gzips_large_json_but_not_event_streams():
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+    from fastapi.testclient import TestClient
+
+    from backend.utils import DownloadAwareGZipMiddleware
+
+    main_module = importlib.import_module("backend.main")
+    gzip_options = [item.kwargs for item in main_module.app.user_middleware if item.cls is DownloadAwareGZipMiddleware]
+    assert gzip_options == [{"minimum_size": 1024}]
+
+    app = FastAPI()
+    app.add_middleware(DownloadAwareGZipMiddleware, **gzip_options[0])
+
+    @app.get("/large")
+    async def _large():
+        return {"step": "正在分析，请稍候" * 200}
+
+    @app.get("/events")
+    async def _events():
+        async def _iter():
+            yield b"data: " + ("正在分析，请稍候" * 200).encode("utf-8") + b"\n\n"
+
+        return StreamingResponse(_iter(), media_type="text/event-stream")
+
+    client = TestClient(app)
+    assert client.get("/large", headers={"Accept-Encoding": "gzip"}).headers.get("content-encoding") == "gzip"
+    assert client.get("/events", headers={"Accept-Encoding": "gzip"}).headers.get("content-encoding") is None
+
+
+
+def test_main_app_does_not_gzip_pdf_or_attachment_downloads(tmp_path):
+    from fastapi import FastAPI
+    from fastapi.responses import Response, StreamingResponse
+    from fastapi.testclient import TestClient
+
+    from backend.utils import DownloadAwareGZipMiddleware, ReportFileResponse, _attachment_content_disposition
+
+    pdf_path = tmp_path / "report.pdf"
+    pdf_path.write_bytes(b"%PDF-1.7\n" + b"0" * 8192)
+
+    app = FastAPI()
+    app.add_middleware(DownloadAwareGZipMiddleware, minimum_size=1024)
+
+    @app.get("/report.pdf")
+    async def _report():
+        return ReportFileResponse(path=str(pdf_path), filename="报告.pdf", media_type="application/pdf")
+
+    @app.get("/r2.pdf")
+    async def _r2_report():
+        return StreamingResponse(iter([pdf_path.read_bytes()]), media_type="application/pdf")
+
+    @app.get("/export.csv")
+    async def _export():
+        return Response(
+            content=b"a,b\n" * 2048,
+            media_type="text/csv",
+            headers={"Content-Disposition": _attachment_content_disposition("导出.csv")},
+        )
+
+    client = TestClient(app)
+    response = client.get("/report.pdf", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == str(pdf_path.stat().st_size)
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.content == pdf_path.read_bytes()
+
+    ranged = client.get("/report.pdf", headers={"Accept-Encoding": "gzip", "Range": "bytes=0-7"})
+    assert ranged.status_code == 206 and ranged.content == b"%PDF-1.7"
+    assert "content-encoding" not in client.get("/r2.pdf", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/export.csv", headers={"Accept-Encoding": "gzip"}).headers
+
+def test_main_app_answers_cors_preflight_outermost_with_max_age():
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.testclient import TestClient
+
+    main_module = importlib.import_module("backend.main")
+    assert main_module.app.user_middleware[0].cls is CORSMiddleware
+
+    response = TestClient(main_module.app).options(
+        "/api/tasks",
+        headers={
+            "Origin": "https://app.example.com",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "authorization",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["access-control-max-age"] == str(main_module.settings.CORS_MAX_AGE_SECONDS)
@@ -126,6 +126,17 @@ def test_emit_system_log_applies_policy_filter(tmp_path, monkeypatch):
     assert [row["event_name"] for row in storage.rows] == ["llm_ok", "post_ok", "task_fail"]
 
 
+def test_emit_system_log_skips_record_building_for_filtered_events(monkeypatch):
+    def _fail(*args, **kwargs):
+        raise AssertionError("filtered events must not build records")
+
+    monkeypatch.setattr(system_logs, "utc_now_z", _fail)
+    monkeypatch.setattr(system_logs, "redact_sensitive", _fail)
+
+    log_id = system_logs.emit_system_log(category="task_execution", event_name="task_progress", success=True)
+    assert len(log_id) == 32
+
+
 def test_requests_instrumentation_respects_suppression_context(tmp_path, monkeypatch):
     storage = _MemoryStorage()
     monkeypatch.setattr(system_logs, "_STORAGE_REF", storage)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import json
+import threading
 from pathlib import Path
 from typing import Any, Dict
 
@@ -113,7 +114,13 @@ def test_patent_analysis_fallback_sha256_from_downloaded_pdf(monkeypatch, tmp_pa
 def test_patent_analysis_cached_reuse_triggers_completed_email(monkeypatch, tmp_path):
     manager = _mount_task_manager(monkeypatch, tmp_path)
     monkeypatch.setattr(tasks_route, "emit_system_log", lambda **kwargs: None)
-    monkeypatch.setattr(tasks_route, "_get_cached_analysis_payload", lambda **kwargs: {"metadata": {"resolved_pn": "CN123456A"}})
+    lookup_threads = []
+
+    def _fake_cached_payload(**kwargs):
+        lookup_threads.append(threading.get_ident())
+        return {"metadata": {"resolved_pn": "CN123456A"}}
+
+    monkeypatch.setattr(tasks_route, "_get_cached_analysis_payload", _fake_cached_payload)
 
     class _FakeR2Storage:
         enabled = True
@@ -148,6 +155,7 @@ def test_patent_analysis_cached_reuse_triggers_completed_email(monkeypatch, tmp_
     assert latest is not None
     assert latest.status.value == "completed"
     assert latest.metadata["output_files"]["r2_key"] == "patent/CN123456A/ai_analysis.pdf"
+    assert lookup_threads and threading.get_ident() not in lookup_threads
     assert notify_calls == [
         {
             "task_id": task.id,
@@ -189,3 +197,127 @@ def test_patent_analysis_failed_workflow_triggers_failed_email(monkeypatch, tmp_
             "error_message": "boom",
         }
     ]
+
+
+def test_save_upload_file_streams_to_disk_and_hashes_in_one_pass(monkeypatch, tmp_path):
+    from io import BytesIO
+
+    from fastapi import UploadFile
+
+    monkeypatch.setattr(tasks_route.settings, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(tasks_route, "UPLOAD_CHUNK_SIZE", 4)
+    content = b"%PDF-1.4 streamed upload body"
+    upload = UploadFile(file=BytesIO(content), filename="../source.pdf")
+
+    path, sha256 = asyncio.run(tasks_route._save_upload_file_with_sha256("task-1", upload, "patent", "source"))
+
+    assert Path(path) == tmp_path / "task-1" / "patent" / "source_source.pdf"
+    assert Path(path).read_bytes() == content
+    assert sha256 == hashlib.sha256(content).hexdigest()
+
+
+def test_build_upload_path_sanitises_file_name(monkeypatch, tmp_path):
+    monkeypatch.setattr(tasks_route.settings, "UPLOAD_DIR", tmp_path)
+
+    path = tasks_route._build_upload_path("task-1", "office_action", "response", "../答复 意见(终稿);v2.pdf")
+
+    assert path == tmp_path / "task-1" / "office_action" / "response_答复_意见_终稿_v2.pdf"
+    assert path.parent.is_dir()
+
+
+def test_cached_analysis_lookup_remembers_r2_miss(monkeypatch, tmp_path):
+    _mount_task_manager(monkeypatch, tmp_path)
+    monkeypatch.setattr(tasks_route, "_r2_miss_cache", tasks_route.OrderedDict())
+    stored: Dict[str, bytes] = {}
+    get_calls = []
+
+    class _FakeR2Storage:
+        enabled = True
+
+        def build_analysis_json_key(self, patent_number: str) -> str:
+            return f"patent/{patent_number}/ai_analysis.json"
+
+        def get_bytes(self, key: str):
+            get_calls.append(key)
+            return stored.get(key)
+
+    monkeypatch.setattr(tasks_route, "_build_r2_storage", lambda: _FakeR2Storage())
+    key = "patent/CN123456A/ai_analysis.json"
+
+    assert tasks_route._get_cached_analysis_payload(pn="CN123456A", input_sha256=None) is None
+    assert tasks_route._get_cached_analysis_payload(pn="CN123456A", input_sha256=None) is None
+    assert get_calls == [key]
+
+    stored[key] = json.dumps({"metadata": {"resolved_pn": "CN123456A"}}).encode("utf-8")
+    tasks_route._forget_r2_miss(key)
+    payload = tasks_route._get_cached_analysis_payload(pn="CN123456A", input_sha256=None)
+    assert payload == {"metadata": {"resolved_pn": "CN123456A"}}
+    assert get_calls == [key, key]
+
+
+def test_patent_analysis_completes_before_background_r2_upload(monkeypatch, tmp_path):
+    manager = _mount_task_manager(monkeypatch, tmp_path)
+    _mount_fake_workflow(monkeypatch, _build_completed_state)
+    monkeypatch.setattr(tasks_route, "emit_system_log", lambda **kwargs: None)
+    monkeypatch.setattr(tasks_route.settings, "OUTPUT_DIR", tmp_path / "output")
+    monkeypatch.setattr(tasks_route, "_get_cached_analysis_payload", lambda **kwargs: None)
+
+    async def _fake_notify(task_id: str, terminal_status: str, **kwargs):
+        return None
+
+    monkeypatch.setattr(tasks_route, "_notify_task_terminal_email", _fake_notify)
+
+    class _FakeR2Storage:
+        enabled = True
+
+        def __init__(self):
+            self.put_keys = []
+
+        def build_patent_pdf_key(self, patent_number: str) -> str:
+            return f"patent/{patent_number}/ai_analysis.pdf"
+
+        def build_analysis_json_key(self, patent_number: str) -> str:
+            return f"patent/{patent_number}/ai_analysis.json"
+
+        def build_patent_json_key(self, patent_number: str) -> str:
+            return f"patent/{patent_number}/patent.json"
+
+        def put_file(self, key: str, file_path: str, content_type: str = "application/octet-stream") -> bool:
+            self.put_keys.append(key)
+            return True
+
+        def put_bytes(self, key: str, content: bytes, content_type: str = "application/octet-stream") -> bool:
+            self.put_keys.append(key)
+            return True
+
+    fake_r2 = _FakeR2Storage()
+    monkeypatch.setattr(tasks_route, "_build_r2_storage", lambda: fake_r2)
+
+    task = manager.create_task(
+        owner_id="authing:user-1",
+        task_type=TaskType.PATENT_ANALYSIS.value,
+        pn="CN123456A",
+        title="AI 分析任务 - 测试",
+    )
+
+    async def scenario():
+        await tasks_route.run_patent_analysis_task(task.id, pn="CN123456A")
+        completed = manager.get_task(task.id)
+        uploads = list(tasks_route._BACKGROUND_R2_UPLOADS)
+        await asyncio.gather(*uploads)
+        return completed
+
+    completed = asyncio.run(scenario())
+    assert completed.status.value == "completed"
+    assert "r2_key" not in completed.metadata.get("output_files", {})
+
+    output_files = manager.get_task(task.id).metadata.get("output_files", {})
+    assert output_files["r2_key"] == "patent/CN123456A/ai_analysis.pdf"
+    assert output_files["analysis_r2_key"] == "patent/CN123456A/ai_analysis.json"
+    assert output_files["patent_r2_key"] == "patent/CN123456A/patent.json"
+    assert output_files["pdf"].endswith("final_report.pdf")
+    assert set(fake_r2.put_keys) == {
+        "patent/CN123456A/ai_analysis.pdf",
+        "patent/CN123456A/ai_analysis.json",
+        "patent/CN123456A/patent.json",
+    }
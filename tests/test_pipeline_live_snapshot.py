@@ -0,0 +1,55 @@
+from backend.storage import SQLiteTaskStorage
+from backend.storage.models import TaskStatus
+from backend.storage.pipeline_adapter import PipelineTaskManager
+
+
+class _CountingStorage(SQLiteTaskStorage):
+    snapshot_reads = 0
+
+    def get_task_snapshot(self, task_id):
+        self.snapshot_reads += 1
+        return super().get_task_snapshot(task_id)
+
+
+def test_task_snapshot_is_served_from_memory_until_written(tmp_path) -> None:
+    storage = _CountingStorage(tmp_path / "live_snapshot.db")
+    manager = PipelineTaskManager(storage=storage)
+    task = manager.create_task(owner_id="user-1")
+
+    first = manager.get_task_snapshot(task.id)
+    first.metadata["dirty"] = True
+    second = manager.get_task_snapshot(task.id)
+    assert storage.snapshot_reads == 1
+    assert "dirty" not in second.metadata
+
+    manager.update_progress(task.id, 40, "正在解析文档")
+    updated = manager.get_task_snapshot(task.id)
+    assert storage.snapshot_reads == 2
+    assert updated.progress == 40
+    assert updated.current_step == "正在解析文档"
+
+    manager.complete_task(task.id)
+    assert manager.get_task_snapshot(task.id).status == TaskStatus.COMPLETED
+    assert storage.snapshot_reads == 3
+
+
+def test_task_snapshot_cache_is_scoped_to_storage(tmp_path) -> None:
+    storage_a = SQLiteTaskStorage(tmp_path / "a.db")
+    storage_b = SQLiteTaskStorage(tmp_path / "b.db")
+    manager_a = PipelineTaskManager(storage=storage_a)
+    manager_b = PipelineTaskManager(storage=storage_b)
+    task = manager_a.create_task(owner_id="user-1")
+
+    assert manager_a.get_task_snapshot(task.id) is not None
+    assert manager_b.get_task_snapshot(task.id) is None
+
+
+def test_created_task_ids_keep_eight_hex_chars(tmp_path) -> None:
+    import re
+
+    manager = PipelineTaskManager(storage=SQLiteTaskStorage(tmp_path / "task_ids.db"))
+    task = manager.create_task(owner_id="user-1", task_type="ai_reply")
+
+    assert re.fullmatch(r"[0-9a-f]{8}", task.id)
+    assert task.title == f"AI 答复任务 - {task.id}"
+
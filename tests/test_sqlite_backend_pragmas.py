@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import threading
+
+from backend.storage import SQLiteTaskStorage
+
+
+def test_sqlite_storage_uses_wal_and_busy_timeout_per_thread(tmp_path) -> None:
+    storage = SQLiteTaskStorage(tmp_path / "pragmas.db")
+    results = {}
+
+    def read_pragmas(label: str) -> None:
+        conn = storage._get_connection()
+        results[label] = (
+            conn.execute("PRAGMA journal_mode").fetchone()[0],
+            conn.execute("PRAGMA busy_timeout").fetchone()[0],
+            conn.execute("PRAGMA synchronous").fetchone()[0],
+            conn.execute("PRAGMA temp_store").fetchone()[0],
+            conn.execute("PRAGMA cache_size").fetchone()[0],
+        )
+
+    read_pragmas("main")
+    worker = threading.Thread(target=read_pragmas, args=("worker",))
+    worker.start()
+    worker.join()
+
+    assert results["main"] == ("wal", 5000, 1, 2, -64 * 1024)
+    assert results["worker"] == results["main"]
+
+
+def test_request_returns_plain_dicts_without_row_objects(tmp_path) -> None:
+    import sqlite3
+
+    storage = SQLiteTaskStorage(tmp_path / "plain_rows.db")
+    storage.create_task(storage._row_to_task({"id": "t-1", "status": "pending", "created_at": "2026-03-01T08:00:00Z", "updated_at": "2026-03-01T08:00:00Z"}))
+
+    rows = storage._fetchall("SELECT id, status FROM tasks WHERE id = ?", ["t-1"])
+    assert rows == [{"id": "t-1", "status": "pending"}]
+    assert type(rows[0]) is dict
+    assert storage._fetchone("SELECT id FROM tasks WHERE id = ?", ["missing"]) is None
+    assert isinstance(storage._get_connection().execute("SELECT 1 AS one").fetchone(), sqlite3.Row)
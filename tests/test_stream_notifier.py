@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from backend.stream_notifier import StreamNotifier
+
+
+def test_stream_notifier_wakes_subscriber_from_worker_thread() -> None:
+    notifier = StreamNotifier()
+
+    async def scenario() -> tuple[bool, bool]:
+        with notifier.subscribe("task-1") as subscription:
+            threading.Timer(0.05, notifier.notify, args=("task-1",)).start()
+            woke = await subscription.wait(2)
+            timed_out = not await subscription.wait(0.05)
+        return woke, timed_out
+
+    assert asyncio.run(scenario()) == (True, True)
+    assert notifier._waiters == {}
+
+
+def test_stream_notifier_keeps_signal_sent_before_wait() -> None:
+    notifier = StreamNotifier()
+
+    async def scenario() -> bool:
+        with notifier.subscribe("task-1") as subscription:
+            notifier.notify("task-2")
+            notifier.notify("task-1")
+            await asyncio.sleep(0)
+            return await subscription.wait(0.5)
+
+    assert asyncio.run(scenario()) is True
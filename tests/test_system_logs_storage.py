@@ -155,6 +155,20 @@ def test_system_logs_policy_cleanup_queries_and_delete(tmp_path):
     assert remaining_ids == {"log-llm-ok", "log-user-post-ok", "log-task-failed"}
 
 
+def test_purge_system_logs_by_policy_returns_deleted_payload_paths(tmp_path):
+    storage = SQLiteTaskStorage(tmp_path / "system_logs_purge.db")
+    now_iso = datetime.now().isoformat()
+    payload = tmp_path / "payload.json.gz"
+    _insert_sample(storage, "log-get", "user_action", True, now_iso, method="GET", payload_file_path=str(payload))
+    _insert_sample(storage, "log-task-ok", "task_execution", True, now_iso, method="POST")
+    _insert_sample(storage, "log-task-failed", "task_execution", False, now_iso, method="POST")
+
+    assert storage.purge_system_logs_by_policy() == (2, [str(payload)])
+    remaining = storage.list_system_logs(page=1, page_size=20)
+    assert {item["log_id"] for item in remaining["items"]} == {"log-task-failed"}
+    assert storage.purge_system_logs_by_policy() == (0, [])
+
+
 def test_emit_system_log_is_async_and_non_blocking(monkeypatch):
     appended: list[dict] = []
     inserted: list[dict] = []
@@ -190,3 +204,17 @@ def test_emit_system_log_is_async_and_non_blocking(monkeypatch):
     assert system_logs.flush_system_log_queue(timeout_seconds=2.0)
     assert len(appended) == 1
     assert len(inserted) == 1
+
+
+def test_redact_sensitive_masks_credentials_in_keys_and_text():
+    payload = {
+        "Authorization": "Bearer abc",
+        "usage": {"total_tokens": 12, "api_key": "k"},
+        "prompt": "调用 bearer abc.DEF-123 与密钥sk-ABCDEFGHIJKL12 完成，skill 不受影响",
+    }
+
+    redacted = system_logs.redact_sensitive(payload)
+
+    assert redacted["Authorization"] == system_logs.REDACTED_VALUE
+    assert redacted["usage"] == {"total_tokens": 12, "api_key": system_logs.REDACTED_VALUE}
+    assert redacted["prompt"] == f"调用 Bearer *** 与密钥{system_logs.REDACTED_VALUE} 完成，skill 不受影响"
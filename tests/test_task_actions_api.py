@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import asyncio
 import io
+import json
 from pathlib import Path
 from threading import Event
 
 import pytest
 from fastapi import HTTPException, UploadFile
 
-from backend.models import CurrentUser
+from backend.models import CurrentUser, TaskRuntime
 from backend.routes import tasks as tasks_route
 from backend.storage.pipeline_adapter import PipelineTaskManager
 from backend.storage import SQLiteTaskStorage
@@ -70,7 +71,7 @@ def test_cancel_ai_reply_task_keeps_inputs(monkeypatch, tmp_path: Path) -> None:
         },
     )
     runtime = Event()
-    tasks_route.RUNNING_TASKS[task.id] = runtime
+    tasks_route.RUNNING_TASKS[task.id] = TaskRuntime(cancel_event=runtime)
 
     response = asyncio.run(tasks_route.cancel_task(task.id, CurrentUser(user_id="authing:user-1")))
 
@@ -249,13 +250,29 @@ def test_list_tasks_hides_ai_search_sessions(monkeypatch, tmp_path: Path) -> Non
     manager.complete_task(analysis_task.id, output_files={"pdf": "dummy.pdf"})
     manager.start_task(search_task.id)
 
-    result = asyncio.run(tasks_route.list_tasks(CurrentUser(user_id="authing:user-10")))
+    response = asyncio.run(tasks_route.list_tasks(CurrentUser(user_id="authing:user-10")))
+    result = json.loads(response.body)
 
+    assert response.media_type == "application/json"
+    assert result["total"] == len(result["tasks"])
     returned_ids = {item["id"] for item in result["tasks"]}
     assert analysis_task.id in returned_ids
     assert search_task.id not in returned_ids
 
 
+def test_storage_list_tasks_excludes_types_and_projects_snapshot_columns(monkeypatch, tmp_path: Path) -> None:
+    manager = _mount_task_manager(monkeypatch, tmp_path)
+    analysis_task = manager.create_task(owner_id="authing:user-12", task_type="patent_analysis", pn="CN12", title="CN12")
+    manager.create_task(owner_id="authing:user-12", task_type="ai_search", title="AI 检索会话")
+    manager.storage.update_task(analysis_task.id, output_dir="/tmp/cn12", metadata={"search_followup_needed": True})
+
+    tasks = manager.list_tasks(owner_id="authing:user-12", exclude_task_types=["ai_search"], snapshot=True)
+
+    assert [task.id for task in tasks] == [analysis_task.id]
+    assert tasks[0].output_dir is None
+    assert tasks[0].metadata == {"search_followup_needed": True}
+
+
 def test_get_task_route_returns_snapshot_shape(monkeypatch, tmp_path: Path) -> None:
     manager = _mount_task_manager(monkeypatch, tmp_path)
     task = manager.create_task(owner_id="authing:user-11", task_type="patent_analysis", pn="CN11", title="CN11")
@@ -279,3 +296,54 @@ def test_get_task_route_returns_snapshot_shape(monkeypatch, tmp_path: Path) -> N
     assert result["error"] == "temporary"
     assert result["created_at"]
     assert result["updated_at"]
+
+
+def test_enqueue_keeps_pipeline_task_until_done(monkeypatch, tmp_path: Path) -> None:
+    manager = _mount_task_manager(monkeypatch, tmp_path)
+    task = manager.create_task(owner_id="authing:user-9", task_type="ai_reply", title="oa")
+
+    class _PendingTask:
+        def __init__(self):
+            self.callbacks = []
+
+        def add_done_callback(self, callback):
+            self.callbacks.append(callback)
+
+    pending = _PendingTask()
+
+    def _create_pending_task(coro):
+        coro.close()
+        return pending
+
+    monkeypatch.setattr(tasks_route.asyncio, "create_task", _create_pending_task)
+    tasks_route._enqueue_pipeline_task(task, input_files=[])
+
+    runtime = tasks_route.RUNNING_TASKS[task.id]
+    assert runtime.pipeline_task is pending
+    assert not runtime.cancel_event.is_set()
+
+    replacement = TaskRuntime(cancel_event=Event())
+    tasks_route.RUNNING_TASKS[task.id] = replacement
+    for callback in pending.callbacks:
+        callback(pending)
+    assert tasks_route.RUNNING_TASKS[task.id] is replacement
+
+    tasks_route.RUNNING_TASKS[task.id] = runtime
+    for callback in pending.callbacks:
+        callback(pending)
+    assert task.id not in tasks_route.RUNNING_TASKS
+
+
+def test_shutdown_cancels_running_tasks(monkeypatch, tmp_path: Path) -> None:
+    manager = _mount_task_manager(monkeypatch, tmp_path)
+    task = manager.create_task(owner_id="authing:user-11", task_type="ai_reply", title="oa")
+    manager.start_task(task.id)
+    runtime = TaskRuntime(cancel_event=Event())
+    tasks_route.RUNNING_TASKS[task.id] = runtime
+
+    assert tasks_route.cancel_running_tasks_on_shutdown() == 1
+
+    assert runtime.cancel_event.is_set()
+    refreshed = manager.get_task(task.id)
+    assert refreshed.status.value == "cancelled"
+    assert refreshed.error_message == "服务已停止，任务已中断"
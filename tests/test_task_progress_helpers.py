@@ -116,3 +116,94 @@ def test_resolve_input_sha256_falls_back_to_file_digest(tmp_path) -> None:
     source.write_bytes(b"mock patent pdf content")
     expected = hashlib.sha256(b"mock patent pdf content").hexdigest()
     assert tasks_route._resolve_input_sha256(None, str(source)) == expected
+
+
+def test_run_task_workflow_uses_dedicated_bounded_executor(monkeypatch) -> None:
+    import asyncio
+    import threading
+
+    monkeypatch.setattr(tasks_route, "_TASK_WORKFLOW_SEMAPHORE", asyncio.Semaphore(1))
+    thread_names = []
+
+    def run_workflow():
+        thread_names.append(threading.current_thread().name)
+        return {"status": "completed"}
+
+    async def scenario():
+        return await asyncio.gather(
+            tasks_route._run_task_workflow(run_workflow),
+            tasks_route._run_task_workflow(run_workflow, timeout=5),
+        )
+
+    assert asyncio.run(scenario()) == [{"status": "completed"}, {"status": "completed"}]
+    assert all(name.startswith("task-workflow") for name in thread_names)
+
+
+def test_run_task_workflow_holds_slot_until_timed_out_thread_finishes(monkeypatch) -> None:
+    import asyncio
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-workflow-test")
+    monkeypatch.setattr(tasks_route, "TASK_WORKFLOW_EXECUTOR", executor)
+    monkeypatch.setattr(tasks_route, "_TASK_WORKFLOW_SEMAPHORE", asyncio.Semaphore(1))
+    release = threading.Event()
+
+    async def scenario():
+        try:
+            await tasks_route._run_task_workflow(lambda: release.wait(5), timeout=0.05)
+        except asyncio.TimeoutError:
+            pass
+        # 超时只停止等待，线程仍在运行，名额不应提前归还
+        assert tasks_route._TASK_WORKFLOW_SEMAPHORE.locked()
+        follower = asyncio.create_task(tasks_route._run_task_workflow(lambda: {"status": "completed"}, timeout=0.5))
+        await asyncio.sleep(0.1)
+        assert not follower.done()
+        release.set()
+        return await follower
+
+    try:
+        assert asyncio.run(scenario()) == {"status": "completed"}
+    finally:
+        release.set()
+        executor.shutdown(wait=True)
+
+
+def test_clamp_reported_progress_never_goes_backwards() -> None:
+    assert tasks_route._clamp_reported_progress(50, -1) == 50
+    assert tasks_route._clamp_reported_progress(56, 65) == 65
+    assert tasks_route._clamp_reported_progress(98, 65) == 95
+    assert tasks_route._clamp_reported_progress(-3, -1) == 0
+
+
+def test_pipeline_get_task_is_cached_and_invalidated_by_writes(tmp_path, monkeypatch) -> None:
+    from backend.storage import SQLiteTaskStorage, pipeline_adapter
+    from backend.storage.pipeline_adapter import PipelineTaskManager
+
+    class _CountingStorage(SQLiteTaskStorage):
+        reads = 0
+
+        def get_task(self, task_id):
+            self.reads += 1
+            return super().get_task(task_id)
+
+    monkeypatch.setattr(pipeline_adapter, "_live_tasks", pipeline_adapter.OrderedDict())
+    storage = _CountingStorage(tmp_path / "live_task.db")
+    manager = PipelineTaskManager(storage)
+    task = manager.create_task(owner_id="user-1")
+
+    first = manager.get_task(task.id)
+    first.metadata["mutated"] = True
+    second = manager.get_task(task.id)
+    assert storage.reads == 1
+    assert "mutated" not in (second.metadata or {})
+
+    storage.update_task(task.id, title="renamed")
+    assert manager.get_task(task.id).title == "renamed"
+    assert storage.reads == 2
+
+    manager.invalidate_task(task.id)
+    monkeypatch.setattr(pipeline_adapter, "LIVE_TASK_TTL_SECONDS", 0.0)
+    manager.get_task(task.id)
+    manager.get_task(task.id)
+    assert storage.reads == 4
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+from backend.storage import SQLiteTaskStorage
+
+
+def test_count_tasks_by_status_folds_today_count_into_one_query(tmp_path, monkeypatch) -> None:
+    from backend.storage.models import TaskStatus
+    from backend.storage.pipeline_adapter import PipelineTaskManager
+
+    storage = SQLiteTaskStorage(tmp_path / "counts.db")
+    manager = PipelineTaskManager(storage=storage)
+    first = manager.create_task(owner_id="user-1")
+    manager.create_task(owner_id="user-1")
+    manager.complete_task(first.id)
+    storage._request("UPDATE tasks SET created_at = ? WHERE id = ?", ["2000-01-01T00:00:00Z", first.id])
+
+    counts = storage.count_tasks_by_status()
+    assert counts == {
+        TaskStatus.COMPLETED.value: {"total": 1, "today": 0},
+        TaskStatus.PENDING.value: {"total": 1, "today": 1},
+    }
+    storage.record_patent_analysis("CN1")
+    query_calls: list[str] = []
+    original_fetchall = storage._fetchall
+    monkeypatch.setattr(storage, "_fetchall", lambda sql, params=None: query_calls.append(sql) or original_fetchall(sql, params))
+    monkeypatch.setattr(storage, "_fetchone", lambda sql, params=None: query_calls.append(sql))
+    statistics = storage.get_statistics()
+    assert statistics["by_status"] == {"completed": 1, "pending": 1}
+    assert statistics["today_created"] == 1
+    assert statistics["completed_patents"] == 1
+    assert statistics["avg_duration_minutes"] is not None
+    assert len(query_calls) == 1
+
+    empty = SQLiteTaskStorage(tmp_path / "empty.db")
+    assert empty.get_statistics() == {
+        "by_status": {},
+        "today_created": 0,
+        "avg_duration_minutes": None,
+        "completed_patents": 0,
+    }
+
+
+def test_list_tasks_filters_task_type_in_sql(tmp_path) -> None:
+    from backend.storage.models import TaskType
+    from backend.storage.pipeline_adapter import PipelineTaskManager
+
+    manager = PipelineTaskManager(storage=SQLiteTaskStorage(tmp_path / "task_type_filter.db"))
+    search = manager.create_task(owner_id="user-1", task_type=TaskType.AI_SEARCH.value)
+    for _ in range(3):
+        manager.create_task(owner_id="user-1")
+    manager.create_task(owner_id="user-2", task_type=TaskType.AI_SEARCH.value)
+
+    tasks = manager.list_tasks(owner_id="user-1", limit=1, task_type=TaskType.AI_SEARCH.value)
+    assert [task.id for task in tasks] == [search.id]
+
+
+def test_list_admin_tasks_reads_total_from_page_query(tmp_path, monkeypatch) -> None:
+    from backend.storage.pipeline_adapter import PipelineTaskManager
+
+    storage = SQLiteTaskStorage(tmp_path / "admin_tasks.db")
+    manager = PipelineTaskManager(storage=storage)
+    for _ in range(3):
+        manager.create_task(owner_id="user-1")
+
+    fetchone_calls: list[str] = []
+    original_fetchone = storage._fetchone
+    monkeypatch.setattr(storage, "_fetchone", lambda sql, params=None: fetchone_calls.append(sql) or original_fetchone(sql, params))
+
+    first_page = storage.list_admin_tasks(page=1, page_size=2)
+    assert first_page["total"] == 3
+    assert len(first_page["items"]) == 2
+    assert "total_count" not in first_page["items"][0]
+    assert fetchone_calls == []
+
+    beyond = storage.list_admin_tasks(page=5, page_size=2)
+    assert beyond == {"total": 3, "items": []}
+    assert len(fetchone_calls) == 1
+    assert storage.list_admin_tasks(q="missing") == {"total": 0, "items": []}
+
+
+def test_cleanup_old_tasks_counts_and_deletes_by_predicate(tmp_path, monkeypatch) -> None:
+    from backend.storage.pipeline_adapter import PipelineTaskManager
+
+    storage = SQLiteTaskStorage(tmp_path / "cleanup.db")
+    manager = PipelineTaskManager(storage=storage)
+    old_completed = manager.create_task(owner_id="user-1")
+    old_deleted = manager.create_task(owner_id="user-1")
+    recent = manager.create_task(owner_id="user-1")
+    manager.complete_task(old_completed.id)
+    storage.delete_task(old_deleted.id)
+    storage._request("UPDATE tasks SET updated_at = ? WHERE id = ?", ["2000-01-01T00:00:00Z", old_completed.id])
+    storage._request("UPDATE tasks SET deleted_at = ? WHERE id = ?", ["2000-01-01T00:00:00Z", old_deleted.id])
+
+    assert storage.cleanup_old_tasks(days=30, dry_run=True) == 2
+    monkeypatch.setattr(storage, "_fetchall", lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("no id scan")))
+    assert storage.cleanup_old_tasks(days=30) == 2
+    monkeypatch.undo()
+    assert storage.get_task(recent.id) is not None
+    assert storage.get_task(old_completed.id) is None
+    assert storage.get_task(old_deleted.id) is None
+
+
+def test_task_metadata_codec_is_compact_and_round_trips(tmp_path) -> None:
+    from backend.storage.codecs import StorageCodecsMixin
+    from backend.storage.models import Task
+
+    assert not hasattr(Task(id="t1"), "__dict__")
+    encoded = StorageCodecsMixin._encode_metadata({"标题": "专利", 1: [1, 2]})
+    assert encoded == '{"标题":"专利","1":[1,2]}'
+    assert StorageCodecsMixin._parse_metadata(encoded) == {"标题": "专利", "1": [1, 2]}
+    assert StorageCodecsMixin._parse_metadata('{"score": NaN}')["score"] != 0
+    assert StorageCodecsMixin._parse_metadata("not json") == {}
+
+    storage = SQLiteTaskStorage(tmp_path / "metadata.db")
+    task = storage.create_task(Task(id="t1", metadata={"pn": "CN1", "备注": "中文"}))
+    assert storage.get_task(task.id).metadata == {"pn": "CN1", "备注": "中文"}
+
+
+def test_task_metadata_codec_matches_stdlib_for_nan_and_datetime() -> None:
+    import math
+    from datetime import datetime
+
+    import pytest
+
+    from backend.storage.codecs import StorageCodecsMixin
+
+    encoded = StorageCodecsMixin._encode_metadata({"score": float("nan"), "note": None, "items": [float("inf")]})
+    assert encoded == '{"score":NaN,"note":null,"items":[Infinity]}'
+    assert math.isnan(StorageCodecsMixin._parse_metadata(encoded)["score"])
+    assert StorageCodecsMixin._encode_metadata({"note": None}) == '{"note":null}'
+
+    with pytest.raises(TypeError):
+        StorageCodecsMixin._encode_metadata({"created_at": datetime(2024, 1, 1)})
+
+
+def test_delete_tasks_soft_deletes_in_bounded_batches(tmp_path, monkeypatch) -> None:
+    from backend.storage.pipeline_adapter import PipelineTaskManager
+
+    storage = SQLiteTaskStorage(tmp_path / "bulk_delete.db")
+    manager = PipelineTaskManager(storage=storage)
+    task_ids = [manager.create_task(owner_id="user-1").id for _ in range(5)]
+    storage.delete_task(task_ids[0])
+
+    monkeypatch.setattr(storage, "TASK_BULK_DELETE_BATCH_SIZE", 2)
+    updates: list[int] = []
+    original_request = storage._request
+    monkeypatch.setattr(
+        storage,
+        "_request",
+        lambda sql, params=None: (updates.append(len(params or [])) if sql.startswith("UPDATE") else None)
+        or original_request(sql, params),
+    )
+
+    assert manager.delete_tasks(task_ids + [task_ids[1]]) == 4
+    assert updates == [4, 4, 3]
+    assert manager.list_tasks(owner_id="user-1") == []
+    assert manager.delete_tasks([]) == 0
+
+
+def test_delete_task_uses_one_timestamp_for_deleted_and_updated(tmp_path) -> None:
+    from backend.storage.pipeline_adapter import PipelineTaskManager
+
+    storage = SQLiteTaskStorage(tmp_path / "delete_ts.db")
+    task = PipelineTaskManager(storage=storage).create_task(owner_id="user-1")
+
+    assert storage.delete_task(task.id) is True
+    row = storage._fetchone("SELECT deleted_at, updated_at FROM tasks WHERE id = ?", [task.id])
+    assert row["deleted_at"] == row["updated_at"]
+    assert storage.delete_task(task.id) is False
+
+
+def test_update_task_reuses_cached_sql_per_field_set(tmp_path) -> None:
+    from backend.storage.pipeline_adapter import PipelineTaskManager
+    from backend.storage.repositories import tasks as task_repository
+
+    storage = SQLiteTaskStorage(tmp_path / "update_sql.db")
+    task = PipelineTaskManager(storage=storage).create_task(owner_id="user-1")
+    task_repository._update_task_sql.cache_clear()
+
+    assert storage.update_task(task.id, title="a", progress=10, unknown="ignored") is True
+    assert storage.update_task(task.id, title="b", progress=20) is True
+    assert storage.update_task(task.id, unknown="ignored") is False
+
+    info = task_repository._update_task_sql.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+    assert task_repository._update_task_sql(("title", "updated_at")) == "UPDATE tasks SET title = ?, updated_at = ? WHERE id = ?"
+    refreshed = storage.get_task(task.id)
+    assert (refreshed.title, refreshed.progress) == ("b", 20)
+
+
+def test_create_task_returns_row_read_back_via_returning(tmp_path, monkeypatch) -> None:
+    from backend.storage.models import Task
+
+    storage = SQLiteTaskStorage(tmp_path / "returning.db")
+    calls: list[str] = []
+    original_request = storage._request
+    monkeypatch.setattr(storage, "_request", lambda sql, params=None: calls.append(sql) or original_request(sql, params))
+
+    draft = Task(id="t-ret", owner_id="user-1", metadata={"k": "值"})
+    created = storage.create_task(draft)
+
+    assert len(calls) == 1 and "RETURNING *" in calls[0]
+    assert created is not draft
+    assert created.to_dict() == storage.get_task("t-ret").to_dict()
+    assert created.metadata == {"k": "值"}
+
+
+def test_iter_tasks_decodes_rows_lazily_and_matches_list_tasks(tmp_path) -> None:
+    import types
+
+    from backend.storage.pipeline_adapter import PipelineTaskManager
+
+    storage = SQLiteTaskStorage(tmp_path / "iter_tasks.db")
+    manager = PipelineTaskManager(storage=storage)
+    for _ in range(3):
+        manager.create_task(owner_id="user-1")
+
+    iterator = manager.iter_tasks(owner_id="user-1", snapshot=True)
+    assert isinstance(iterator, types.GeneratorType)
+    assert [task.id for task in iterator] == [task.id for task in manager.list_tasks(owner_id="user-1", snapshot=True)]
+
+
+def test_complete_task_and_user_profile_json_use_storage_codec(tmp_path) -> None:
+    from backend.storage.models import User
+    from backend.storage.pipeline_adapter import PipelineTaskManager
+
+    storage = SQLiteTaskStorage(tmp_path / "json_codec.db")
+    manager = PipelineTaskManager(storage=storage)
+    task = manager.create_task(owner_id="user-1", metadata={"备注": "保留"})
+    assert manager.complete_task(task.id, output_files={"pdf": "报告.pdf"}) is True
+
+    raw = storage._fetchone("SELECT metadata FROM tasks WHERE id = ?", [task.id])["metadata"]
+    assert raw == '{"备注":"保留","output_files":{"pdf":"报告.pdf"}}'
+
+    storage.upsert_authing_user(User(owner_id="authing:1", authing_sub="sub-1", raw_profile={"name": "张三"}))
+    profile = storage._fetchone("SELECT raw_profile FROM users WHERE owner_id = ?", ["authing:1"])["raw_profile"]
+    assert profile == '{"name":"张三"}'
+
+
+def test_update_task_converts_only_typed_columns(tmp_path) -> None:
+    from datetime import datetime, timezone
+
+    from backend.storage.models import TaskStatus
+    from backend.storage.pipeline_adapter import PipelineTaskManager
+
+    storage = SQLiteTaskStorage(tmp_path / "update_columns.db")
+    task = PipelineTaskManager(storage=storage).create_task(owner_id="user-1")
+
+    assert storage.update_task(
+        task.id,
+        status=TaskStatus.FAILED,
+        completed_at=datetime(2026, 3, 1, 8, tzinfo=timezone.utc),
+        metadata={"错误": "x"},
+        title="t",
+        ignored="x",
+    )
+    row = storage._fetchone("SELECT status, completed_at, metadata, title FROM tasks WHERE id = ?", [task.id])
+    assert row == {"status": "failed", "completed_at": "2026-03-01T08:00:00.000000Z", "metadata": '{"错误":"x"}', "title": "t"}
+    assert storage.update_task(task.id, ignored="x") is False
+
+
+def test_complete_task_merges_output_files_in_one_update(tmp_path, monkeypatch) -> None:
+    from backend.storage.pipeline_adapter import PipelineTaskManager
+
+    storage = SQLiteTaskStorage(tmp_path / "complete.db")
+    manager = PipelineTaskManager(storage=storage)
+    task = manager.create_task(owner_id="user-1", task_type="patent_analysis", pn="CN1A")
+    storage.update_task(task.id, metadata="null")
+    monkeypatch.setattr(storage, "get_task", lambda *_args, **_kwargs: (_ for _ in ()).throw(AssertionError("unexpected read")))
+    calls: list[str] = []
+    original_request = storage._request
+    monkeypatch.setattr(storage, "_request", lambda sql, params=None: calls.append(sql) or original_request(sql, params))
+
+    assert manager.complete_task(task.id, output_files={"pdf": "a.pdf"}) is True
+    assert len(calls) == 2 and "RETURNING *" in calls[0] and "patent_analyses" in calls[1]
+    assert manager.complete_task("missing") is False
+
+    monkeypatch.undo()
+    completed = storage.get_task(task.id)
+    assert completed.status.value == "completed" and completed.progress == 100
+    assert completed.metadata == {"output_files": {"pdf": "a.pdf"}}
+    assert storage.get_patent_analysis_by_pn("cn1a")["pn"] == "CN1A"
+
+
+def test_row_to_task_maps_status_via_lookup_table(tmp_path) -> None:
+    import pytest
+
+    from backend.storage.models import TaskStatus
+
+    storage = SQLiteTaskStorage(tmp_path / "row_codec.db")
+    row = {"id": "t-1", "status": "failed", "created_at": "2026-03-01T08:00:00Z", "updated_at": "2026-03-01T08:00:00Z", "deleted_at": ""}
+
+    task = storage._row_to_task(row)
+    assert task.status is TaskStatus.FAILED
+    assert task.completed_at is None and task.deleted_at is None
+    with pytest.raises(ValueError):
+        storage._row_to_task({**row, "status": "unknown"})
+
+
+def test_owner_range_counts_search_owner_composite_indexes(tmp_path) -> None:
+    storage = SQLiteTaskStorage(tmp_path / "owner_index.db")
+    conn = storage._get_connection()
+
+    def plan(sql: str) -> str:
+        return " ".join(str(row[3]) for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", [1] * sql.count("?")))
+
+    created_plan = plan("SELECT COUNT(*) FROM tasks WHERE owner_id = ? AND created_at >= ? AND created_at < ? AND deleted_at IS NULL")
+    completed_plan = plan(
+        "SELECT COUNT(*) FROM tasks WHERE owner_id = ? AND completed_at IS NOT NULL AND completed_at >= ? AND completed_at < ? AND deleted_at IS NULL"
+    )
+    assert "owner_id=? AND created_at>? AND created_at<?" in created_plan
+    assert "idx_tasks_owner_completed_at (owner_id=? AND completed_at>? AND completed_at<?)" in completed_plan
+
+
+def test_merge_task_output_files_keeps_concurrent_metadata_writes(tmp_path) -> None:
+    from backend.storage.pipeline_adapter import PipelineTaskManager
+
+    storage = SQLiteTaskStorage(tmp_path / "merge_output.db")
+    manager = PipelineTaskManager(storage=storage)
+    task = manager.create_task(owner_id="user-1", metadata={"备注": "保留"})
+    manager.complete_task(task.id, output_files={"pdf": "a.pdf"})
+    stale = storage.get_task(task.id)
+    # 邮件通知在 R2 上传期间写入 notifications
+    storage.update_task(task.id, metadata={**stale.metadata, "notifications": {"completed": {"sent": True}}})
+
+    assert storage.merge_task_output_files(task.id, {"r2_key": "patent/CN1/ai_analysis.pdf", "patent_r2_key": "patent/CN1/patent.json"}) is True
+    assert storage.get_task(task.id).metadata == {
+        "备注": "保留",
+        "output_files": {"pdf": "a.pdf", "r2_key": "patent/CN1/ai_analysis.pdf", "patent_r2_key": "patent/CN1/patent.json"},
+        "notifications": {"completed": {"sent": True}},
+    }
+    assert storage.merge_task_output_files(task.id, {}) is False
+    assert storage.merge_task_output_files("missing", {"r2_key": "x"}) is False
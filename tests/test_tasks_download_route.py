@@ -34,3 +34,116 @@ def test_download_result_returns_ai_search_pdf(monkeypatch, tmp_path) -> None:
 
     assert response.media_type == "application/pdf"
     assert response.filename == "AI 检索报告_检索会话.pdf"
+
+
+def test_download_result_streams_r2_pdf_in_chunks(monkeypatch, tmp_path) -> None:
+    from backend.storage.r2_storage import R2Config, R2Storage
+
+    storage = SQLiteTaskStorage(tmp_path / "tasks_download_r2.db")
+    manager = PipelineTaskManager(storage)
+    monkeypatch.setattr(tasks_route, "task_manager", manager)
+    monkeypatch.setattr(tasks_route, "emit_system_log", lambda **kwargs: None)
+
+    class _Body:
+        closed = False
+
+        def iter_chunks(self, chunk_size: int):
+            yield b"%PDF-1.4\n"
+            yield b"body"
+
+        def close(self) -> None:
+            self.closed = True
+
+    body = _Body()
+    requested_keys = []
+
+    class _FakeClient:
+        def get_object(self, Bucket: str, Key: str):
+            requested_keys.append(Key)
+            return {"Body": body}
+
+    r2_storage = R2Storage(R2Config(endpoint_url="", access_key_id="", secret_access_key="", bucket=""))
+    r2_storage.client = _FakeClient()
+    monkeypatch.setattr(R2Storage, "enabled", property(lambda self: True))
+    monkeypatch.setattr(tasks_route, "_build_r2_storage", lambda: r2_storage)
+
+    task = manager.create_task(owner_id="guest_r2", task_type=TaskType.PATENT_ANALYSIS.value, pn="CN123456789A")
+    storage.update_task(task.id, status=TaskStatus.COMPLETED.value)
+
+    response = asyncio.run(tasks_route.download_result(task.id, SimpleNamespace(user_id="guest_r2")))
+
+    assert requested_keys == ["patent/CN123456789A/ai_analysis.pdf"]
+    assert response.media_type == "application/pdf"
+    async def _collect() -> list[bytes]:
+        return [chunk async for chunk in response.body_iterator]
+
+    assert asyncio.run(_collect()) == [b"%PDF-1.4\n", b"body"]
+    assert body.closed is True
+
+
+def test_download_result_reuses_stat_for_local_pdf(monkeypatch, tmp_path) -> None:
+    storage = SQLiteTaskStorage(tmp_path / "tasks_download_local.db")
+    manager = PipelineTaskManager(storage)
+    monkeypatch.setattr(tasks_route, "task_manager", manager)
+    monkeypatch.setattr(tasks_route, "emit_system_log", lambda **kwargs: None)
+    monkeypatch.setattr(tasks_route, "_build_r2_storage", lambda: SimpleNamespace(enabled=False))
+    monkeypatch.setattr(tasks_route, "_build_task_pdf_r2_key", lambda *args: None)
+
+    task = manager.create_task(owner_id="guest_local", task_type=TaskType.PATENT_ANALYSIS.value, pn="CN1A")
+    pdf_path = tmp_path / "CN1A.pdf"
+    storage.update_task(
+        task.id,
+        status=TaskStatus.COMPLETED.value,
+        metadata={"output_files": {"pdf": str(pdf_path)}},
+    )
+    user = SimpleNamespace(user_id="guest_local")
+
+    missing = asyncio.run(tasks_route.download_result(task.id, user))
+    assert missing.status_code == 404
+
+    pdf_path.write_bytes(b"%PDF-1.4\nbody")
+    response = asyncio.run(tasks_route.download_result(task.id, user))
+    assert response.stat_result is not None
+    assert response.chunk_size == 1024 * 1024
+    assert response.headers["content-length"] == str(len(b"%PDF-1.4\nbody"))
+    assert tasks_route._stat_download_file(tmp_path) is None
+
+
+def test_download_result_redirects_to_presigned_r2_url_when_enabled(monkeypatch, tmp_path) -> None:
+    from backend.storage.r2_storage import R2Config, R2Storage
+
+    storage = SQLiteTaskStorage(tmp_path / "tasks_download_presigned.db")
+    manager = PipelineTaskManager(storage)
+    monkeypatch.setattr(tasks_route, "task_manager", manager)
+    monkeypatch.setattr(tasks_route, "emit_system_log", lambda **kwargs: None)
+    monkeypatch.setattr(tasks_route.settings, "R2_PRESIGNED_DOWNLOAD_TTL_SECONDS", 300)
+
+    signed = []
+
+    class _FakeClient:
+        def head_object(self, Bucket: str, Key: str):
+            return {}
+
+        def generate_presigned_url(self, operation: str, Params: dict, ExpiresIn: int):
+            signed.append((operation, Params, ExpiresIn))
+            return f"https://r2.example.com/{Params['Key']}?sig=1"
+
+        def get_object(self, Bucket: str, Key: str):
+            raise AssertionError("presigned downloads must not proxy the body")
+
+    r2_storage = R2Storage(R2Config(endpoint_url="", access_key_id="", secret_access_key="", bucket="bucket"))
+    r2_storage.client = _FakeClient()
+    monkeypatch.setattr(R2Storage, "enabled", property(lambda self: True))
+    monkeypatch.setattr(tasks_route, "_build_r2_storage", lambda: r2_storage)
+
+    task = manager.create_task(owner_id="guest_r2", task_type=TaskType.PATENT_ANALYSIS.value, pn="CN123456789A")
+    storage.update_task(task.id, status=TaskStatus.COMPLETED.value)
+
+    response = asyncio.run(tasks_route.download_result(task.id, SimpleNamespace(user_id="guest_r2")))
+
+    assert response.status_code == 307
+    assert response.headers["location"] == "https://r2.example.com/patent/CN123456789A/ai_analysis.pdf?sig=1"
+    operation, params, expires_in = signed[0]
+    assert (operation, expires_in) == ("get_object", 300)
+    assert params["ResponseContentType"] == "application/pdf"
+    assert params["ResponseContentDisposition"].startswith("attachment; filename*=UTF-8''")
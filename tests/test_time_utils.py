@@ -1,5 +1,6 @@
-from datetime import datetime
+from datetime import datetime, timezone
 
+from backend import time_utils
 from backend.time_utils import local_day_start_end_to_utc, parse_storage_ts, to_utc_z
 
 
@@ -26,3 +27,30 @@ def test_local_day_start_end_to_utc_uses_shanghai_midnight():
 
     assert start_iso == "2026-03-20T16:00:00Z"
     assert end_iso == "2026-03-21T16:00:00Z"
+
+
+def test_parse_storage_ts_reuses_cached_parse_for_repeated_strings():
+    time_utils._parse_storage_text.cache_clear()
+    first = time_utils.parse_storage_ts("2026-03-01T08:00:00Z", naive_strategy="utc")
+    second = time_utils.parse_storage_ts("2026-03-01T08:00:00Z", naive_strategy="utc")
+
+    assert first == datetime(2026, 3, 1, 8, tzinfo=timezone.utc)
+    assert second is first
+    assert time_utils._parse_storage_text.cache_info().hits == 1
+    assert time_utils.parse_storage_ts("2026-03-01T08:00:00", naive_strategy="local") == datetime(
+        2026, 3, 1, 0, tzinfo=timezone.utc
+    )
+    assert time_utils.parse_storage_ts("  ", naive_strategy="utc") is None
+    assert time_utils.parse_storage_ts("not-a-date", naive_strategy="utc") is None
+
+
+def test_local_recent_day_window_is_cached_per_local_day():
+    time_utils._local_day_window.cache_clear()
+    morning = datetime(2026, 3, 20, 17, 0, tzinfo=timezone.utc)
+    evening = datetime(2026, 3, 21, 15, 59, tzinfo=timezone.utc)
+
+    assert time_utils.local_recent_day_window_to_utc(1, now=morning) == ("2026-03-20T16:00:00Z", "2026-03-21T16:00:00Z")
+    assert time_utils.local_recent_day_window_to_utc(1, now=evening) == ("2026-03-20T16:00:00Z", "2026-03-21T16:00:00Z")
+    assert time_utils._local_day_window.cache_info().hits == 1
+    assert time_utils.local_recent_day_window_to_utc(0, now=morning) == time_utils.local_recent_day_window_to_utc(1, now=morning)
+    assert time_utils.local_recent_day_window_to_utc(7, now=morning)[0] == "2026-03-14T16:00:00Z"
@@ -258,3 +258,41 @@ def test_refresh_pricing_cache_failure_keeps_existing_rows(monkeypatch, tmp_path
     assert "network down" in str(status["errorMessage"])
     assert quote["missing"] is False
     assert quote["stale"] is True
+
+
+def test_extract_model_name_skips_plain_words_and_parses_token_ranges():
+    assert token_pricing._extract_model_name("Model qwen-plus") == "qwen-plus"
+    assert token_pricing._extract_model_name("Batch qwen3 max") == "qwen3"
+    assert token_pricing._extract_model_name("Pricing only") == ""
+    assert token_pricing._parse_token_range("32K<Token≤128K") == (32 * 1024 + 1, 128 * 1024)
+    assert token_pricing._looks_like_token_range("Token≤32K") is True
+    assert token_pricing._looks_like_token_range("Token") is False
+
+
+def test_replace_llm_pricing_entries_inserts_in_parameter_bounded_batches(monkeypatch, tmp_path):
+    storage = SQLiteTaskStorage(tmp_path / "token_pricing_batch.db")
+    region = token_pricing.TOKEN_PRICING_REGION
+    billing_mode = token_pricing.TOKEN_PRICING_BILLING_MODE
+    entries = [
+        {"model": f"model-{index}", "input_tier_min_tokens": 1, "prompt_price_per_million_cny": index}
+        for index in range(9)
+    ]
+    entries.append({"model": "", "input_tier_min_tokens": 1})
+    entries.append({"model": "model-0", "input_tier_min_tokens": 1, "prompt_price_per_million_cny": 42})
+
+    statements: list[tuple[str, int]] = []
+    original_request = storage._request
+
+    def _request(sql, params=None):
+        statements.append((" ".join(str(sql).split())[:30], len(params or [])))
+        return original_request(sql, params)
+
+    monkeypatch.setattr(storage, "_request", _request)
+    changed = storage.replace_llm_pricing_entries(entries, region=region, billing_mode=billing_mode)
+
+    assert [count for sql, count in statements if sql.startswith("INSERT")] == [98, 42]
+    assert all(count <= 100 for _sql, count in statements)
+    assert changed == 10
+    rows = storage.list_llm_pricing_entries(region=region, billing_mode=billing_mode)
+    assert len(rows) == 9
+    assert {row["model"]: row["prompt_price_per_million_cny"] for row in rows}["model-0"] == 42
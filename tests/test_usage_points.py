@@ -158,3 +158,44 @@ def test_usage_aggregation_ignores_failed_and_cancelled_for_occupied_counts(monk
     assert result.usedPoints == 2.0
     assert result.remainingPoints == 1.0
     assert result.canCreateRequestedTask is False
+
+
+def test_usage_lookup_is_cached_until_owner_tasks_change(monkeypatch, tmp_path):
+    from backend.storage import PipelineTaskManager
+
+    storage = _mount_storage(monkeypatch, tmp_path)
+    manager = PipelineTaskManager(storage=storage)
+    owner_id = "guest_cached_usage"
+    first = manager.create_task(owner_id=owner_id, task_type=TaskType.PATENT_ANALYSIS.value)
+
+    assert usage._get_user_usage(owner_id).usedPoints == 1.0
+    _create_task(storage, owner_id, TaskType.PATENT_ANALYSIS.value, "t-c-2")
+    assert usage._get_user_usage(owner_id).usedPoints == 1.0
+
+    # 额度校验读库但不失效缓存；任务落库后才失效
+    with pytest.raises(HTTPException):
+        usage._enforce_daily_quota(owner_id, task_type=TaskType.AI_REPLY.value)
+    assert usage._get_user_usage(owner_id).usedPoints == 1.0
+
+    manager.create_task(owner_id=owner_id, task_type=TaskType.AI_SEARCH.value)
+    assert usage._get_user_usage(owner_id).usedPoints == 3.5
+
+    manager.cancel_task(first.id)
+    assert usage._get_user_usage(owner_id).usedPoints == 2.5
+
+    manager.update_progress(first.id, 50)
+    _create_task(storage, owner_id, TaskType.PATENT_ANALYSIS.value, "t-c-3")
+    assert usage._get_user_usage(owner_id).usedPoints == 2.5
+
+
+def test_point_limit_env_changes_apply_with_cached_parsing(monkeypatch, tmp_path):
+    _mount_storage(monkeypatch, tmp_path)
+
+    assert usage._get_user_usage("guest_env", use_cache=False).dailyPointLimit == 3.0
+    monkeypatch.setenv("MAX_DAILY_POINTS_GUEST", "4.5")
+    assert usage._get_user_usage("guest_env", use_cache=False).dailyPointLimit == 4.5
+    monkeypatch.setenv("MAX_DAILY_POINTS_GUEST", "0.3")
+    assert usage._get_user_usage("guest_env", use_cache=False).dailyPointLimit == 3.0
+    hits = usage._parse_point_limit_units.cache_info().hits
+    usage._get_user_usage("guest_env", use_cache=False)
+    assert usage._parse_point_limit_units.cache_info().hits == hits + 1
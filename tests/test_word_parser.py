@@ -90,3 +90,28 @@ def test_word_parser_raises_when_local_and_online_fail(monkeypatch, tmp_path) ->
 
     with pytest.raises(RuntimeError, match="online failed"):
         word_parser.WordParser.parse(source, tmp_path / "out")
+
+
+def test_extract_markdown_bundle_only_unpacks_markdown_and_images(tmp_path) -> None:
+    import zipfile
+
+    from patent_agents.common.parsers.base import extract_markdown_bundle
+
+    zip_path = tmp_path / "result.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("abc/origin.pdf", b"%PDF" * 1000)
+        archive.writestr("abc/layout.json", "{}")
+        archive.writestr("abc/full.md", "# 标题\n![](images/fig1.jpg)\n")
+        archive.writestr("abc/images/fig1.jpg", b"jpg")
+        archive.writestr("abc/images/../../escape.jpg", b"x")
+    output_dir = tmp_path / "out"
+    (output_dir / "images").mkdir(parents=True)
+    (output_dir / "images" / "stale.jpg").write_bytes(b"old")
+
+    target = extract_markdown_bundle(zip_path, output_dir)
+
+    assert target == output_dir / "raw.md"
+    assert target.read_text(encoding="utf-8") == "# 标题\n![](images/fig1.jpg)\n"
+    assert sorted(path.name for path in (output_dir / "images").iterdir()) == ["fig1.jpg"]
+    assert sorted(path.name for path in output_dir.iterdir()) == ["images", "raw.md"]
+    assert not (tmp_path / "escape.jpg").exists()
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from patent_agents.common.workflow.path_utils import resolve_pn, safe_artifact_name
+
+
+def test_safe_artifact_name_matches_isalnum_filter() -> None:
+    samples = [
+        "CN 115655695 A",
+        "cn-1156/55695.a_b",
+        "专利 CN115655695A（公开）",
+        "ＣＮ１２３",
+        "../../etc/passwd",
+        "",
+        None,
+    ]
+    for value in samples:
+        expected = "".join(c for c in str(value or "") if c.isalnum() or c in ("-", "_"))
+        assert safe_artifact_name(value) == expected
+
+
+def test_resolve_pn_falls_back_to_publication_number() -> None:
+    patent_data = {"bibliographic_data": {"publication_number": "CN 115655695 A"}}
+
+    assert resolve_pn(" ", patent_data, "task-1") == "CN115655695A"
+    assert resolve_pn("", {}, "../") == "task"
+
+
+def test_shared_runtime_config_falls_back_to_defaults() -> None:
+    from patent_agents.common.workflow.runtime import build_runtime_config
+
+    config = build_runtime_config(" ", "", default_thread_id="patent-task", default_checkpoint_ns="patent_analysis")
+    assert config == {"configurable": {"thread_id": "patent-task", "checkpoint_ns": "patent_analysis"}}
+    assert build_runtime_config("t1", "ns", default_thread_id="x", default_checkpoint_ns="y")["configurable"] == {
+        "thread_id": "t1",
+        "checkpoint_ns": "ns",
+    }